@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+
+try:  # pragma: no cover
+    from . import crud
+    from .ballot_import import CSV_COLUMNS as IMPORT_COLUMNS
+    from .cache import ClubSnapshot
+    from .config import get_settings
+    from .database import AsyncSessionLocal, SessionLocal
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    from ballot_import import CSV_COLUMNS as IMPORT_COLUMNS  # type: ignore
+    from cache import ClubSnapshot  # type: ignore
+    from config import get_settings  # type: ignore
+    from database import AsyncSessionLocal, SessionLocal  # type: ignore
+
+settings = get_settings()
+
+# Rows fetched from the database cursor, encoded and sent per response chunk.
+CHUNK_ROWS = 2000
+# The import columns come first, so an export can be loaded back with `POST .../ballots/import`.
+COLUMNS = IMPORT_COLUMNS + ("voter_id", "category_name", "book_title", "book_author", "created_at")
+MEDIA_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+class BallotEncoder:
+    """Encodes chunks of `crud.ballot_export_query` rows as CSV or JSONL, optionally as one gzip stream."""
+
+    def __init__(self, body_format: str, compress: bool):
+        self.body_format = body_format
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        self.compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def _output(self, text: str) -> bytes:
+        data = text.encode()
+        return self.compressor.compress(data) if self.compressor else data
+
+    def header(self) -> bytes:
+        if self.body_format != "csv":
+            return b""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(COLUMNS)
+        return self._output(buffer.getvalue())
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        if self.body_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerows(
+                (*row[:-1], row.created_at.isoformat() if row.created_at else "") for row in rows
+            )
+            return self._output(buffer.getvalue())
+        lines = []
+        for row in rows:
+            data = row._asdict()
+            data["created_at"] = row.created_at.isoformat() if row.created_at else None
+            lines.append(json.dumps(data, separators=(",", ":")) + "\n")
+        return self._output("".join(lines))
+
+    def finish(self) -> bytes:
+        return self.compressor.flush() if self.compressor else b""
+
+
+def _iter_sync(club_id: int, encoder: BallotEncoder) -> Iterator[bytes]:
+    # Starlette runs each step of a sync iterator in the threadpool, like a sync endpoint.
+    with SessionLocal() as db:
+        result = db.execute(crud.ballot_export_query(club_id).execution_options(yield_per=CHUNK_ROWS))
+        yield encoder.header()
+        for rows in result.partitions():
+            yield encoder.encode(rows)
+        yield encoder.finish()
+
+
+async def _iter_async(club_id: int, encoder: BallotEncoder) -> AsyncIterator[bytes]:
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(crud.ballot_export_query(club_id).execution_options(yield_per=CHUNK_ROWS))
+        yield encoder.header()
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
+        yield encoder.finish()
+
+
+def export_response(club: ClubSnapshot, body_format: str, *, compress: bool) -> StreamingResponse:
+    """
+    Stream every ballot of `club` from a database cursor (`yield_per`), `CHUNK_ROWS` rows at a time, so
+    memory stays flat however many votes there are. The export reads through its own session: the
+    request's session has been closed by the time the body is sent.
+    """
+    encoder = BallotEncoder(body_format, compress)
+    iterator = _iter_async if settings.async_db else _iter_sync
+    filename = f"ballots-{club.slug}.{body_format}" + (".gz" if compress else "")
+    return StreamingResponse(
+        iterator(club.id, encoder),
+        media_type="application/gzip" if compress else MEDIA_TYPES[body_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,162 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+try:  # pragma: no cover
+    from . import crud, models, schemas
+    from .cache import ClubSnapshot
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    import models  # type: ignore
+    import schemas  # type: ignore
+    from cache import ClubSnapshot  # type: ignore
+
+CHUNK_ROWS = 5000
+MAX_REPORTED_ERRORS = 1000
+CSV_COLUMNS = ("voter_name", "category_id", "book_id")
+
+# (line number, voter name, category id, book id)
+BallotRow = Tuple[int, str, int, int]
+
+
+class RowError(ValueError):
+    pass
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Yield (line_number, text) pairs from a streamed UTF-8 body without buffering it whole."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_no = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_no + 1, pending.rstrip("\r")
+
+
+def _as_id(value, field: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RowError(f"Invalid {field} {value!r}") from None
+
+
+def parse_jsonl(line_no: int, text: str) -> List[BallotRow]:
+    """
+    Accept either a flat `{"voter_name", "category_id", "book_id"}` object or a full
+    `VoteSubmission`-shaped `{"voter_name", "votes": [...]}` object per line.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError as exc:
+        raise RowError(f"Invalid JSON: {exc}") from None
+    if not isinstance(data, dict):
+        raise RowError("Expected a JSON object")
+    voter_name = str(data.get("voter_name") or "")
+    entries = data["votes"] if "votes" in data else [data]
+    if not isinstance(entries, list):
+        raise RowError("votes must be a list")
+    rows: List[BallotRow] = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise RowError("Each vote must be an object")
+        rows.append(
+            (line_no, voter_name, _as_id(entry.get("category_id"), "category"), _as_id(entry.get("book_id"), "book"))
+        )
+    return rows
+
+
+class CsvParser:
+    """Stateful CSV line parser; the first line is a header naming `voter_name,category_id,book_id`."""
+
+    def __init__(self):
+        self.columns: Optional[Dict[str, int]] = None
+
+    def __call__(self, line_no: int, text: str) -> List[BallotRow]:
+        fields = next(csv.reader([text]))
+        if self.columns is None:
+            header = [field.strip().lower() for field in fields]
+            missing = [column for column in CSV_COLUMNS if column not in header]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=f"CSV header is missing {', '.join(missing)}"
+                )
+            self.columns = {column: header.index(column) for column in CSV_COLUMNS}
+            return []
+        try:
+            voter_name, category_id, book_id = (fields[self.columns[column]] for column in CSV_COLUMNS)
+        except IndexError:
+            raise RowError("Too few columns") from None
+        return [(line_no, voter_name, _as_id(category_id, "category"), _as_id(book_id, "book"))]
+
+
+class BallotImport:
+    """
+    Validates imported ballot rows against the club's categories and books (loaded once) and writes them
+    in chunks through `crud.import_ballots`, collecting per-row errors instead of aborting.
+    """
+
+    def __init__(self, db: Session, club: ClubSnapshot):
+        self.club = club
+        categories = db.execute(
+            select(models.Category.id, models.Category.ranked).where(
+                models.Category.club_id == club.id,
+                models.Category.active.is_(True),
+                models.Category.deleted_at.is_(None),
+            )
+        ).all()
+        self.category_ids: Set[int] = {category_id for category_id, _ in categories}
+        # Rows carry a single book, which cannot express a ranking.
+        self.ranked_category_ids: Set[int] = {category_id for category_id, ranked in categories if ranked}
+        self.book_ids: Set[int] = set(
+            db.scalars(select(models.Book.id).where(models.Book.club_id == club.id, models.Book.deleted_at.is_(None)))
+        )
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+        self.voters_created = 0
+        self.votes_written = 0
+        self.errors: List[schemas.BallotImportError] = []
+
+    def reject(self, line_no: int, error: str) -> None:
+        self.rows_rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(schemas.BallotImportError(line=line_no, error=error))
+
+    def write(self, db: Session, rows: Iterable[BallotRow]) -> None:
+        """Validate one chunk of rows and write the valid ones in a single transaction."""
+        ballots: Dict[str, Dict[int, int]] = {}
+        for line_no, voter_name, category_id, book_id in rows:
+            name = voter_name.strip()
+            if not name:
+                self.reject(line_no, "Voter name is required")
+            elif category_id not in self.category_ids:
+                self.reject(line_no, f"Invalid category {category_id}")
+            elif category_id in self.ranked_category_ids:
+                self.reject(line_no, f"Category {category_id} is ranked and cannot be imported")
+            elif book_id not in self.book_ids:
+                self.reject(line_no, f"Invalid book {book_id}")
+            else:
+                self.rows_accepted += 1
+                ballots.setdefault(name, {})[category_id] = book_id
+        created, written = crud.import_ballots(db, self.club, ballots)
+        self.voters_created += created
+        self.votes_written += written
+
+    def report(self) -> schemas.BallotImportReport:
+        return schemas.BallotImportReport(
+            rows_processed=self.rows_accepted + self.rows_rejected,
+            rows_rejected=self.rows_rejected,
+            voters_created=self.voters_created,
+            votes_written=self.votes_written,
+            errors=sorted(self.errors, key=lambda error: error.line),
+        )
@@ -0,0 +1,110 @@
+"""
+Compare the sync (threadpool + Session) and async (AsyncSession) database modes end to end.
+
+Starts one uvicorn server per mode against a fresh SQLite file, seeds a club over HTTP and then drives
+a burst of ballot submissions and config loads at fixed concurrency. Prints requests/second and latency
+percentiles per mode as JSON.
+
+    cd backend
+    python -m bench.async_vs_sync --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+
+import httpx
+
+try:  # pragma: no cover
+    from .common import ADMIN_HEADERS, percentile, run_server
+except ImportError:  # pragma: no cover
+    from common import ADMIN_HEADERS, percentile, run_server  # type: ignore
+
+
+def seed_club(base_url: str, *, books: int = 12, categories: int = 8) -> dict:
+    with httpx.Client(base_url=base_url, headers=ADMIN_HEADERS) as client:
+        client.post("/api/admin/clubs", json={"name": "Bench", "slug": "bench"}).raise_for_status()
+        book_ids = [
+            client.post("/api/admin/clubs/bench/books", json={"title": f"Book {i}", "readers_count": 5}).json()["id"]
+            for i in range(books)
+        ]
+        category_ids = [
+            client.post("/api/admin/clubs/bench/categories", json={"name": f"Category {i}", "sort_order": i}).json()["id"]
+            for i in range(categories)
+        ]
+    return {"books": book_ids, "categories": category_ids}
+
+
+async def drive(base_url: str, club: dict, *, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        for i in counter:
+            if i % 2:
+                ballot = [
+                    {"category_id": category_id, "book_id": club["books"][(i + n) % len(club["books"])]}
+                    for n, category_id in enumerate(club["categories"])
+                ]
+                request = client.post("/api/clubs/bench/vote", json={"voter_name": f"voter-{i}", "votes": ballot})
+            else:
+                request = client.get("/api/clubs/bench/config")
+            started = time.perf_counter()
+            try:
+                response = await request
+            except httpx.TransportError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE", help="extra server setting, e.g. VOTE_WRITER=1"
+    )
+    args = parser.parse_args()
+    extra_env = dict(item.split("=", 1) for item in args.env)
+
+    report = {}
+    for mode, flag in (("sync", "0"), ("async", "1")):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **extra_env,
+                "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+                "DB_ASYNC": flag,
+                "ADMIN_SECRET": "bench-secret",
+            }
+            with run_server(env) as base_url:
+                club = seed_club(base_url)
+                report[mode] = asyncio.run(
+                    drive(base_url, club, requests=args.requests, concurrency=args.concurrency)
+                )
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
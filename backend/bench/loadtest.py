@@ -0,0 +1,183 @@
+"""
+Repeatable load test of the public API against a local uvicorn server.
+
+Builds two synthetic clubs of the requested size with `bench.synthetic` (one with voting open for
+`POST /vote` and `/config`, one closed for `/results/reveal` and `/best-member/results`), starts uvicorn
+on that database and drives a weighted mix of the four endpoints at fixed concurrency. Half of the ballots
+come from existing voters changing their picks, half from new voters. Prints throughput, p50/p95/p99
+latency and error rate per endpoint and overall as JSON, so runs from different builds can be diffed.
+
+    cd backend
+    python -m bench.loadtest --voters 20000 --books 100 --requests 20000 --concurrency 64
+    python -m bench.loadtest --mix vote=1 --env VOTE_WRITER=1 --output vote-only.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+try:  # pragma: no cover
+    from .common import BACKEND_DIR, percentile, run_server
+except ImportError:  # pragma: no cover
+    from common import BACKEND_DIR, percentile, run_server  # type: ignore
+
+OPEN_SLUG = "load-open"
+CLOSED_SLUG = "load-closed"
+DEFAULT_MIX = "vote=4,config=3,reveal=2,best_member=1"
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in {"vote", "config", "reveal", "best_member"}:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def seed(env: dict, size_args: list[str]) -> dict:
+    """Create both clubs in a separate process so the generator uses the server's DATABASE_URL."""
+    clubs = {}
+    for slug, extra in ((OPEN_SLUG, []), (CLOSED_SLUG, ["--closed"])):
+        output = subprocess.run(
+            [sys.executable, "-m", "bench.synthetic", "--slug", slug, *size_args, *extra],
+            cwd=BACKEND_DIR,
+            env={**os.environ, **env},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        clubs[slug] = json.loads(output)
+    return clubs
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def drive(base_url: str, clubs: dict, *, requests: int, concurrency: int, mix: dict, seed: int) -> dict:
+    rnd = random.Random(seed)
+    names = list(mix)
+    plan = rnd.choices(names, weights=[mix[name] for name in names], k=requests)
+    open_club = clubs[OPEN_SLUG]
+    existing_voters = open_club["voters"]
+    latencies: dict = {name: [] for name in names}
+    errors: dict = {name: 0 for name in names}
+    counter = iter(enumerate(plan))
+
+    def build(client: httpx.AsyncClient, i: int, name: str):
+        if name == "vote":
+            voter = f"voter-{rnd.randrange(existing_voters)}" if existing_voters and rnd.random() < 0.5 else f"load-{i}"
+            ballot = [
+                {"category_id": category_id, "book_id": rnd.choice(open_club["books"])}
+                for category_id in open_club["categories"]
+            ]
+            return client.post(f"/api/clubs/{OPEN_SLUG}/vote", json={"voter_name": voter, "votes": ballot})
+        if name == "config":
+            return client.get(f"/api/clubs/{OPEN_SLUG}/config")
+        if name == "reveal":
+            return client.get(f"/api/clubs/{CLOSED_SLUG}/results/reveal")
+        return client.get(f"/api/clubs/{CLOSED_SLUG}/best-member/results")
+
+    async def worker(client: httpx.AsyncClient):
+        for i, name in counter:
+            started = time.perf_counter()
+            try:
+                response = await build(client, i, name)
+                failed = response.status_code >= 400
+            except httpx.TransportError:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            if failed:
+                errors[name] += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    report = {name: summarize(latencies[name], errors[name], elapsed) for name in names}
+    report["total"] = summarize(
+        [sample for samples in latencies.values() for sample in samples], sum(errors.values()), elapsed
+    )
+    report["total"]["elapsed_s"] = round(elapsed, 2)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--voters", type=int, default=500)
+    parser.add_argument("--nominees", type=int, default=6)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"default: {DEFAULT_MIX}")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE", help="extra server setting, e.g. DB_ASYNC=1"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    size_args = [
+        "--books", str(args.books),
+        "--categories", str(args.categories),
+        "--voters", str(args.voters),
+        "--nominees", str(args.nominees),
+        "--seed", str(args.seed),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**extra_env, "DATABASE_URL": f"sqlite:///{tmp}/load.db", "ADMIN_SECRET": "bench-secret"}
+        clubs = seed(env, size_args)
+        with run_server(env, workers=args.workers) as base_url:
+            results = asyncio.run(
+                drive(
+                    base_url, clubs, requests=args.requests, concurrency=args.concurrency, mix=args.mix, seed=args.seed
+                )
+            )
+
+    report = {
+        "settings": {
+            "books": args.books,
+            "categories": args.categories,
+            "voters": args.voters,
+            "nominees": args.nominees,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "workers": args.workers,
+            "env": extra_env,
+        },
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
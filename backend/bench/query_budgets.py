@@ -0,0 +1,200 @@
+"""
+Check the declared SQL query budgets (`@query_budget`) of every crud function and endpoint.
+
+Builds a small and a large synthetic club in a throwaway SQLite database, then calls every API endpoint
+for each club through the ASGI app with ENFORCE_QUERY_BUDGETS on and the in-process caches cleared before
+each request, so every call takes its cold path. It fails (exit status 1) when a call runs more statements
+than its budget, printing the offending statements; when a function runs more statements for the large club
+than for the small one; when a budget is more than `BUDGET_MARGIN` above the statements its function ran; or
+when a budgeted function or endpoint was never exercised. Prints the statement counts per function as JSON.
+
+    cd backend
+    python -m bench.query_budgets --large-voters 20000
+"""
+import argparse
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+# The app reads its settings at import time, so they have to be in place before the imports below.
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/budgets.db"
+os.environ["ENFORCE_QUERY_BUDGETS"] = "1"
+os.environ["ADMIN_SECRET"] = "bench-secret"
+os.environ.pop("VOTE_WRITER", None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import delete, update  # noqa: E402
+
+try:  # pragma: no cover
+    from .. import crud, models, querycount
+    from ..cache import club_cache, config_cache, results_cache
+    from ..database import SessionLocal
+    from ..main import app
+    from ..tally import tally_store
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    import models  # type: ignore
+    import querycount  # type: ignore
+    from cache import club_cache, config_cache, results_cache  # type: ignore
+    from database import SessionLocal  # type: ignore
+    from main import app  # type: ignore
+    from tally import tally_store  # type: ignore
+
+try:  # pragma: no cover
+    from .common import ADMIN_HEADERS
+    from .synthetic import ClubSpec, build_club
+except ImportError:  # pragma: no cover
+    from common import ADMIN_HEADERS  # type: ignore
+    from synthetic import ClubSpec, build_club  # type: ignore
+
+# How far above the statements a call actually runs its budget may be: enough room for a small change, not
+# so much that a regression fits under it.
+BUDGET_MARGIN = 1
+
+# Long-lived responses: their budget covers the work done before streaming starts and is not exercised here.
+NOT_EXERCISED = {"/api/admin/clubs/{club_slug}/results/stream", "/api/clubs/{club_slug}/results/stream"}
+
+
+def unsettle_counts(club: dict) -> None:
+    """Put the club's vote counters out of step, so that a rebuild has something to repair."""
+    with SessionLocal() as db:
+        db.execute(update(models.VoteCount).where(models.VoteCount.club_id == club["club_id"]).values(votes_count=0))
+        db.commit()
+
+
+def exercise(client: TestClient, club: dict) -> None:
+    """Call every endpoint once for `club`, in an order that leaves it as it was (apart from added votes)."""
+    slug = club["slug"]
+    admin = f"/api/admin/clubs/{slug}"
+    public = f"/api/clubs/{slug}"
+    ballot = [{"category_id": category_id, "book_id": club["books"][0]} for category_id in club["categories"]]
+
+    def call(method: str, url: str, **kwargs):
+        club_cache.clear()
+        config_cache.clear()
+        results_cache.clear()
+        tally_store.clear()
+        kwargs.setdefault("headers", ADMIN_HEADERS)
+        response = client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} failed with {response.status_code}: {response.text}")
+        return response.json() if response.content and response.headers["content-type"] == "application/json" else None
+
+    call("POST", "/api/admin/clubs", json={"name": f"Budget {slug}", "slug": f"{slug}-extra"})
+    call("GET", "/api/admin/clubs")
+    call("GET", admin)
+    book = call("POST", f"{admin}/books", json={"title": "Budget book", "readers_count": 3})
+    call("PUT", f"{admin}/books/{book['id']}", json={"readers_count": 4})
+    call("GET", f"{admin}/books", params={"limit": 2, "fields": "id,title"})
+    call("GET", f"{admin}/voters")
+    category = call("POST", f"{admin}/categories", json={"name": "Budget category"})
+    call("PUT", f"{admin}/categories/{category['id']}", json={"sort_order": 99, "ranked": True})
+    call("GET", f"{admin}/categories")
+    call("GET", "/api/admin/dashboard?sort=completion&order=desc&page_size=20")  # leads a ranked category
+    nominee = call("POST", f"{admin}/best-member/nominees", json={"name": "Budget member"})
+    call("GET", f"{admin}/best-member/nominees")
+
+    call("GET", f"{public}/config")
+    ballot.append({"category_id": category["id"], "rankings": club["books"][:3]})
+    call("POST", f"{public}/vote", json={"voter_name": "budget-voter", "votes": ballot})
+    call("POST", f"{public}/vote", json={"voter_name": "voter-0", "votes": ballot})
+    call("POST", f"{public}/vote", json={"voter_name": "voter-0", "votes": ballot})  # unchanged: read only
+    call("POST", f"{public}/best-member/vote", json={"voter_name": "budget-voter", "nominee_name": "Budget member"})
+    call("POST", f"{public}/best-member/vote", json={"voter_name": "voter-1", "nominee_name": "Budget member"})
+    call("POST", f"{public}/best-member/vote", json={"voter_name": "budget-member", "nominee_name": "Budget member"})
+    call("GET", f"{admin}/results")
+    call("GET", f"{admin}/ballots/export", params={"format": "jsonl", "gzip": "true"})
+    call("GET", f"{public}/best-member/results")  # computed live while voting is open
+    call("GET", f"{admin}/vote-counts/verify")
+    unsettle_counts(club)
+    call("POST", f"{admin}/vote-counts/rebuild")
+    call("GET", "/api/admin/cache/stats")
+
+    # Changes to the results of a closed club also rebuild its frozen results: the most a write ever runs.
+    call("POST", f"{admin}/voting/close")
+    call("PUT", f"{admin}/books/{book['id']}", json={"readers_count": 5})
+    extra = call("POST", f"{admin}/categories", json={"name": "Closed category"})
+    call("PUT", f"{admin}/categories/{extra['id']}", json={"sort_order": 98, "ranked": True})
+    call("POST", f"{public}/best-member/vote", json={"voter_name": "closed-member", "nominee_name": "Budget member"})
+    unsettle_counts(club)
+    call("POST", f"{admin}/vote-counts/rebuild")
+    call("GET", f"{public}/results/summary")
+    call("GET", f"{public}/results/reveal")
+    call("GET", f"{public}/best-member/results")
+    call("DELETE", f"{admin}/categories/{extra['id']}")
+    call("DELETE", f"{admin}/best-member/nominees/{nominee['id']}")
+    call("DELETE", f"{admin}/categories/{category['id']}")
+    job = call("DELETE", f"{admin}/books/{book['id']}")
+    with SessionLocal() as db:  # results closed before frozen results existed are computed on request
+        db.execute(delete(models.ResultsSnapshot).where(models.ResultsSnapshot.club_id == club["club_id"]))
+        db.commit()
+    call("GET", f"{public}/results/summary")
+    call("GET", f"{public}/results/reveal")
+    call("POST", f"{admin}/voting/open")
+
+    call("GET", f"{admin}/purge-jobs")
+    call("GET", f"{admin}/purge-jobs/{job['id']}")
+
+    with SessionLocal() as db:
+        crud.load_results_state(db, slug)
+
+
+def budgeted_functions() -> dict:
+    """label -> budget for every budgeted crud function and endpoint."""
+    functions = [value for value in vars(crud).values() if inspect.isfunction(value) and hasattr(value, "query_budget")]
+    functions += [
+        route.endpoint
+        for route in app.routes
+        if hasattr(getattr(route, "endpoint", None), "query_budget") and route.path not in NOT_EXERCISED
+    ]
+    return {f"{fn.__module__}.{fn.__qualname__}": fn.query_budget for fn in functions}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small-voters", type=int, default=20)
+    parser.add_argument("--large-voters", type=int, default=5000)
+    args = parser.parse_args()
+
+    sizes = {
+        "small": ClubSpec(slug="small", books=4, categories=2, voters=args.small_voters, nominees=2),
+        "large": ClubSpec(slug="large", books=150, categories=20, voters=args.large_voters, nominees=30),
+    }
+    counts: dict = {}
+    failures = []
+    with TestClient(app) as client:
+        for size, spec in sizes.items():
+            with SessionLocal() as db:
+                club = build_club(db, spec)
+            querycount.observed.clear()
+            try:
+                exercise(client, club)
+            except querycount.QueryBudgetExceeded as exc:
+                failures.append(f"[{size} club] {exc}")
+            counts[size] = dict(querycount.observed)
+
+    report = {}
+    for label, budget in sorted(budgeted_functions().items()):
+        small, large = counts["small"].get(label), counts["large"].get(label)
+        report[label] = {"budget": budget, "small": small, "large": large}
+        if small is None or large is None:
+            failures.append(f"{label} was not exercised")
+        elif large > small:
+            failures.append(f"{label} ran {small} statements for the small club but {large} for the large one")
+        elif budget > max(small, large) + BUDGET_MARGIN:
+            failures.append(
+                f"{label} has a budget of {budget} but runs at most {max(small, large)} statements:"
+                f" lower it to within {BUDGET_MARGIN}"
+            )
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    if failures:
+        print("\n\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
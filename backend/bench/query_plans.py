@@ -0,0 +1,95 @@
+"""
+Check with EXPLAIN that the hot vote-table queries are answered from their covering indexes.
+
+Migrates the configured database (a throwaway SQLite file unless `DATABASE_URL` is set), builds a synthetic
+club, refreshes the planner statistics and explains each query in `crud` that `models.COVERING_INDEXES`
+is meant for. On SQLite the plan must read "USING COVERING INDEX <name>"; on Postgres it must use the index
+with sequential scans disabled (small tables would otherwise be scanned whatever the indexes). Prints the
+plans as JSON and exits with status 1 when a query does not use its index.
+
+    cd backend
+    python -m bench.query_plans
+    DATABASE_URL=postgresql://localhost/bookclub_bench python -m bench.query_plans --voters 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+# The app reads its settings at import time, so they have to be in place before the imports below.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/plans.db")
+
+from sqlalchemy import Select  # noqa: E402
+from sqlalchemy.engine import Connection  # noqa: E402
+
+try:  # pragma: no cover
+    from .. import crud, migrations, models
+    from ..database import SessionLocal, get_engine
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    import migrations  # type: ignore
+    import models  # type: ignore
+    from database import SessionLocal, get_engine  # type: ignore
+
+try:  # pragma: no cover
+    from .synthetic import ClubSpec, build_club
+except ImportError:  # pragma: no cover
+    from synthetic import ClubSpec, build_club  # type: ignore
+
+
+def explain(conn: Connection, stmt: Select) -> str:
+    sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "sqlite":
+        return "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    return "\n".join(row[0] for row in conn.exec_driver_sql(f"EXPLAIN {sql}"))
+
+
+def uses_index(conn: Connection, plan: str, index: str) -> bool:
+    """Every table access in the plan (each branch of a UNION) must go through `index`."""
+    if conn.dialect.name == "sqlite":
+        accesses = [line for line in plan.splitlines() if line.startswith(("SCAN", "SEARCH"))]
+        return bool(accesses) and all(f"USING COVERING INDEX {index}" in line for line in accesses)
+    return index in plan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--voters", type=int, default=2000)
+    args = parser.parse_args()
+
+    migrations.upgrade(get_engine())
+    with SessionLocal() as db:
+        club = build_club(db, ClubSpec(slug=f"query-plans-{os.getpid()}", books=50, categories=10, voters=args.voters))
+    voter_ids = list(range(1, 51))
+    queries = {
+        "existing_votes": (crud.existing_votes_query(voter_ids), "ix_votes_voter_category_book"),
+        "vote_recount": (crud.vote_recount_query(club["club_id"]), "ix_votes_club_category_book"),
+        "best_member_tally": (crud.best_member_tally_query(club["club_id"]), "ix_best_member_votes_club_nominee_id"),
+    }
+    unchecked = models.COVERING_INDEXES - {index for _, index in queries.values()}
+    if unchecked:
+        sys.exit(f"no query checks {', '.join(sorted(unchecked))}")
+
+    report = {}
+    failures = []
+    with get_engine().connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, (stmt, index) in queries.items():
+            plan = explain(conn, stmt)
+            ok = uses_index(conn, plan, index)
+            report[name] = {"index": index, "uses_index": ok, "plan": plan.splitlines()}
+            if not ok:
+                failures.append(f"{name} does not use {index}:\n{plan}")
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    if failures:
+        print("\n\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
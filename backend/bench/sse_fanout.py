@@ -0,0 +1,115 @@
+"""
+Measure fan-out latency of the live results stream with many connected clients.
+
+Starts a uvicorn server against a fresh SQLite file, seeds a club, connects `--subscribers` clients to
+the admin results stream and then submits `--votes` ballots one at a time. For every ballot it records
+when each subscriber received the matching `delta` event, both from the server's publish timestamp
+(`fanout_*`) and from the moment the ballot was sent (`end_to_end_*`). Prints the percentiles as JSON.
+
+    cd backend
+    python -m bench.sse_fanout --subscribers 500 --votes 50
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+
+import httpx
+
+try:  # pragma: no cover
+    from .async_vs_sync import seed_club
+    from .common import ADMIN_HEADERS, percentile, run_server
+except ImportError:  # pragma: no cover
+    from async_vs_sync import seed_club  # type: ignore
+    from common import ADMIN_HEADERS, percentile, run_server  # type: ignore
+
+STREAM_URL = "/api/admin/clubs/bench/results/stream"
+
+
+async def run(base_url: str, club: dict, *, subscribers: int, votes: int, interval: float) -> dict:
+    received: dict = {}  # delta seq -> [(receive time, server publish ts)]
+    snapshots = 0
+    connected = asyncio.Event()
+
+    async def subscribe(client: httpx.AsyncClient):
+        nonlocal snapshots
+        async with client.stream("GET", STREAM_URL, headers=ADMIN_HEADERS) as response:
+            response.raise_for_status()
+            event, data = None, None
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data = line[5:]
+                elif not line and event:
+                    if event == "delta":
+                        payload = json.loads(data)
+                        received.setdefault(payload["seq"], []).append((time.time(), payload["ts"]))
+                    elif event == "snapshot":
+                        snapshots += 1
+                        if snapshots == subscribers:
+                            connected.set()
+                    event, data = None, None
+
+    limits = httpx.Limits(max_connections=subscribers + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        readers = [asyncio.create_task(subscribe(client)) for _ in range(subscribers)]
+        await asyncio.wait_for(connected.wait(), 60)
+
+        sent_at = []
+        for i in range(votes):
+            ballot = [{"category_id": club["categories"][0], "book_id": club["books"][i % len(club["books"])]}]
+            sent_at.append(time.time())
+            response = await client.post("/api/clubs/bench/vote", json={"voter_name": f"voter-{i}", "votes": ballot})
+            response.raise_for_status()
+            await asyncio.sleep(interval)
+        await asyncio.sleep(1)
+
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    fanout = [now - ts for deliveries in received.values() for now, ts in deliveries]
+    # Deltas are numbered in publish order, so the n-th delta belongs to the n-th ballot.
+    end_to_end = [
+        now - sent_at[seq - 1] for seq, deliveries in received.items() if seq <= len(sent_at) for now, _ in deliveries
+    ]
+    delivered = sum(len(deliveries) for deliveries in received.values())
+    return {
+        "subscribers": subscribers,
+        "votes": votes,
+        "deliveries": delivered,
+        "expected_deliveries": subscribers * votes,
+        "fanout_p50_ms": round(percentile(fanout, 50) * 1000, 2),
+        "fanout_p99_ms": round(percentile(fanout, 99) * 1000, 2),
+        "end_to_end_p50_ms": round(percentile(end_to_end, 50) * 1000, 2),
+        "end_to_end_p99_ms": round(percentile(end_to_end, 99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--votes", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between ballots")
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE", help="extra server setting, e.g. DB_ASYNC=1"
+    )
+    args = parser.parse_args()
+    extra_env = dict(item.split("=", 1) for item in args.env)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**extra_env, "DATABASE_URL": f"sqlite:///{tmp}/bench.db", "ADMIN_SECRET": "bench-secret"}
+        with run_server(env) as base_url:
+            club = seed_club(base_url)
+            report = asyncio.run(
+                run(base_url, club, subscribers=args.subscribers, votes=args.votes, interval=args.interval)
+            )
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
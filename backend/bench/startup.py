@@ -0,0 +1,101 @@
+"""
+Time to first request of a multi-worker uvicorn deployment.
+
+Starts `uvicorn main:app --workers N` and measures how long it takes until a database-backed endpoint
+(`GET /api/admin/clubs`) first answers, for a fresh database (first start migrates it) and for an
+already-migrated one (workers only check the schema version), each `--runs` times. Also reports how long
+importing `main` takes in a fresh interpreter. Prints the timings as JSON.
+
+    cd backend
+    python -m bench.startup --workers 4 --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+try:  # pragma: no cover
+    from .common import ADMIN_HEADERS, BACKEND_DIR, _free_port
+except ImportError:  # pragma: no cover
+    from common import ADMIN_HEADERS, BACKEND_DIR, _free_port  # type: ignore
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+
+
+def time_to_first_request(env: dict, workers: int, timeout: float = 60) -> float:
+    port = _free_port()
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env={**os.environ, **env})
+    try:
+        while True:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/api/admin/clubs", headers=ADMIN_HEADERS, timeout=5)
+                if response.status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            if proc.poll() is not None or time.perf_counter() - started > timeout:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def import_time(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE", help="extra server setting, e.g. DB_ASYNC=1"
+    )
+    args = parser.parse_args()
+    extra_env = dict(item.split("=", 1) for item in args.env)
+
+    fresh, migrated, imports = [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(args.runs):
+            env = {**extra_env, "DATABASE_URL": f"sqlite:///{tmp}/startup-{run}.db", "ADMIN_SECRET": "bench-secret"}
+            fresh.append(time_to_first_request(env, args.workers))
+            migrated.append(time_to_first_request(env, args.workers))
+            imports.append(import_time(env))
+
+    report = {
+        "settings": {"workers": args.workers, "runs": args.runs, "env": extra_env},
+        "import_main": summarize(imports),
+        "first_request_fresh_db": summarize(fresh),
+        "first_request_migrated_db": summarize(migrated),
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
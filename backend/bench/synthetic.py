@@ -0,0 +1,130 @@
+"""
+Build a synthetic club of configurable size in the configured database (`DATABASE_URL`).
+
+Books, categories and nominees are inserted through the models; ballots go through
+`crud.import_ballots`, so `vote_counts` and the version counters end up exactly as if the votes had been
+cast through the API. Book popularity is skewed (a few favourites take most votes) so result payloads look
+like a real vote rather than a uniform spread. Prints the created ids as JSON.
+
+    cd backend
+    DATABASE_URL=sqlite:///./load.db python -m bench.synthetic --slug big --books 200 --voters 20000
+"""
+import argparse
+import json
+import random
+import sys
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+try:  # pragma: no cover
+    from .. import crud, migrations, models, schemas
+    from ..database import SessionLocal, get_engine
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    import migrations  # type: ignore
+    import models  # type: ignore
+    import schemas  # type: ignore
+    from database import SessionLocal, get_engine  # type: ignore
+
+BALLOTS_PER_BATCH = 5000
+
+
+@dataclass
+class ClubSpec:
+    slug: str = "load"
+    books: int = 20
+    categories: int = 8
+    voters: int = 500
+    # Share of categories each voter fills in, and share of voters who also pick a best member.
+    coverage: float = 0.9
+    nominees: int = 6
+    best_member_share: float = 0.8
+    voting_open: bool = True
+    seed: int = 1
+
+
+def build_club(db: Session, spec: ClubSpec) -> dict:
+    """Create the club described by `spec` and return its slug plus book, category and nominee ids."""
+    rnd = random.Random(spec.seed)
+    club_row = crud.create_club(db, schemas.ClubCreate(name=f"Synthetic {spec.slug}", slug=spec.slug))
+
+    books = [
+        models.Book(club_id=club_row.id, title=f"Book {i}", author=f"Author {i % 37}", readers_count=rnd.randint(1, 12))
+        for i in range(spec.books)
+    ]
+    categories = [
+        models.Category(club_id=club_row.id, name=f"Category {i}", description=f"Synthetic category {i}", sort_order=i)
+        for i in range(spec.categories)
+    ]
+    nominees = [models.BestMemberNominee(club_id=club_row.id, name=f"Member {i}") for i in range(spec.nominees)]
+    db.add_all(books + categories + nominees)
+    db.commit()
+    book_ids = [book.id for book in books]
+    category_ids = [category.id for category in categories]
+    nominee_names = [nominee.name for nominee in nominees]
+
+    club = crud.get_club_by_slug(db, spec.slug)
+    popularity = [1 / (rank + 1) for rank in range(len(book_ids))]
+    votes_written = 0
+    for start in range(0, spec.voters, BALLOTS_PER_BATCH):
+        ballots = {}
+        for n in range(start, min(start + BALLOTS_PER_BATCH, spec.voters)):
+            picks = [category_id for category_id in category_ids if rnd.random() < spec.coverage]
+            ballots[f"voter-{n}"] = dict(zip(picks, rnd.choices(book_ids, weights=popularity, k=len(picks))))
+        _, written = crud.import_ballots(db, club, {name: choices for name, choices in ballots.items() if choices})
+        votes_written += written
+
+    best_member_votes = 0
+    if nominee_names:
+        voter_ids = db.scalars(select(models.Voter.id).where(models.Voter.club_id == club.id)).all()
+        rows = [
+            {"club_id": club.id, "voter_id": voter_id, "nominee_id": nominee.id, "nominee_name": nominee.name}
+            for voter_id in voter_ids
+            if rnd.random() < spec.best_member_share
+            for nominee in [rnd.choice(nominees)]
+        ]
+        if rows:
+            db.execute(insert(models.BestMemberVote), rows)
+            db.commit()
+        best_member_votes = len(rows)
+
+    if not spec.voting_open:
+        crud.set_voting_state(db, crud.get_club_by_slug(db, spec.slug), open_state=False)
+
+    return {
+        "slug": spec.slug,
+        "club_id": club.id,
+        "books": book_ids,
+        "categories": category_ids,
+        "nominees": nominee_names,
+        "voters": spec.voters,
+        "votes": votes_written,
+        "best_member_votes": best_member_votes,
+    }
+
+
+def main() -> None:
+    defaults = ClubSpec()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for field, value in asdict(defaults).items():
+        if isinstance(value, bool):
+            continue
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--closed", action="store_true", help="close voting once the ballots are in")
+    args = parser.parse_args()
+    spec = ClubSpec(
+        **{field: getattr(args, field) for field in asdict(defaults) if field != "voting_open"},
+        voting_open=not args.closed,
+    )
+
+    migrations.upgrade(get_engine())
+    with SessionLocal() as db:
+        summary = build_club(db, spec)
+    json.dump(summary, sys.stdout)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+try:  # pragma: no cover
+    from .config import get_settings
+except ImportError:  # pragma: no cover
+    from config import get_settings
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU map for per-process caches. Keys are tuples whose second element is the
+    club id, so everything belonging to one club can be dropped at once.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_club(self, club_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._data if key[1] == club_id]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire `ttl` seconds after they were stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            self.pop(key)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+
+@dataclass(frozen=True)
+class ClubSnapshot:
+    """
+    Immutable copy of a club row, safe to share between requests. Crud functions accept it wherever
+    they take a club, and `schemas.ClubRead.model_validate` reads it like the ORM object.
+    """
+
+    id: int
+    name: str
+    slug: str
+    voting_open: bool
+    created_at: datetime
+    results_version: int
+    config_version: int
+
+
+@dataclass(frozen=True)
+class FrozenResults:
+    """Public result payloads of a closed club as stored in `results_snapshots`: JSON ready to send as-is."""
+
+    results: str
+    reveal: str
+    best_member: str
+
+
+# Computed ResultsResponse / BestMemberResultsResponse objects and FrozenResults, keyed by
+# (kind, club_id, results_version).
+results_cache = LRUCache(maxsize=get_settings().results_cache_size)
+
+# Serialized public config bodies and best-member nominee ids, keyed by (kind, club_id, config_version).
+config_cache = LRUCache(maxsize=get_settings().config_cache_size)
+
+# Slug -> ClubSnapshot. Writes in this process drop the entry; the TTL bounds staleness across workers.
+club_cache = TTLCache(maxsize=get_settings().club_cache_size, ttl=get_settings().club_cache_ttl)
+
+# Serialized vote submission responses and a hash of the request that produced them, keyed by
+# (route, club_slug, idempotency_key): the slug rather than the club id, so a replay needs no club lookup.
+idempotency_cache = TTLCache(maxsize=get_settings().idempotency_cache_size, ttl=get_settings().idempotency_ttl)
@@ -4,7 +4,48 @@ from functools import lru_cache
 
 class Settings:
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./bookclub.db")
+    # Serve requests through AsyncSession (aiosqlite / asyncpg) instead of the threadpool + sync Session.
+    async_db: bool = os.getenv("DB_ASYNC", "").lower() in {"1", "true", "yes"}
+    async_database_url: str | None = os.getenv("ASYNC_DATABASE_URL") or None
+    # Read replica for config, results and admin list endpoints (empty: everything uses DATABASE_URL), and how
+    # long after a write a client keeps reading from the primary so it sees its own changes.
+    replica_database_url: str = os.getenv("REPLICA_DATABASE_URL", "")
+    async_replica_database_url: str | None = os.getenv("ASYNC_REPLICA_DATABASE_URL") or None
+    replica_sticky_seconds: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # Funnel ballots through a single writer thread that commits them in small groups.
+    vote_writer: bool = os.getenv("VOTE_WRITER", "").lower() in {"1", "true", "yes"}
+    vote_writer_window_ms: float = float(os.getenv("VOTE_WRITER_WINDOW_MS", "5"))
+    vote_writer_max_batch: int = int(os.getenv("VOTE_WRITER_MAX_BATCH", "64"))
+    # Deleted books and categories lose their votes in the background, this many rows per transaction with a
+    # pause in between, so voters never wait long for the write lock.
+    purge_batch_size: int = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+    purge_pause_ms: float = float(os.getenv("PURGE_PAUSE_MS", "20"))
     admin_secret: str = os.getenv("ADMIN_SECRET", "letmein")
+    results_cache_size: int = int(os.getenv("RESULTS_CACHE_SIZE", "256"))
+    config_cache_size: int = int(os.getenv("CONFIG_CACHE_SIZE", "256"))
+    club_cache_size: int = int(os.getenv("CLUB_CACHE_SIZE", "1024"))
+    club_cache_ttl: float = float(os.getenv("CLUB_CACHE_TTL", "5"))
+    # Responses of vote submissions sent with an `Idempotency-Key`, replayed to retries for this many seconds.
+    idempotency_cache_size: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    idempotency_ttl: float = float(os.getenv("IDEMPOTENCY_TTL", "600"))
+    # Per-club vote-count matrices results are served from (see tally.py), and the file they are written to
+    # on shutdown and mapped back in on startup; empty disables the snapshot.
+    tally_cache_size: int = int(os.getenv("TALLY_CACHE_SIZE", "256"))
+    tally_snapshot_path: str = os.getenv("TALLY_SNAPSHOT_PATH", "")
+    # Live results streams: how often a club's shared feed re-checks the database for writes made by other
+    # workers, the idle keep-alive interval, and how many events a slow subscriber may fall behind.
+    stream_poll_interval: float = float(os.getenv("STREAM_POLL_INTERVAL", "1"))
+    stream_keepalive: float = float(os.getenv("STREAM_KEEPALIVE", "15"))
+    stream_queue_size: int = int(os.getenv("STREAM_QUEUE_SIZE", "64"))
+    # Per-route request, SQL and pool metrics on GET /metrics (Prometheus text format). Off by default: the
+    # endpoint is not authenticated, so enable it only where nothing but the scraper reaches the workers.
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "").lower() in {"1", "true", "yes"}
+    # Check every `@query_budget` crud function and endpoint call and fail when it runs too many statements.
+    enforce_query_budgets: bool = os.getenv("ENFORCE_QUERY_BUDGETS", "").lower() in {"1", "true", "yes"}
+    # Apply pending schema migrations when a worker starts. With this off, run `python -m migrations` before
+    # starting the workers; they then only check the schema version and refuse to start if it is behind.
+    migrate_on_startup: bool = os.getenv("MIGRATE_ON_STARTUP", "1").lower() in {"1", "true", "yes"}
     allow_origins: list[str] = [origin.strip().rstrip("/") for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin]
 
 
@@ -1,30 +1,535 @@
-from typing import List, Tuple
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import Select, delete, func, select
+from sqlalchemy import (
+    CompoundSelect,
+    Float,
+    and_,
+    Row,
+    Select,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    literal,
+    null,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 try:  # pragma: no cover
     from . import models, schemas
+    from .cache import ClubSnapshot, FrozenResults, club_cache, config_cache, results_cache
+    from .events import results_feeds
+    from .irv import instant_runoff, pack_rankings, unpack_rankings
+    from .pagination import Page, PageRequest, fetch_page
+    from .querycount import query_budget
+    from .tally import TallyBook, TallyCategory, TallyChange, TallyMatrix, tally_store
 except ImportError:  # pragma: no cover
     import models  # type: ignore
     import schemas  # type: ignore
+    from cache import ClubSnapshot, FrozenResults, club_cache, config_cache, results_cache  # type: ignore
+    from events import results_feeds  # type: ignore
+    from irv import instant_runoff, pack_rankings, unpack_rankings  # type: ignore
+    from pagination import Page, PageRequest, fetch_page  # type: ignore
+    from querycount import query_budget  # type: ignore
+    from tally import TallyBook, TallyCategory, TallyChange, TallyMatrix, tally_store  # type: ignore
 
 
-def list_clubs(db: Session) -> List[models.Club]:
-    stmt: Select[tuple[models.Club]] = select(models.Club).order_by(models.Club.created_at)
-    return list(db.scalars(stmt))
+VoteCountKey = Tuple[int, int]  # (category_id, book_id)
 
 
-def get_club_by_slug(db: Session, slug: str) -> models.Club:
-    stmt = select(models.Club).where(models.Club.slug == slug)
-    club = db.scalar(stmt)
-    if not club:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Club not found")
+INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _insert(db: Session, table):
+    """
+    Dialect-specific INSERT so callers can use ON CONFLICT upserts on SQLite and Postgres alike. Those are the
+    only supported databases: writes also rely on UPDATE/DELETE ... RETURNING, which MySQL lacks.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in INSERTS:
+        raise ValueError(f"Unsupported database {dialect!r}: only SQLite and Postgres are supported")
+    return INSERTS[dialect](table)
+
+
+def _tally_change(db: Session, club_id: int) -> TallyChange:
+    """What this transaction did to the club's tallies so far, for `tally_store` to follow once it commits."""
+    return db.info.setdefault("tally_changes", {}).setdefault(club_id, TallyChange())
+
+
+def abandon_tally_change(db: Session, club_id: int) -> None:
+    """
+    For a caller that rolled part of the transaction back (a savepoint): what was recorded for the club no
+    longer matches what commits, so its tally matrix is reloaded rather than moved forward.
+    """
+    _tally_change(db, club_id).incremental = False
+
+
+def _apply_vote_count_deltas(db: Session, club_id: int, deltas: Dict[VoteCountKey, int]) -> None:
+    """Add the given per-(category, book) deltas to `vote_counts` within the caller's transaction."""
+    change = _tally_change(db, club_id)
+    for key, delta in deltas.items():
+        change.deltas[key] += delta
+    params = [
+        {"club_id": club_id, "category_id": category_id, "book_id": book_id, "votes_count": delta}
+        for (category_id, book_id), delta in deltas.items()
+        if delta
+    ]
+    if not params:
+        return
+    table = models.VoteCount.__table__
+    stmt = _insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.club_id, table.c.category_id, table.c.book_id],
+        set_={"votes_count": table.c.votes_count + stmt.excluded.votes_count},
+    )
+    db.execute(stmt, params)
+
+
+def _bump_versions(
+    db: Session, club: ClubSnapshot, *, results: bool = False, config: bool = False, incremental: bool = False
+) -> None:
+    """
+    Move the club's results_version and/or config_version forward inside the caller's transaction.
+    Cached payloads are keyed by those versions, so every worker stops serving them once the
+    transaction commits; this worker also drops the club's entries right away (see `_drop_stale_entries`).
+    Pass `incremental` when the results only changed through `vote_counts` deltas and book fields recorded
+    in `_tally_change`, so this worker's tally matrix can follow the commit instead of being reloaded.
+    """
+    values = {}
+    if results:
+        values["results_version"] = models.Club.results_version + 1
+    if config:
+        values["config_version"] = models.Club.config_version + 1
+    stmt = (
+        update(models.Club)
+        .where(models.Club.id == club.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if results:
+        change = _tally_change(db, club.id)
+        change.versions.append(db.scalar(stmt.returning(models.Club.results_version)))
+        change.incremental = change.incremental and incremental
+    else:
+        db.execute(stmt)
+    db.info.setdefault("stale_clubs", set()).add((club.id, club.slug))
+    if results and not club.voting_open:
+        # Results of a closed club are served from its frozen snapshot: rebuild it as part of this commit.
+        db.info.setdefault("refreeze_clubs", set()).add(club.slug)
+
+
+@event.listens_for(Session, "before_commit")
+def _freeze_closed_results(session: Session) -> None:
+    slugs = session.info.pop("refreeze_clubs", ())
+    if not slugs:
+        return
+    session.flush()
+    for slug in slugs:
+        club = _load_club(session, slug)
+        if not club.voting_open:
+            _store_frozen_results(session, club)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_stale_entries(session: Session) -> None:
+    for club_id, change in session.info.pop("tally_changes", {}).items():
+        tally_store.advance(club_id, change)
+    for club_id, slug in session.info.pop("stale_clubs", ()):
+        results_cache.invalidate_club(club_id)
+        config_cache.invalidate_club(club_id)
+        club_cache.pop(slug)
+        results_feeds.notify(club_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_stale_entries(session: Session) -> None:
+    session.info.pop("stale_clubs", None)
+    session.info.pop("tally_changes", None)
+
+
+def _chunked(items: Sequence, size: int = 500) -> Iterator[Sequence]:
+    """Split id/name lists so IN (...) clauses stay under the driver's bound-parameter limit."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _upsert_voters(db: Session, club_id: int, names: Iterable[str]) -> Tuple[Dict[str, int], int]:
+    """
+    Return voter ids for the given (already stripped) names plus how many were new, creating missing voters
+    in one batched INSERT ... ON CONFLICT DO NOTHING so concurrent writers racing on a name do not fail.
+    """
+    wanted = list(dict.fromkeys(names))
+    ids: Dict[str, int] = {}
+    for chunk in _chunked(wanted):
+        stmt = select(models.Voter.name, models.Voter.id).where(
+            models.Voter.club_id == club_id, models.Voter.name.in_(chunk)
+        )
+        ids.update((name, voter_id) for name, voter_id in db.execute(stmt))
+
+    missing = [name for name in wanted if name not in ids]
+    if missing:
+        table = models.Voter.__table__
+        insert_stmt = _insert(db, table).on_conflict_do_nothing(index_elements=[table.c.club_id, table.c.name])
+        db.execute(insert_stmt, [{"club_id": club_id, "name": name} for name in missing])
+        for chunk in _chunked(missing):
+            stmt = select(models.Voter.name, models.Voter.id).where(
+                models.Voter.club_id == club_id, models.Voter.name.in_(chunk)
+            )
+            ids.update((name, voter_id) for name, voter_id in db.execute(stmt))
+    return ids, len(missing)
+
+
+# The hot queries on the vote tables. Each one is answered from a covering index (see
+# `models.COVERING_INDEXES`); `bench.query_plans` checks that the planner actually uses it.
+def existing_votes_query(voter_ids: Sequence[int]) -> Select:
+    """Current choices of the given voters. Voter ids are club-scoped, so no club filter is needed."""
+    return select(models.Vote.id, models.Vote.voter_id, models.Vote.category_id, models.Vote.book_id).where(
+        models.Vote.voter_id.in_(voter_ids)
+    )
+
+
+def current_ballot_query(club_id: int, name: str, category_ids: Sequence[int]) -> Select:
+    """A voter (looked up by name) with their current votes and rankings in the given categories."""
+    return (
+        select(
+            models.Voter.id,
+            models.Voter.name,
+            models.Voter.club_id,
+            models.Voter.created_at,
+            models.Vote.id.label("vote_id"),
+            models.Vote.category_id,
+            models.Vote.book_id,
+            models.RankedBallot.rankings,
+        )
+        .outerjoin(models.Vote, and_(models.Vote.voter_id == models.Voter.id, models.Vote.category_id.in_(category_ids)))
+        .outerjoin(
+            models.RankedBallot,
+            and_(
+                models.RankedBallot.voter_id == models.Voter.id, models.RankedBallot.category_id == models.Vote.category_id
+            ),
+        )
+        .where(models.Voter.club_id == club_id, models.Voter.name == name)
+    )
+
+
+def vote_recount_query(club_id: int) -> Select:
+    """Raw per-book vote counts of a club, recounted from `votes`."""
+    return (
+        select(models.Vote.category_id, models.Vote.book_id, func.count())
+        .where(models.Vote.club_id == club_id)
+        .group_by(models.Vote.category_id, models.Vote.book_id)
+    )
+
+
+def best_member_tally_query(club_id: int) -> CompoundSelect:
+    """
+    Best-member votes per nominee id, plus per name for free-text votes (no configured nominee), as
+    (nominee_id, nominee_name, votes) rows.
+    """
+    votes = models.BestMemberVote
+    return union_all(
+        select(votes.nominee_id, func.min(votes.nominee_name), func.count())
+        .where(votes.club_id == club_id, votes.nominee_id.is_not(None))
+        .group_by(votes.nominee_id),
+        select(null(), votes.nominee_name, func.count())
+        .where(votes.club_id == club_id, votes.nominee_id.is_(None))
+        .group_by(votes.nominee_name),
+    )
+
+
+def ballot_export_query(club_id: int) -> Select:
+    """
+    Every ballot row of a club with its voter, category and book, in `ix_votes_club_category_book` order
+    (which ends in the row id) so the rows can be streamed without sorting them first.
+    """
+    return (
+        select(
+            models.Voter.name.label("voter_name"),
+            models.Vote.category_id,
+            models.Vote.book_id,
+            models.Vote.voter_id,
+            models.Category.name.label("category_name"),
+            models.Book.title.label("book_title"),
+            models.Book.author.label("book_author"),
+            models.Vote.created_at,
+        )
+        .join(models.Voter, models.Voter.id == models.Vote.voter_id)
+        .join(models.Category, models.Category.id == models.Vote.category_id)
+        .join(models.Book, models.Book.id == models.Vote.book_id)
+        .where(models.Vote.club_id == club_id, models.Category.deleted_at.is_(None), models.Book.deleted_at.is_(None))
+        .order_by(models.Vote.category_id, models.Vote.book_id, models.Vote.id)
+    )
+
+
+def ranked_ballots_query(category_ids: Sequence[int]) -> CompoundSelect:
+    """
+    Ballots of the given ranked categories as (category_id, rankings, book_id) rows: the stored rankings,
+    plus the plain vote of voters without one (cast before the category became ranked), ranking just `book_id`.
+    """
+    ranked = models.RankedBallot
+    votes = models.Vote
+    return union_all(
+        select(ranked.category_id, ranked.rankings, null()).where(ranked.category_id.in_(category_ids)),
+        select(votes.category_id, null(), votes.book_id).where(
+            votes.category_id.in_(category_ids),
+            ~select(ranked.voter_id)
+            .where(ranked.category_id == votes.category_id, ranked.voter_id == votes.voter_id)
+            .exists(),
+        ),
+    )
+
+
+def _upsert_votes(
+    db: Session, club_id: int, ballots: Dict[int, Dict[int, int]], *, returning: bool = False
+) -> Tuple[int, Dict[Tuple[int, int], int]]:
+    """
+    Write `{voter_id: {category_id: book_id}}` choices with one existing-vote lookup per chunk of voters
+    and a batched INSERT ... ON CONFLICT (voter_id, category_id) DO UPDATE, keeping `vote_counts` in step.
+    Unchanged choices are skipped. Returns the number of vote rows inserted or moved to another book and,
+    when `returning` is set, the vote id of every (voter_id, category_id) choice.
+    """
+    existing: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    for chunk in _chunked(list(ballots)):
+        existing.update(
+            ((voter_id, category_id), (vote_id, book_id))
+            for vote_id, voter_id, category_id, book_id in db.execute(existing_votes_query(chunk))
+        )
+
+    vote_ids: Dict[Tuple[int, int], int] = {}
+    params = []
+    deltas: Dict[VoteCountKey, int] = defaultdict(int)
+    for voter_id, choices in ballots.items():
+        for category_id, book_id in choices.items():
+            previous = existing.get((voter_id, category_id))
+            if previous is not None:
+                vote_ids[(voter_id, category_id)] = previous[0]
+                if previous[1] == book_id:
+                    continue
+                deltas[(category_id, previous[1])] -= 1
+            deltas[(category_id, book_id)] += 1
+            params.append({"voter_id": voter_id, "club_id": club_id, "category_id": category_id, "book_id": book_id})
+
+    if params:
+        table = models.Vote.__table__
+        stmt = _insert(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.voter_id, table.c.category_id],
+            set_={"book_id": stmt.excluded.book_id},
+        )
+        if returning:
+            stmt = stmt.returning(table.c.id, table.c.voter_id, table.c.category_id)
+            vote_ids.update(
+                ((voter_id, category_id), vote_id) for vote_id, voter_id, category_id in db.execute(stmt, params)
+            )
+        else:
+            db.execute(stmt, params)
+        _apply_vote_count_deltas(db, club_id, deltas)
+    return len(params), vote_ids
+
+
+@query_budget(1)
+def page_clubs(db: Session, page: PageRequest) -> Page:
+    return fetch_page(db, select(models.Club), models.Club, (models.Club.created_at, models.Club.id), page)
+
+
+def _dashboard_page_query(sort: str, descending: bool) -> Select:
+    """Every club with its voter, vote and active-category totals, each aggregated once across all clubs."""
+    voters = (
+        select(models.Voter.club_id, func.count(models.Voter.id).label("voters_count"))
+        .group_by(models.Voter.club_id)
+        .subquery()
+    )
+    votes = (
+        select(
+            models.VoteCount.club_id,
+            func.sum(models.VoteCount.votes_count).label("votes_count"),
+            func.sum(case((models.Category.active.is_(True), models.VoteCount.votes_count), else_=0)).label(
+                "active_votes"
+            ),
+        )
+        .join(models.Category, models.Category.id == models.VoteCount.category_id)
+        .join(models.Book, models.Book.id == models.VoteCount.book_id)
+        .where(models.Category.deleted_at.is_(None), models.Book.deleted_at.is_(None))
+        .group_by(models.VoteCount.club_id)
+        .subquery()
+    )
+    categories = (
+        select(models.Category.club_id, func.count(models.Category.id).label("categories_count"))
+        .where(models.Category.active.is_(True), models.Category.deleted_at.is_(None))
+        .group_by(models.Category.club_id)
+        .subquery()
+    )
+    voters_count = func.coalesce(voters.c.voters_count, 0)
+    votes_count = func.coalesce(votes.c.votes_count, 0)
+    possible_ballots = voters_count * func.coalesce(categories.c.categories_count, 0)
+    completion_rate = case(
+        (possible_ballots > 0, cast(func.coalesce(votes.c.active_votes, 0), Float) / possible_ballots),
+        else_=0.0,
+    )
+    sort_column = {
+        "created_at": models.Club.created_at,
+        "name": models.Club.name,
+        "voters": voters_count,
+        "votes": votes_count,
+        "completion": completion_rate,
+    }[sort]
+    return (
+        select(
+            models.Club,
+            voters_count.label("voters_count"),
+            votes_count.label("votes_count"),
+            completion_rate.label("completion_rate"),
+        )
+        .outerjoin(voters, voters.c.club_id == models.Club.id)
+        .outerjoin(votes, votes.c.club_id == models.Club.id)
+        .outerjoin(categories, categories.c.club_id == models.Club.id)
+        .order_by(
+            sort_column.desc() if descending else sort_column,
+            models.Club.id.desc() if descending else models.Club.id,
+        )
+    )
+
+
+@query_budget(6)
+def get_admin_dashboard(
+    db: Session, *, sort: str = "created_at", descending: bool = False, page: int = 1, page_size: int = 50
+) -> schemas.AdminDashboardResponse:
+    """
+    One page of the cross-club dashboard in at most six queries whatever the number of clubs: the club count,
+    the sorted page with its totals, then the categories and the `vote_counts` tallies of the clubs on the page
+    and, when some of their categories are ranked, those clubs' books and the ranked ballots.
+    """
+    total = db.scalar(select(func.count(models.Club.id))) or 0
+    page_rows = db.execute(
+        _dashboard_page_query(sort, descending).limit(page_size).offset((page - 1) * page_size)
+    ).all()
+    club_ids = [row.Club.id for row in page_rows]
+
+    categories_by_club: Dict[int, List[models.Category]] = defaultdict(list)
+    tally_rows: Dict[int, List[Row]] = defaultdict(list)
+    books_by_club: Dict[int, List[TallyBook]] = defaultdict(list)
+    ballots: Dict[int, List[Sequence[int]]] = {}
+    if club_ids:
+        categories_stmt = (
+            select(models.Category)
+            .where(models.Category.club_id.in_(club_ids), models.Category.deleted_at.is_(None))
+            .order_by(models.Category.sort_order, models.Category.id)
+        )
+        for category in db.scalars(categories_stmt):
+            categories_by_club[category.club_id].append(category)
+
+        tally_stmt = (
+            select(
+                models.VoteCount.category_id,
+                models.Book.id.label("book_id"),
+                models.Book.title,
+                models.Book.author,
+                models.Book.readers_count,
+                models.VoteCount.votes_count,
+            )
+            .join(models.Book, models.Book.id == models.VoteCount.book_id)
+            .where(
+                models.VoteCount.club_id.in_(club_ids),
+                models.VoteCount.votes_count > 0,
+                models.Book.deleted_at.is_(None),
+            )
+            .order_by(models.VoteCount.category_id, models.Book.id)
+        )
+        for row in db.execute(tally_stmt):
+            tally_rows[row.category_id].append(row)
+
+        # Ranked categories are led by their instant-runoff winner, as in /results, not the first preferences.
+        ranked = [category for categories in categories_by_club.values() for category in categories if category.ranked]
+        if ranked:
+            books_stmt = (
+                select(
+                    models.Book.club_id,
+                    models.Book.id,
+                    models.Book.title,
+                    models.Book.author,
+                    models.Book.readers_count,
+                )
+                .where(
+                    models.Book.club_id.in_({category.club_id for category in ranked}),
+                    models.Book.deleted_at.is_(None),
+                )
+                .order_by(models.Book.id)
+            )
+            for book in db.execute(books_stmt):
+                books_by_club[book.club_id].append(TallyBook(book.id, book.title, book.author, book.readers_count))
+            ballots = _ranked_ballots(db, [category.id for category in ranked])
+
+    entries = []
+    for row in page_rows:
+        leaders = []
+        for category in categories_by_club[row.Club.id]:
+            if category.ranked:
+                results, _ = _runoff(books_by_club[row.Club.id], ballots.get(category.id, []))
+            else:
+                results = _tally_category(tally_rows[category.id])
+            leaders.append(
+                schemas.CategoryLeader(
+                    category_id=category.id,
+                    category_name=category.name,
+                    leader=next((entry for entry in results if entry.is_winner), None),
+                )
+            )
+        entries.append(
+            schemas.ClubDashboardEntry(
+                club=schemas.ClubRead.model_validate(row.Club),
+                voters_count=row.voters_count,
+                votes_count=row.votes_count,
+                completion_rate=round(row.completion_rate, 4),
+                leaders=leaders,
+            )
+        )
+    return schemas.AdminDashboardResponse(total=total, page=page, page_size=page_size, clubs=entries)
+
+
+@query_budget(1)
+def get_club_by_slug(db: Session, slug: str) -> ClubSnapshot:
+    """
+    Resolve a URL slug to a club snapshot, served from `club_cache` when possible. Replica sessions cache
+    their own snapshots: versions read from the primary can be ahead of the replica's rows, and payloads
+    computed from those rows would then be cached under versions they do not belong to.
+    """
+    key = ("replica", slug) if db.info.get("replica") else slug
+    club = club_cache.get(key)
+    if club is not None:
+        return club
+    club = _load_club(db, slug)
+    club_cache.set(key, club)
     return club
 
 
+def _load_club(db: Session, slug: str) -> ClubSnapshot:
+    stmt = select(
+        models.Club.id,
+        models.Club.name,
+        models.Club.slug,
+        models.Club.voting_open,
+        models.Club.created_at,
+        models.Club.results_version,
+        models.Club.config_version,
+    ).where(models.Club.slug == slug)
+    row = db.execute(stmt).first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Club not found")
+    return ClubSnapshot(**row._asdict())
+
+
+@query_budget(3)
 def create_club(db: Session, club_in: schemas.ClubCreate) -> models.Club:
     club = models.Club(**club_in.dict())
     db.add(club)
@@ -33,20 +538,26 @@ def create_club(db: Session, club_in: schemas.ClubCreate) -> models.Club:
     except IntegrityError as exc:  # slug uniqueness
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exists") from exc
+    club_cache.pop(club.slug)
     db.refresh(club)
     return club
 
 
-def create_book(db: Session, club: models.Club, book_in: schemas.BookCreate) -> models.Book:
+@query_budget(3)
+def create_book(db: Session, club: ClubSnapshot, book_in: schemas.BookCreate) -> models.Book:
     book = models.Book(club_id=club.id, **book_in.dict())
     db.add(book)
+    _bump_versions(db, club, config=True)
     db.commit()
     db.refresh(book)
     return book
 
 
-def update_book(db: Session, club: models.Club, book_id: int, book_in: schemas.BookUpdate) -> models.Book:
-    stmt = select(models.Book).where(models.Book.id == book_id, models.Book.club_id == club.id)
+@query_budget(10)
+def update_book(db: Session, club: ClubSnapshot, book_id: int, book_in: schemas.BookUpdate) -> models.Book:
+    stmt = select(models.Book).where(
+        models.Book.id == book_id, models.Book.club_id == club.id, models.Book.deleted_at.is_(None)
+    )
     book = db.scalar(stmt)
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
@@ -57,39 +568,109 @@ def update_book(db: Session, club: models.Club, book_id: int, book_in: schemas.B
     if book_in.readers_count is not None:
         book.readers_count = book_in.readers_count
     db.add(book)
+    _tally_change(db, club.id).books[book.id] = TallyBook(book.id, book.title, book.author, book.readers_count)
+    _bump_versions(db, club, results=True, config=True, incremental=True)
     db.commit()
     db.refresh(book)
     return book
 
 
-def list_books(db: Session, club: models.Club) -> List[models.Book]:
-    stmt = select(models.Book).where(models.Book.club_id == club.id).order_by(models.Book.created_at)
+@query_budget(1)
+def list_books(db: Session, club: ClubSnapshot) -> List[models.Book]:
+    stmt = (
+        select(models.Book)
+        .where(models.Book.club_id == club.id, models.Book.deleted_at.is_(None))
+        .order_by(models.Book.created_at)
+    )
     return list(db.scalars(stmt))
 
 
-def delete_book(db: Session, club: models.Club, book_id: int) -> None:
-    stmt = select(models.Book).where(models.Book.id == book_id, models.Book.club_id == club.id)
+@query_budget(1)
+def page_books(db: Session, club: ClubSnapshot, page: PageRequest) -> Page:
+    stmt = select(models.Book).where(models.Book.club_id == club.id, models.Book.deleted_at.is_(None))
+    return fetch_page(db, stmt, models.Book, (models.Book.created_at, models.Book.id), page)
+
+
+@query_budget(1)
+def page_voters(db: Session, club: ClubSnapshot, page: PageRequest) -> Page:
+    stmt = select(models.Voter).where(models.Voter.club_id == club.id)
+    return fetch_page(db, stmt, models.Voter, (models.Voter.created_at, models.Voter.id), page)
+
+
+@query_budget(3)
+def get_club_detail(db: Session, club: ClubSnapshot) -> schemas.ClubConfigResponse:
+    """Admin view of a club's configuration, including inactive categories and nominee ids."""
+    books = list_books(db, club)
+    categories = list_categories(db, club)
+    nominees = list_best_member_nominees(db, club)
+    return schemas.ClubConfigResponse(
+        club=schemas.ClubRead.model_validate(club),
+        books=[schemas.BookRead.model_validate(book) for book in books],
+        categories=[schemas.CategoryRead.model_validate(cat) for cat in categories],
+        best_member_nominees=[nom.name for nom in nominees],
+        best_member_nominees_detail=[schemas.BestMemberNominee.model_validate(n) for n in nominees],
+    )
+
+
+@query_budget(3)
+def get_public_config(db: Session, club: ClubSnapshot) -> bytes:
+    """
+    Serialized public `ClubConfigResponse` (active categories only), built once per config_version and
+    then served from `config_cache` as ready-to-send JSON bytes.
+    """
+    cache_key = ("config", club.id, club.config_version)
+    cached = config_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    books = list_books(db, club)
+    categories = list_categories(db, club, include_inactive=False)
+    nominees = list_best_member_nominees(db, club)
+    body = schemas.ClubConfigResponse(
+        club=schemas.ClubRead.model_validate(club),
+        books=[schemas.BookRead.model_validate(book) for book in books],
+        categories=[schemas.CategoryRead.model_validate(cat) for cat in categories],
+        best_member_nominees=[nom.name for nom in nominees],
+        best_member_nominees_detail=[],
+    ).model_dump_json().encode()
+    config_cache.set(cache_key, body)
+    return body
+
+
+@query_budget(11)
+def delete_book(db: Session, club: ClubSnapshot, book_id: int) -> models.PurgeJob:
+    """
+    Hide the book at once (lists, ballots, exports and results skip it) and queue a `PurgeJob` for its
+    votes; the row itself goes when the job finishes (see `purge_votes`).
+    """
+    stmt = select(models.Book).where(
+        models.Book.id == book_id, models.Book.club_id == club.id, models.Book.deleted_at.is_(None)
+    )
     book = db.scalar(stmt)
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
 
-    db.execute(delete(models.Vote).where(models.Vote.club_id == club.id, models.Vote.book_id == book.id))
-    db.delete(book)
-    db.commit()
+    book.deleted_at = datetime.utcnow()
+    return _start_purge(db, club, "book", book.id)
 
 
-def create_category(db: Session, club: models.Club, category_in: schemas.CategoryCreate) -> models.Category:
+@query_budget(9)
+def create_category(db: Session, club: ClubSnapshot, category_in: schemas.CategoryCreate) -> models.Category:
     category = models.Category(club_id=club.id, **category_in.dict())
     db.add(category)
+    _bump_versions(db, club, results=True, config=True)
     db.commit()
     db.refresh(category)
     return category
 
 
+@query_budget(11)
 def update_category(
-    db: Session, club: models.Club, category_id: int, category_in: schemas.CategoryUpdate
+    db: Session, club: ClubSnapshot, category_id: int, category_in: schemas.CategoryUpdate
 ) -> models.Category:
-    stmt = select(models.Category).where(models.Category.id == category_id, models.Category.club_id == club.id)
+    stmt = select(models.Category).where(
+        models.Category.id == category_id, models.Category.club_id == club.id, models.Category.deleted_at.is_(None)
+    )
     category = db.scalar(stmt)
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
@@ -101,16 +682,23 @@ def update_category(
         category.sort_order = category_in.sort_order
     if category_in.active is not None:
         category.active = category_in.active
+    if category_in.ranked is not None and category_in.ranked != category.ranked:
+        if category_in.ranked:
+            # Rankings left from an earlier ranked period may no longer match the votes; start from the votes.
+            db.execute(delete(models.RankedBallot).where(models.RankedBallot.category_id == category.id))
+        category.ranked = category_in.ranked
     db.add(category)
+    _bump_versions(db, club, results=True, config=True)
     db.commit()
     db.refresh(category)
     return category
 
 
-def list_categories(db: Session, club: models.Club, *, include_inactive: bool = True) -> List[models.Category]:
+@query_budget(1)
+def list_categories(db: Session, club: ClubSnapshot, *, include_inactive: bool = True) -> List[models.Category]:
     stmt = (
         select(models.Category)
-        .where(models.Category.club_id == club.id)
+        .where(models.Category.club_id == club.id, models.Category.deleted_at.is_(None))
         .order_by(models.Category.sort_order, models.Category.id)
     )
     if not include_inactive:
@@ -118,26 +706,134 @@ def list_categories(db: Session, club: models.Club, *, include_inactive: bool =
     return list(db.scalars(stmt))
 
 
-def delete_category(db: Session, club: models.Club, category_id: int) -> None:
-    stmt = select(models.Category).where(models.Category.id == category_id, models.Category.club_id == club.id)
+@query_budget(1)
+def page_categories(db: Session, club: ClubSnapshot, page: PageRequest) -> Page:
+    stmt = select(models.Category).where(models.Category.club_id == club.id, models.Category.deleted_at.is_(None))
+    return fetch_page(db, stmt, models.Category, (models.Category.sort_order, models.Category.id), page)
+
+
+@query_budget(12)
+def delete_category(db: Session, club: ClubSnapshot, category_id: int) -> models.PurgeJob:
+    """Hide the category at once and queue a `PurgeJob` for its votes, as `delete_book` does."""
+    stmt = select(models.Category).where(
+        models.Category.id == category_id, models.Category.club_id == club.id, models.Category.deleted_at.is_(None)
+    )
     category = db.scalar(stmt)
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
 
-    db.execute(delete(models.Vote).where(models.Vote.club_id == club.id, models.Vote.category_id == category.id))
-    db.delete(category)
+    category.deleted_at = datetime.utcnow()
+    return _start_purge(db, club, "category", category.id)
+
+
+PURGE_TARGETS = {
+    "book": (models.Book, models.Vote.book_id, models.VoteCount.book_id),
+    "category": (models.Category, models.Vote.category_id, models.VoteCount.category_id),
+}
+
+
+def _start_purge(db: Session, club: ClubSnapshot, entity: str, entity_id: int) -> models.PurgeJob:
+    """Record the purge job of a book or category that has just been hidden, and commit."""
+    _, _, count_column = PURGE_TARGETS[entity]
+    votes_total = db.scalar(
+        select(func.coalesce(func.sum(models.VoteCount.votes_count), 0)).where(
+            models.VoteCount.club_id == club.id, count_column == entity_id
+        )
+    )
+    job = models.PurgeJob(club_id=club.id, entity=entity, entity_id=entity_id, votes_total=votes_total)
+    db.add(job)
+    _bump_versions(db, club, results=True, config=True)
     db.commit()
+    db.refresh(job)
+    return job
 
 
-def set_voting_state(db: Session, club: models.Club, *, open_state: bool) -> models.Club:
-    club.voting_open = open_state
-    db.add(club)
+def purge_votes(db: Session, job: schemas.PurgeJobRead, batch_size: int) -> bool:
+    """
+    Delete up to `batch_size` votes of a pending purge job in one short transaction, keeping `vote_counts` in
+    step, and finish the job (deleting the book or category row) once none are left. The DELETE comes first so
+    the transaction takes the write lock straight away instead of upgrading a read. Returns whether the job
+    is finished. Every worker resumes every pending job, so several can purge the same one: each vote is
+    deleted and counted once, and a short batch (another worker may have taken the rest of its rows) only
+    finishes the job once a check after the DELETE finds no votes left, so the row's FK cascade never has
+    votes to remove.
+    """
+    entity, vote_column, _ = PURGE_TARGETS[job.entity]
+    batch = select(models.Vote.id).where(models.Vote.club_id == job.club_id, vote_column == job.entity_id)
+    deleted = db.execute(
+        delete(models.Vote)
+        .where(models.Vote.id.in_(batch.limit(batch_size)))
+        .returning(models.Vote.category_id, models.Vote.book_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    deltas: Dict[VoteCountKey, int] = defaultdict(int)
+    for category_id, book_id in deleted:
+        deltas[(category_id, book_id)] -= 1
+    _apply_vote_count_deltas(db, job.club_id, deltas)
+
+    finished = len(deleted) < batch_size and not db.scalar(select(batch.exists()))
+    values = {"votes_deleted": models.PurgeJob.votes_deleted + len(deleted)}
+    if finished:
+        # Cascades to whatever is left of its `vote_counts` rows (all zero by now).
+        db.execute(delete(entity).where(entity.id == job.entity_id).execution_options(synchronize_session=False))
+        values.update(status="done", finished_at=datetime.utcnow())
+    db.execute(
+        update(models.PurgeJob)
+        .where(models.PurgeJob.id == job.id, models.PurgeJob.status == "pending")
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return finished
+
+
+def fail_purge_job(db: Session, job_id: int, error: str) -> None:
+    db.execute(
+        update(models.PurgeJob)
+        .where(models.PurgeJob.id == job_id, models.PurgeJob.status == "pending")
+        .values(status="failed", error=error, finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
-    db.refresh(club)
-    return club
 
 
-def _get_or_create_voter(db: Session, club: models.Club, voter_name: str) -> models.Voter:
+def pending_purge_jobs(db: Session) -> List[schemas.PurgeJobRead]:
+    stmt = select(models.PurgeJob).where(models.PurgeJob.status == "pending").order_by(models.PurgeJob.id)
+    return [schemas.PurgeJobRead.model_validate(job) for job in db.scalars(stmt)]
+
+
+@query_budget(1)
+def get_purge_job(db: Session, club: ClubSnapshot, job_id: int) -> models.PurgeJob:
+    stmt = select(models.PurgeJob).where(models.PurgeJob.id == job_id, models.PurgeJob.club_id == club.id)
+    job = db.scalar(stmt)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purge job not found")
+    return job
+
+
+@query_budget(1)
+def page_purge_jobs(db: Session, club: ClubSnapshot, page: PageRequest) -> Page:
+    stmt = select(models.PurgeJob).where(models.PurgeJob.club_id == club.id)
+    return fetch_page(db, stmt, models.PurgeJob, (models.PurgeJob.id,), page)
+
+
+@query_budget(9)
+def set_voting_state(db: Session, club: ClubSnapshot, *, open_state: bool) -> ClubSnapshot:
+    db.execute(
+        update(models.Club)
+        .where(models.Club.id == club.id)
+        .values(voting_open=open_state)
+        .execution_options(synchronize_session=False)
+    )
+    # Bumping with the new state freezes the results when closing (see `_bump_versions`).
+    _bump_versions(db, replace(club, voting_open=open_state), results=True, config=True)
+    if open_state:
+        db.execute(delete(models.ResultsSnapshot).where(models.ResultsSnapshot.club_id == club.id))
+    db.commit()
+    return get_club_by_slug(db, club.slug)
+
+
+def _get_or_create_voter(db: Session, club: ClubSnapshot, voter_name: str) -> models.Voter:
     name = voter_name.strip()
     if not name:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Voter name is required")
@@ -161,156 +857,539 @@ def _get_or_create_voter(db: Session, club: models.Club, voter_name: str) -> mod
     return voter
 
 
-def submit_votes(
-    db: Session, club: models.Club, payload: schemas.VoteSubmission
-) -> Tuple[models.Voter, List[models.Vote]]:
-    if not club.voting_open:
+def _upsert_voter(db: Session, club_id: int, name: str) -> schemas.VoterRead:
+    """Fetch or create a voter in one statement (a no-op ON CONFLICT update makes RETURNING cover both)."""
+    table = models.Voter.__table__
+    stmt = _insert(db, table).values(club_id=club_id, name=name)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.club_id, table.c.name], set_={"name": stmt.excluded.name}
+    ).returning(table.c.id, table.c.name, table.c.club_id, table.c.created_at)
+    return schemas.VoterRead.model_validate(db.execute(stmt).one()._asdict())
+
+
+def _validate_ballot(db: Session, club: ClubSnapshot, votes: List[schemas.VoteEntry]) -> Set[int]:
+    """
+    Check that voting is open and that the ballot's category and book ids belong to the club with a single
+    UNION query instead of loading every row. Reading `voting_open` here rather than trusting the cached
+    snapshot keeps the gate exact across workers right after an admin closes voting. Returns the ids of
+    the ballot's ranked categories.
+    """
+    category_ids = {vote.category_id for vote in votes}
+    book_ids = {book_id for vote in votes for book_id in (vote.rankings or [vote.book_id])}
+    stmt = union_all(
+        select(literal("open"), models.Club.id).where(models.Club.id == club.id, models.Club.voting_open.is_(True)),
+        select(
+            case((models.Category.ranked.is_(True), literal("ranked")), else_=literal("category")), models.Category.id
+        ).where(
+            models.Category.club_id == club.id,
+            models.Category.active.is_(True),
+            models.Category.deleted_at.is_(None),
+            models.Category.id.in_(category_ids),
+        ),
+        select(literal("book"), models.Book.id).where(
+            models.Book.club_id == club.id, models.Book.deleted_at.is_(None), models.Book.id.in_(book_ids)
+        ),
+    )
+    found = set(db.execute(stmt).tuples())
+    if ("open", club.id) not in found:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Voting is closed for this club")
+    ranked = {category_id for kind, category_id in found if kind == "ranked"}
+    for vote in votes:
+        if vote.category_id not in ranked and ("category", vote.category_id) not in found:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid category {vote.category_id}")
+        if vote.rankings is not None and vote.category_id not in ranked:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Category {vote.category_id} is not ranked"
+            )
+        for book_id in vote.rankings or [vote.book_id]:
+            if ("book", book_id) not in found:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid book {book_id}")
+    return ranked
 
-    voter = _get_or_create_voter(db, club, payload.voter_name)
 
-    # Preload valid ids for quick validation
-    categories = {cat.id: cat for cat in list_categories(db, club, include_inactive=False)}
-    books = {book.id: book for book in list_books(db, club)}
+def _upsert_rankings(db: Session, voter_id: int, rankings: Dict[int, List[int]]) -> None:
+    """Store a voter's `{category_id: [book_id, ...]}` rankings with one INSERT ... ON CONFLICT DO UPDATE."""
+    table = models.RankedBallot.__table__
+    stmt = _insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.category_id, table.c.voter_id], set_={"rankings": stmt.excluded.rankings}
+    )
+    db.execute(
+        stmt,
+        [
+            {"category_id": category_id, "voter_id": voter_id, "rankings": pack_rankings(book_ids)}
+            for category_id, book_ids in rankings.items()
+        ],
+    )
 
-    updates: List[models.Vote] = []
-    for vote in payload.votes:
-        category = categories.get(vote.category_id)
-        book = books.get(vote.book_id)
-        if not category:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid category {vote.category_id}")
-        if not book:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid book {vote.book_id}")
 
-        stmt = select(models.Vote).where(
-            models.Vote.voter_id == voter.id,
-            models.Vote.category_id == category.id,
-        )
-        existing = db.scalar(stmt)
-        if existing:
-            existing.book_id = book.id
-            db.add(existing)
-            updates.append(existing)
-        else:
-            new_vote = models.Vote(
-                voter_id=voter.id,
-                club_id=club.id,
-                category_id=category.id,
-                book_id=book.id,
-            )
-            db.add(new_vote)
-            updates.append(new_vote)
+def _unchanged_ballot(
+    db: Session, club: ClubSnapshot, name: str, choices: Dict[int, int], rankings: Dict[int, List[int]]
+) -> Optional[Tuple[schemas.VoterRead, List[schemas.VoteRead]]]:
+    """
+    The voter and their votes when the ballot is exactly what they already cast (a retried submission),
+    read with one query; None when anything would change, including a voter seen for the first time.
+    """
+    rows = db.execute(current_ballot_query(club.id, name, list(choices))).all()
+    if not rows:
+        return None
+    current = {row.category_id: row for row in rows if row.vote_id is not None}
+    for category_id, book_id in choices.items():
+        row = current.get(category_id)
+        if row is None or row.book_id != book_id:
+            return None
+        # A first choice stored without rankings counts as a one-book ranking, as in the runoff.
+        stored = list(unpack_rankings(row.rankings)) if row.rankings is not None else [row.book_id]
+        if category_id in rankings and rankings[category_id] != stored:
+            return None
+    voter = schemas.VoterRead(id=rows[0].id, name=rows[0].name, club_id=rows[0].club_id, created_at=rows[0].created_at)
+    return voter, [
+        schemas.VoteRead(id=current[category_id].vote_id, voter_id=voter.id, category_id=category_id, book_id=book_id)
+        for category_id, book_id in choices.items()
+    ]
+
+
+@query_budget(8)
+def record_ballot(
+    db: Session, club: ClubSnapshot, payload: schemas.VoteSubmission
+) -> Tuple[schemas.VoterRead, List[schemas.VoteRead]]:
+    """
+    Write a ballot inside the caller's transaction with a fixed number of statements however many
+    categories it covers: validate ids, read the voter's current ballot (a resubmitted, unchanged one stops
+    there without writing anything), upsert the voter, read their existing votes, then bulk-upsert the
+    changed ones, plus one upsert of the rankings for ranked categories (whose vote is the first choice).
+    A later entry for the same category overrides an earlier one. The caller commits. Whether voting is open
+    is only decided by `_validate_ballot`'s read: the snapshot's flag may be stale in either direction.
+    """
+    name = payload.voter_name.strip()
+    if not name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Voter name is required")
+    ranked = _validate_ballot(db, club, payload.votes)
+
+    choices = {vote.category_id: vote.book_id for vote in payload.votes}
+    rankings = {
+        vote.category_id: vote.rankings or [vote.book_id] for vote in payload.votes if vote.category_id in ranked
+    }
+    unchanged = _unchanged_ballot(db, club, name, choices, rankings)
+    if unchanged is not None:
+        return unchanged
+
+    voter = _upsert_voter(db, club.id, name)
+    written, vote_ids = _upsert_votes(db, club.id, {voter.id: choices}, returning=True)
+    if rankings:
+        # Lower preferences can change while the first choice stays put, so the results always move on.
+        _upsert_rankings(db, voter.id, rankings)
+    if written or rankings:
+        _bump_versions(db, club, results=True, incremental=True)
+
+    updates = [
+        schemas.VoteRead(id=vote_ids[(voter.id, category_id)], voter_id=voter.id, category_id=category_id, book_id=book_id)
+        for category_id, book_id in choices.items()
+    ]
+    return voter, updates
+
+
+@query_budget(8)
+def submit_votes(
+    db: Session, club: ClubSnapshot, payload: schemas.VoteSubmission
+) -> Tuple[schemas.VoterRead, List[schemas.VoteRead]]:
+    """Record a ballot in its own transaction (see `record_ballot`)."""
+    voter, updates = record_ballot(db, club, payload)
     db.commit()
-    for vote in updates:
-        db.refresh(vote)
     return voter, updates
 
 
-def get_results(db: Session, club: models.Club) -> schemas.ResultsResponse:
-    categories = list_categories(db, club)
-    category_results: List[schemas.CategoryResult] = []
-
-    for category in categories:
-        stmt = (
-            select(models.Book, func.count(models.Vote.id).label("votes_count"))
-            .join(models.Vote, models.Book.id == models.Vote.book_id)
-            .where(models.Vote.category_id == category.id)
-            .group_by(models.Book.id)
-        )
-        rows = db.execute(stmt).all()
-        if not rows:
-            category_results.append(
-                schemas.CategoryResult(
-                    category_id=category.id,
-                    category_name=category.name,
-                    results=[],
-                )
-            )
-            continue
-
-        book_entries: List[schemas.BookResult] = []
-        winner_idx = -1
-        best_score = -1.0
-        best_votes = -1
-        for idx, (book, votes_count) in enumerate(rows):
-            readers = max(book.readers_count, 0)
-            weighted = (votes_count / readers) if readers > 0 else 0.0
-            if weighted > best_score or (weighted == best_score and votes_count > best_votes):
-                best_score = weighted
-                best_votes = votes_count
-                winner_idx = idx
-            book_entries.append(
-                schemas.BookResult(
-                    book_id=book.id,
-                    title=book.title,
-                    author=book.author,
-                    readers_count=readers,
-                    votes_count=votes_count,
-                    weighted_score=round(weighted, 4),
-                    is_winner=False,
-                )
-            )
-        if winner_idx >= 0:
-            book_entries[winner_idx].is_winner = True
-
-        book_entries.sort(key=lambda item: item.weighted_score, reverse=True)
-        category_results.append(
-            schemas.CategoryResult(
-                category_id=category.id,
-                category_name=category.name,
-                results=book_entries,
+def _tally_category(rows: List[Row]) -> List[schemas.BookResult]:
+    """Turn one category's aggregate rows (ordered by book id) into ranked book results."""
+    book_entries: List[schemas.BookResult] = []
+    winner_idx = -1
+    best_score = -1.0
+    best_votes = -1
+    for idx, row in enumerate(rows):
+        readers = max(row.readers_count, 0)
+        weighted = (row.votes_count / readers) if readers > 0 else 0.0
+        if weighted > best_score or (weighted == best_score and row.votes_count > best_votes):
+            best_score = weighted
+            best_votes = row.votes_count
+            winner_idx = idx
+        book_entries.append(
+            schemas.BookResult(
+                book_id=row.book_id,
+                title=row.title,
+                author=row.author,
+                readers_count=readers,
+                votes_count=row.votes_count,
+                weighted_score=round(weighted, 4),
+                is_winner=False,
             )
         )
+    if winner_idx >= 0:
+        book_entries[winner_idx].is_winner = True
 
+    book_entries.sort(key=lambda item: item.weighted_score, reverse=True)
+    return book_entries
+
+
+def _ranked_results(
+    db: Session, books: Sequence[TallyBook], category_ids: List[int]
+) -> Dict[int, Tuple[List[schemas.BookResult], List[schemas.IrvRound]]]:
+    """
+    Instant-runoff results of the club's ranked categories among `books` (in id order), with one query for
+    every ballot of those categories. Books are listed in finishing order.
+    """
+    ballots = _ranked_ballots(db, category_ids)
+    return {category_id: _runoff(books, ballots.get(category_id, [])) for category_id in category_ids}
+
+
+def _ranked_ballots(db: Session, category_ids: List[int]) -> Dict[int, List[Sequence[int]]]:
+    """Every ballot of the ranked categories `category_ids`, in one query, as book ids in order of preference."""
+    ballots: Dict[int, List[Sequence[int]]] = defaultdict(list)
+    for category_id, rankings, book_id in db.execute(ranked_ballots_query(category_ids)):
+        ballots[category_id].append(unpack_rankings(rankings) if rankings is not None else (book_id,))
+    return ballots
+
+
+def _runoff(
+    books: Sequence[TallyBook], ballots: List[Sequence[int]]
+) -> Tuple[List[schemas.BookResult], List[schemas.IrvRound]]:
+    """Instant-runoff results and rounds of one ranked category among `books` (in id order)."""
+    books = {book.id: book for book in books}
+    # Older books win ties, as they would a tie on weighted score.
+    outcome = instant_runoff(ballots, list(books))
+    rounds = [
+        schemas.IrvRound(
+            round=number,
+            tallies=[
+                schemas.IrvTally(book_id=book_id, votes=votes)
+                for book_id, votes in sorted(current.tallies.items(), key=lambda item: -item[1])
+            ],
+            exhausted=current.exhausted,
+            eliminated=current.eliminated,
+            transfers=[
+                schemas.IrvTally(book_id=book_id, votes=votes)
+                for book_id, votes in sorted(current.transfers.items(), key=lambda item: -item[1])
+            ],
+            exhausted_by_transfer=current.exhausted_by_transfer,
+            winner=outcome.winner if number == len(outcome.rounds) else None,
+        )
+        for number, current in enumerate(outcome.rounds, start=1)
+    ]
+    # Each book's share of the ballots still in play in the last round it took part in.
+    shares = {}
+    for current in outcome.rounds:
+        active = sum(current.tallies.values())
+        shares.update((book_id, votes / active) for book_id, votes in current.tallies.items())
+    results = [
+        schemas.BookResult(
+            book_id=book_id,
+            title=books[book_id].title,
+            author=books[book_id].author,
+            readers_count=max(books[book_id].readers_count, 0),
+            votes_count=outcome.rounds[0].tallies[book_id],
+            weighted_score=round(shares[book_id], 4),
+            is_winner=book_id == outcome.winner,
+        )
+        for book_id in outcome.finish_order
+    ]
+    return results, rounds
+
+
+# No query budget: bulk writes run a fixed number of statements per 500-voter chunk, so they follow the upload.
+def import_ballots(db: Session, club: ClubSnapshot, ballots: Dict[str, Dict[int, int]]) -> Tuple[int, int]:
+    """
+    Write a batch of already validated `{voter_name: {category_id: book_id}}` ballots in one transaction.
+    Returns (voters_created, votes_written).
+    """
+    if not ballots:
+        return 0, 0
+    voter_ids, created = _upsert_voters(db, club.id, ballots)
+    written, _ = _upsert_votes(db, club.id, {voter_ids[name]: choices for name, choices in ballots.items()})
+    if written:
+        _bump_versions(db, club, results=True, incremental=True)
+    db.commit()
+    return created, written
+
+
+@query_budget(2)
+def get_results(db: Session, club: ClubSnapshot) -> schemas.ResultsResponse:
+    """
+    Tally every category of a club. Plain categories come from this worker's tally matrix without a query
+    while it is at the club's results_version; otherwise it is reloaded with one query over the club's
+    version, categories, books and materialized `vote_counts` rows (categories x books, not votes), so the
+    matrix and the version it is labelled with come from the same read. Ranked categories add one query for
+    their instant runoff (see `_ranked_results`).
+    """
+    cache_key = ("results", club.id, club.results_version)
+    cached = results_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    response = _compute_results(db, club)
+    results_cache.set(cache_key, response)
+    return response
+
+
+def tally_matrix_query(club_id: int) -> CompoundSelect:
+    """
+    Everything a club's tally matrix holds, as one statement so the rows agree with each other: the club's
+    results_version, its categories (`readers_count` carries `ranked`, `votes_count` the sort order), its
+    visible books and its non-zero `vote_counts` rows, told apart by `kind`.
+    """
+    version = select(
+        literal("version").label("kind"),
+        models.Club.results_version.label("id"),
+        null().label("title"),
+        null().label("author"),
+        null().label("readers_count"),
+        null().label("category_id"),
+        null().label("votes_count"),
+    ).where(models.Club.id == club_id)
+    categories = select(
+        literal("category"),
+        models.Category.id,
+        models.Category.name,
+        null(),
+        case((models.Category.ranked.is_(True), 1), else_=0),
+        null(),
+        models.Category.sort_order,
+    ).where(models.Category.club_id == club_id, models.Category.deleted_at.is_(None))
+    books = select(
+        literal("book"),
+        models.Book.id,
+        models.Book.title,
+        models.Book.author,
+        models.Book.readers_count,
+        null(),
+        null(),
+    ).where(models.Book.club_id == club_id, models.Book.deleted_at.is_(None))
+    counts = select(
+        literal("count"),
+        models.VoteCount.book_id,
+        null(),
+        null(),
+        null(),
+        models.VoteCount.category_id,
+        models.VoteCount.votes_count,
+    ).where(models.VoteCount.club_id == club_id, models.VoteCount.votes_count > 0)
+    return union_all(version, categories, books, counts)
+
+
+def _load_tally_matrix(db: Session, club: ClubSnapshot) -> TallyMatrix:
+    results_version, categories, books, counts = club.results_version, [], [], []
+    for row in db.execute(tally_matrix_query(club.id)):
+        if row.kind == "version":
+            results_version = row.id
+        elif row.kind == "category":
+            categories.append((row.votes_count, TallyCategory(row.id, row.title, bool(row.readers_count))))
+        elif row.kind == "book":
+            books.append(TallyBook(row.id, row.title, row.author, row.readers_count))
+        else:
+            counts.append(row)
+    # The order of `list_categories`.
+    categories.sort(key=lambda item: (item[0], item[1].id))
+    books.sort(key=lambda book: book.id)
+    matrix = TallyMatrix(club.id, results_version, [category for _, category in categories], books)
+    for row in counts:
+        # Counts of deleted books and categories wait for the purger; they are not results.
+        matrix.add(row.category_id, row.id, row.votes_count)
+    return matrix
+
+
+def _compute_results(db: Session, club: ClubSnapshot, *, keep_tally: bool = True) -> schemas.ResultsResponse:
+    """
+    Results from the club's tally matrix, reloading it when it is missing or at another results_version.
+    A matrix loaded inside a write transaction (`keep_tally=False`) may hold uncommitted counts, so it is
+    used for this call only.
+    """
+    served = tally_store.results(club.id, club.results_version)
+    if served is None:
+        matrix = _load_tally_matrix(db, club)
+        served = matrix.categories, matrix.books, matrix.category_results()
+        if keep_tally:
+            tally_store.put(matrix)
+    categories, books, category_results = served
+
+    ranked_ids = [category.id for category in categories if category.ranked]
+    if ranked_ids:
+        ranked = _ranked_results(db, books, ranked_ids)
+        for index, category in enumerate(categories):
+            if category.id in ranked:
+                results, rounds = ranked[category.id]
+                category_results[index] = schemas.CategoryResult(
+                    category_id=category.id, category_name=category.name, results=results, ranked=True, rounds=rounds
+                )
     return schemas.ResultsResponse(club=schemas.ClubRead.model_validate(club), categories=category_results)
 
 
-def submit_best_member_vote(db: Session, club: models.Club, payload: schemas.BestMemberVoteSubmission) -> models.BestMemberVote:
+def _store_frozen_results(db: Session, club: ClubSnapshot) -> None:
+    """Compute the public payloads of a closed club, bypassing `results_cache` (nothing is committed yet)."""
+    results = _compute_results(db, club, keep_tally=False)
+    reveal = schemas.RevealResultsResponse(status="ok", club=results.club, results=results.categories)
+    values = {
+        "results_version": club.results_version,
+        "results_json": results.model_dump_json(),
+        "reveal_json": reveal.model_dump_json(),
+        "best_member_json": _compute_best_member_results(db, club).model_dump_json(),
+        "frozen_at": datetime.utcnow(),
+    }
+    table = models.ResultsSnapshot.__table__
+    stmt = _insert(db, table).values(club_id=club.id, **values)
+    db.execute(stmt.on_conflict_do_update(index_elements=[table.c.club_id], set_=values))
+
+
+@query_budget(1)
+def get_frozen_results(db: Session, club: ClubSnapshot) -> Optional[FrozenResults]:
+    """
+    Results frozen when the club's voting closed, or None while voting is open or when no snapshot matches
+    the club's results_version (a club closed before snapshots existed); callers then compute them live.
+    """
+    if club.voting_open:
+        return None
+    cache_key = ("frozen", club.id, club.results_version)
+    cached = results_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    stmt = select(
+        models.ResultsSnapshot.results_json, models.ResultsSnapshot.reveal_json, models.ResultsSnapshot.best_member_json
+    ).where(
+        models.ResultsSnapshot.club_id == club.id, models.ResultsSnapshot.results_version == club.results_version
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        return None
+    frozen = FrozenResults(*row)
+    results_cache.set(cache_key, frozen)
+    return frozen
+
+
+@query_budget(3)
+def load_results_state(db: Session, slug: str) -> Tuple[ClubSnapshot, schemas.ResultsResponse]:
+    """
+    Current club row (read past `club_cache`, so writes from other workers show up) and its results,
+    which still come from `results_cache` when the results_version has not moved.
+    """
+    club = _load_club(db, slug)
+    return club, get_results(db, club)
+
+
+results_feeds.loader = load_results_state
+
+
+@query_budget(11)
+def check_vote_counts(db: Session, club: ClubSnapshot, *, repair: bool = False) -> schemas.VoteCountCheckResponse:
+    """Compare the `vote_counts` counters with a recount of the raw `votes` table, optionally rebuilding them."""
+    expected = {
+        (category_id, book_id): count for category_id, book_id, count in db.execute(vote_recount_query(club.id))
+    }
+    stored_stmt = select(models.VoteCount.category_id, models.VoteCount.book_id, models.VoteCount.votes_count).where(
+        models.VoteCount.club_id == club.id
+    )
+    stored = {(category_id, book_id): count for category_id, book_id, count in db.execute(stored_stmt)}
+
+    drift = [
+        schemas.VoteCountDrift(
+            category_id=category_id,
+            book_id=book_id,
+            expected=expected.get((category_id, book_id), 0),
+            stored=stored.get((category_id, book_id), 0),
+        )
+        for category_id, book_id in sorted(expected.keys() | stored.keys())
+        if expected.get((category_id, book_id), 0) != stored.get((category_id, book_id), 0)
+    ]
+
+    if repair and drift:
+        db.execute(delete(models.VoteCount).where(models.VoteCount.club_id == club.id))
+        _apply_vote_count_deltas(db, club.id, expected)
+        _bump_versions(db, club, results=True)
+        db.commit()
+
+    return schemas.VoteCountCheckResponse(
+        club=schemas.ClubRead.model_validate(club),
+        consistent=not drift,
+        repaired=repair and bool(drift),
+        drift=drift,
+    )
+
+
+def _nominee_ids(db: Session, club: ClubSnapshot) -> Dict[str, int]:
+    """
+    The club's configured best-member nominees as {name: id}, cached per config_version. The version is read
+    in this transaction rather than taken from the snapshot, which may predate an added or deleted nominee.
+    """
+    config_version = db.scalar(select(models.Club.config_version).where(models.Club.id == club.id))
+    cache_key = ("nominee_ids", club.id, config_version)
+    cached = config_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    stmt = select(models.BestMemberNominee.name, models.BestMemberNominee.id).where(
+        models.BestMemberNominee.club_id == club.id
+    )
+    nominee_ids = dict(db.execute(stmt).all())
+    config_cache.set(cache_key, nominee_ids)
+    return nominee_ids
+
+
+@query_budget(14)
+def submit_best_member_vote(db: Session, club: ClubSnapshot, payload: schemas.BestMemberVoteSubmission) -> models.BestMemberVote:
     voter = _get_or_create_voter(db, club, payload.voter_name)
     nominee = payload.nominee_name.strip()
     if not nominee:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nominee name is required")
 
     # Validate nominee exists if admin configured nominees; allow free text only when none exist.
-    stmt_nominees = select(models.BestMemberNominee.name).where(models.BestMemberNominee.club_id == club.id)
-    allowed = {row for (row,) in db.execute(stmt_nominees)}
-    if allowed and nominee not in allowed:
+    nominee_ids = _nominee_ids(db, club)
+    if nominee_ids and nominee not in nominee_ids:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid nominee")
+    nominee_id = nominee_ids.get(nominee)
 
     stmt = select(models.BestMemberVote).where(
         models.BestMemberVote.club_id == club.id, models.BestMemberVote.voter_id == voter.id
     )
-    existing = db.scalar(stmt)
-    if existing:
-        existing.nominee_name = nominee
-        db.add(existing)
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    vote = models.BestMemberVote(club_id=club.id, voter_id=voter.id, nominee_name=nominee)
+    vote = db.scalar(stmt)
+    if vote and (vote.nominee_id, vote.nominee_name) == (nominee_id, nominee):
+        return vote  # a resubmitted, unchanged vote: nothing to write
+    if vote:
+        vote.nominee_id = nominee_id
+        vote.nominee_name = nominee
+    else:
+        vote = models.BestMemberVote(club_id=club.id, voter_id=voter.id, nominee_id=nominee_id, nominee_name=nominee)
     db.add(vote)
-    db.commit()
+    _bump_versions(db, club, results=True, incremental=True)
+    try:
+        db.commit()
+    except IntegrityError as exc:  # the nominee was deleted meanwhile, or the voter's first vote raced another
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Nominees changed while voting, please try again"
+        ) from exc
     db.refresh(vote)
     return vote
 
 
-def get_best_member_results(db: Session, club: models.Club) -> schemas.BestMemberResultsResponse:
-    stmt = (
-        select(models.BestMemberVote.nominee_name, func.count(models.BestMemberVote.id).label("votes"))
-        .where(models.BestMemberVote.club_id == club.id)
-        .group_by(models.BestMemberVote.nominee_name)
-    )
-    rows = db.execute(stmt).all()
-    if not rows:
+@query_budget(1)
+def get_best_member_results(db: Session, club: ClubSnapshot) -> schemas.BestMemberResultsResponse:
+    cache_key = ("best_member", club.id, club.results_version)
+    cached = results_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    response = _compute_best_member_results(db, club)
+    results_cache.set(cache_key, response)
+    return response
+
+
+def _compute_best_member_results(db: Session, club: ClubSnapshot) -> schemas.BestMemberResultsResponse:
+    # A nominee deleted after it got votes leaves free-text votes under the same name: count them together.
+    counts: Dict[str, int] = defaultdict(int)
+    for _, nominee_name, votes_count in db.execute(best_member_tally_query(club.id)):
+        counts[nominee_name] += votes_count
+    if not counts:
         return schemas.BestMemberResultsResponse(
             club=schemas.ClubRead.model_validate(club),
             nominees=[],
         )
 
     results: list[schemas.BestMemberResult] = []
-    best_votes = max(v for _, v in rows)
-    for nominee_name, votes_count in rows:
+    best_votes = max(counts.values())
+    for nominee_name, votes_count in sorted(counts.items()):
         results.append(
             schemas.BestMemberResult(
                 nominee_name=nominee_name,
@@ -325,12 +1404,14 @@ def get_best_member_results(db: Session, club: models.Club) -> schemas.BestMembe
     )
 
 
-def create_best_member_nominee(db: Session, club: models.Club, name: str) -> models.BestMemberNominee:
+@query_budget(3)
+def create_best_member_nominee(db: Session, club: ClubSnapshot, name: str) -> models.BestMemberNominee:
     name = name.strip()
     if not name:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Name is required")
     nominee = models.BestMemberNominee(club_id=club.id, name=name)
     db.add(nominee)
+    _bump_versions(db, club, config=True)
     try:
         db.commit()
     except IntegrityError as exc:
@@ -340,14 +1421,23 @@ def create_best_member_nominee(db: Session, club: models.Club, name: str) -> mod
     return nominee
 
 
-def list_best_member_nominees(db: Session, club: models.Club) -> list[models.BestMemberNominee]:
+@query_budget(1)
+def list_best_member_nominees(db: Session, club: ClubSnapshot) -> list[models.BestMemberNominee]:
     stmt = select(models.BestMemberNominee).where(models.BestMemberNominee.club_id == club.id).order_by(
         models.BestMemberNominee.name
     )
     return list(db.scalars(stmt))
 
 
-def delete_best_member_nominee(db: Session, club: models.Club, nominee_id: int) -> None:
+@query_budget(1)
+def page_best_member_nominees(db: Session, club: ClubSnapshot, page: PageRequest) -> Page:
+    stmt = select(models.BestMemberNominee).where(models.BestMemberNominee.club_id == club.id)
+    order_by = (models.BestMemberNominee.name, models.BestMemberNominee.id)
+    return fetch_page(db, stmt, models.BestMemberNominee, order_by, page)
+
+
+@query_budget(3)
+def delete_best_member_nominee(db: Session, club: ClubSnapshot, nominee_id: int) -> None:
     stmt = select(models.BestMemberNominee).where(
         models.BestMemberNominee.id == nominee_id, models.BestMemberNominee.club_id == club.id
     )
@@ -355,4 +1445,5 @@ def delete_best_member_nominee(db: Session, club: models.Club, nominee_id: int)
     if not nominee:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nominee not found")
     db.delete(nominee)
+    _bump_versions(db, club, config=True)
     db.commit()
@@ -1,7 +1,10 @@
+from functools import lru_cache
+from typing import Optional
+
 from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 try:  # pragma: no cover
     from .config import get_settings
@@ -10,84 +13,112 @@ except ImportError:  # pragma: no cover
 
 
 settings = get_settings()
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args, future=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (aiosqlite for SQLite, asyncpg for Postgres)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Engines are built on first use, so importing this module (or anything that imports it) neither loads a
+# database driver nor touches the database.
+@lru_cache
+def get_engine() -> Engine:
+    connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+    return _configure(create_engine(settings.database_url, connect_args=connect_args, future=True))
+
+
+@lru_cache
+def get_async_engine() -> Optional[AsyncEngine]:
+    """The async engine, or None unless DB_ASYNC is enabled (so sync deployments need no async drivers)."""
+    if not settings.async_db:
+        return None
+    engine = create_async_engine(settings.async_database_url or async_database_url(settings.database_url))
+    _configure(engine.sync_engine)
+    return engine
+
+
+@lru_cache
+def get_replica_engine() -> Optional[Engine]:
+    """Engine of the read replica, or None unless REPLICA_DATABASE_URL is set (reads then use the primary)."""
+    if not settings.replica_database_url:
+        return None
+    connect_args = {"check_same_thread": False} if settings.replica_database_url.startswith("sqlite") else {}
+    return _configure(create_engine(settings.replica_database_url, connect_args=connect_args, future=True))
+
+
+@lru_cache
+def get_async_replica_engine() -> Optional[AsyncEngine]:
+    if not settings.async_db or not settings.replica_database_url:
+        return None
+    engine = create_async_engine(
+        settings.async_replica_database_url or async_database_url(settings.replica_database_url)
+    )
+    _configure(engine.sync_engine)
+    return engine
+
+
+class _EngineSession(Session):
+    """Session bound to `get_engine()` when it first needs a connection rather than when it is created."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is not None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        return get_engine()
+
+
+class _AsyncEngineSession(Session):
+    """Sync side of the AsyncSessions from `AsyncSessionLocal`, bound to `get_async_engine()` on first use."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_async_engine().sync_engine
+
+
+class _ReplicaSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_replica_engine()
+
+
+class _AsyncReplicaSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_async_replica_engine().sync_engine
+
+
+SessionLocal = sessionmaker(class_=_EngineSession, autocommit=False, autoflush=False, future=True)
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, sync_session_class=_AsyncEngineSession, autoflush=False)
+# Read-only sessions on the replica; `info["replica"]` tells crud code its rows may lag the primary.
+ReplicaSessionLocal = sessionmaker(
+    class_=_ReplicaSession, autocommit=False, autoflush=False, future=True, info={"replica": True}
+)
+AsyncReplicaSessionLocal = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=_AsyncReplicaSession, autoflush=False, info={"replica": True}
+)
+
 
-@event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):  # pragma: no cover
-    if settings.database_url.startswith("sqlite"):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-
-
-def ensure_sqlite_schema():
-    """
-    Perform lightweight, in-place upgrades for SQLite databases that may have been created
-    with an older schema (e.g., missing votes.book_id / votes.created_at / legacy entity columns).
-    """
-    if not settings.database_url.startswith("sqlite"):
-        return
-
-    with engine.begin() as conn:
-        try:
-            vote_info = list(conn.exec_driver_sql("PRAGMA table_info(votes);"))
-            vote_columns = {row[1] for row in vote_info}
-        except OperationalError:
-            return
-
-        if not vote_columns:
-            return
-
-        if "book_id" not in vote_columns:
-            conn.exec_driver_sql("ALTER TABLE votes ADD COLUMN book_id INTEGER;")
-            if "entity_id" in vote_columns:
-                conn.exec_driver_sql("UPDATE votes SET book_id = entity_id;")
-
-        if "created_at" not in vote_columns:
-            conn.exec_driver_sql("ALTER TABLE votes ADD COLUMN created_at DATETIME DEFAULT CURRENT_TIMESTAMP;")
-
-        # Legacy schema had entity_type/entity_id columns with NOT NULL constraint; rebuild if present.
-        if "entity_type" in vote_columns or "entity_id" in vote_columns:
-            conn.exec_driver_sql(
-                """
-                CREATE TABLE IF NOT EXISTS votes_mig (
-                    id INTEGER PRIMARY KEY,
-                    voter_id INTEGER NOT NULL,
-                    club_id INTEGER NOT NULL,
-                    category_id INTEGER NOT NULL,
-                    book_id INTEGER NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                    FOREIGN KEY(voter_id) REFERENCES voters(id) ON DELETE CASCADE,
-                    FOREIGN KEY(club_id) REFERENCES clubs(id) ON DELETE CASCADE,
-                    FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE,
-                    FOREIGN KEY(book_id) REFERENCES books(id) ON DELETE CASCADE
-                );
-                """
-            )
-            conn.exec_driver_sql(
-                """
-                INSERT INTO votes_mig (id, voter_id, club_id, category_id, book_id, created_at)
-                SELECT id,
-                       voter_id,
-                       club_id,
-                       category_id,
-                       COALESCE(book_id, entity_id) as book_id,
-                       COALESCE(created_at, CURRENT_TIMESTAMP)
-                FROM votes;
-                """
-            )
-            conn.exec_driver_sql("DROP TABLE votes;")
-            conn.exec_driver_sql("ALTER TABLE votes_mig RENAME TO votes;")
-
-        index_names = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(votes);")}
-        if "uix_vote_voter_category" not in index_names:
-            conn.exec_driver_sql(
-                "CREATE UNIQUE INDEX IF NOT EXISTS uix_vote_voter_category ON votes (voter_id, category_id)"
-            )
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # WAL lets readers proceed while a ballot is being written, and NORMAL sync is durable enough in WAL
+    # mode while skipping the per-commit fsync of the main database file. Writers that find the lock
+    # taken wait up to the busy timeout instead of failing straight away with "database is locked".
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.close()
+
+
+def _configure(engine: Engine) -> Engine:
+    """Apply `set_sqlite_pragma` to every connection of `engine` when, and only when, it is a SQLite engine."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragma)
+    return engine
 
 
 def get_db():
@@ -98,5 +129,14 @@ def get_db():
         db.close()
 
 
-# Ensure any legacy local SQLite files are aligned before the app starts serving traffic.
-ensure_sqlite_schema()
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def read_session_factory(*, primary: bool = False):
+    """Where a read-only request gets its session: the replica when one is configured, unless `primary`."""
+    if primary or not settings.replica_database_url:
+        return AsyncSessionLocal if settings.async_db else SessionLocal
+    return AsyncReplicaSessionLocal if settings.async_db else ReplicaSessionLocal
+
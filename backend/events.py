@@ -0,0 +1,232 @@
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+try:  # pragma: no cover
+    from . import schemas
+    from .cache import ClubSnapshot
+    from .config import get_settings
+    from .database import SessionLocal
+except ImportError:  # pragma: no cover
+    import schemas  # type: ignore
+    from cache import ClubSnapshot  # type: ignore
+    from config import get_settings  # type: ignore
+    from database import SessionLocal  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+ResultsLoader = Callable[[Session, str], Tuple[ClubSnapshot, schemas.ResultsResponse]]
+CountKey = Tuple[int, int]  # (category_id, book_id)
+
+KEEPALIVE = b": keep-alive\n\n"
+
+
+def format_event(name: str, seq: int, data: dict) -> bytes:
+    """Encode one `text/event-stream` message."""
+    return f"event: {name}\nid: {seq}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscriber:
+    """One connected stream. Messages are pre-encoded by the feed, so delivery is just a queue put."""
+
+    def __init__(self, feed: "ClubFeed", *, public: bool, maxsize: int):
+        self.feed = feed
+        self.public = public
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, message: bytes) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind to replay deltas: drop the backlog and resynchronise from a fresh snapshot.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self.feed.snapshot(public=self.public))
+
+    async def get(self) -> bytes:
+        return await self.queue.get()
+
+
+class ClubFeed:
+    """
+    Change feed for one club, shared by every stream subscribed to it in this process. A single task
+    reloads the club's results when a local commit wakes it (see `ResultsFeeds.notify`) or every
+    `poll_interval` seconds to catch writes from other workers, diffs the per-book counts against
+    the previous load and fans the change out to all subscribers. Result loads go through
+    `results_cache`, so a burst of wake-ups costs at most one recount per results_version.
+    """
+
+    def __init__(self, feeds: "ResultsFeeds", club: ClubSnapshot):
+        self.feeds = feeds
+        self.club_id = club.id
+        self.slug = club.slug
+        self.loop = asyncio.get_running_loop()
+        self.subscribers: Set[Subscriber] = set()
+        self.joining = 0
+        self.club: Optional[ClubSnapshot] = None
+        self.results: Optional[schemas.ResultsResponse] = None
+        self.counts: Dict[CountKey, int] = {}
+        # Instant-runoff rounds of ranked categories, which deltas cannot describe.
+        self.rounds: Dict[int, List[schemas.IrvRound]] = {}
+        self.seq = 0
+        self.changed_at = time.time()
+        self.ready = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._snapshots: Dict[bool, bytes] = {}
+        # A fresh context, so the feed's queries are not attributed to the request that happened to start it.
+        self._task = self.loop.create_task(self._run(), context=contextvars.Context())
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def snapshot(self, *, public: bool) -> bytes:
+        """
+        Full state as a `snapshot` event. Public streams only see results once voting has closed,
+        matching the reveal endpoint.
+        """
+        message = self._snapshots.get(public)
+        if message is None:
+            hidden = public and self.club.voting_open
+            data = {
+                "seq": self.seq,
+                "ts": self.changed_at,
+                "voting_open": self.club.voting_open,
+                "results": None if hidden else self.results.model_dump(mode="json"),
+            }
+            message = self._snapshots[public] = format_event("snapshot", self.seq, data)
+        return message
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    await self._refresh()
+                except Exception:  # keep serving the last state; the next wake-up or poll retries
+                    logger.exception("Refreshing results feed for club %s failed", self.club_id)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.feeds.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if not self.subscribers and not self.joining:
+                    break
+        finally:
+            self.feeds.retire(self)
+
+    def _load(self) -> Tuple[ClubSnapshot, schemas.ResultsResponse]:
+        with SessionLocal() as db:
+            return self.feeds.loader(db, self.slug)
+
+    async def _refresh(self) -> None:
+        club, results = await run_in_threadpool(self._load)
+        counts = {
+            (category.category_id, book.book_id): book.votes_count
+            for category in results.categories
+            for book in category.results
+        }
+        rounds = {category.category_id: category.rounds for category in results.categories if category.ranked}
+        previous, previous_rounds = self.club, self.rounds
+        self.club, self.results, self.rounds = club, results, rounds
+        if previous is None:
+            self.counts = counts
+            self.ready.set()
+            return
+        if (club.results_version, club.config_version) == (previous.results_version, previous.config_version):
+            return
+
+        self._snapshots.clear()
+        if (
+            club.config_version != previous.config_version
+            or club.voting_open != previous.voting_open
+            or rounds != previous_rounds
+        ):
+            # Books, categories, the voting state or a runoff changed: deltas cannot describe that, resend everything.
+            self.counts = counts
+            self._publish()
+            self._broadcast(self.snapshot(public=False), self.snapshot(public=True))
+            return
+
+        changes: Dict[int, List[dict]] = {}
+        for key in sorted(counts.keys() | self.counts.keys()):
+            before, after = self.counts.get(key, 0), counts.get(key, 0)
+            if before != after:
+                changes.setdefault(key[0], []).append({"book_id": key[1], "votes_count": after, "delta": after - before})
+        self.counts = counts
+        if not changes:
+            return
+        self._publish()
+        data = {
+            "seq": self.seq,
+            "ts": self.changed_at,
+            "categories": [{"category_id": category_id, "books": books} for category_id, books in changes.items()],
+        }
+        message = format_event("delta", self.seq, data)
+        self._broadcast(message, None if club.voting_open else message)
+
+    def _publish(self) -> None:
+        self.seq += 1
+        self.changed_at = time.time()
+
+    def _broadcast(self, admin_message: bytes, public_message: Optional[bytes]) -> None:
+        for subscriber in list(self.subscribers):
+            message = public_message if subscriber.public else admin_message
+            if message is not None:
+                subscriber.push(message)
+
+
+class ResultsFeeds:
+    """Per-process registry of club feeds; a feed exists only while someone is subscribed to it."""
+
+    def __init__(self, loader: Optional[ResultsLoader] = None, *, poll_interval: float, queue_size: int):
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self._feeds: Dict[int, ClubFeed] = {}
+
+    def notify(self, club_id: int) -> None:
+        """Wake the club's feed after a commit. Safe to call from any thread."""
+        feed = self._feeds.get(club_id)
+        if feed is None:
+            return
+        try:
+            feed.loop.call_soon_threadsafe(feed.wake)
+        except RuntimeError:  # event loop already closed
+            pass
+
+    def retire(self, feed: ClubFeed) -> None:
+        if self._feeds.get(feed.club_id) is feed:
+            del self._feeds[feed.club_id]
+
+    @asynccontextmanager
+    async def subscribe(self, club: ClubSnapshot, *, public: bool) -> AsyncIterator[Subscriber]:
+        """Join the club's feed; the first message queued is the current snapshot."""
+        feed = self._feeds.get(club.id)
+        if feed is None or feed.loop is not asyncio.get_running_loop():
+            feed = self._feeds[club.id] = ClubFeed(self, club)
+        subscriber = Subscriber(feed, public=public, maxsize=self.queue_size)
+        feed.joining += 1
+        try:
+            await feed.ready.wait()
+        finally:
+            feed.joining -= 1
+        # No await between queueing the snapshot and joining, so no delta can slip in ahead of it.
+        subscriber.push(feed.snapshot(public=public))
+        feed.subscribers.add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            feed.subscribers.discard(subscriber)
+            if not feed.subscribers:
+                feed.wake()
+
+
+settings = get_settings()
+# The loader is set by crud once it is imported (crud publishes into this registry after each commit).
+results_feeds = ResultsFeeds(poll_interval=settings.stream_poll_interval, queue_size=settings.stream_queue_size)
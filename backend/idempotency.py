@@ -0,0 +1,56 @@
+import hashlib
+from typing import Optional, Tuple, Union
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:  # pragma: no cover
+    from .cache import idempotency_cache
+except ImportError:  # pragma: no cover
+    from cache import idempotency_cache  # type: ignore
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _cache_key(route: str, club_slug: str, key: str) -> Tuple[str, str, str]:
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters"
+        )
+    return route, club_slug, key
+
+
+def _fingerprint(payload: BaseModel) -> bytes:
+    return hashlib.sha256(payload.model_dump_json().encode()).digest()
+
+
+def replay(route: str, club_slug: str, key: Optional[str], payload: BaseModel) -> Optional[Response]:
+    """
+    The stored response when `key` was already answered for this route and club, or None. Nothing touches
+    the database. Reusing a key for a different request body is rejected rather than answered with the
+    response of the first one.
+    """
+    if key is None:
+        return None
+    entry = idempotency_cache.get(_cache_key(route, club_slug, key))
+    if entry is None:
+        return None
+    fingerprint, body = entry
+    if fingerprint != _fingerprint(payload):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"{HEADER} was already used for another request"
+        )
+    return Response(content=body, media_type="application/json", headers={"Idempotent-Replayed": "true"})
+
+
+def remember(
+    route: str, club_slug: str, key: Optional[str], payload: BaseModel, response: BaseModel
+) -> Union[BaseModel, Response]:
+    """Store a successful response under `key` for `replay` and return it as the exact bytes retries will get."""
+    if key is None:
+        return response
+    body = response.model_dump_json().encode()
+    idempotency_cache.set(_cache_key(route, club_slug, key), (_fingerprint(payload), body))
+    return Response(content=body, media_type="application/json")
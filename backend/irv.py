@@ -0,0 +1,121 @@
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+def pack_rankings(book_ids: Sequence[int]) -> bytes:
+    """Ranked book ids as little-endian uint32s: 4 bytes per preference."""
+    packed = array("I", book_ids)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_rankings(data: bytes) -> array:
+    rankings = array("I")
+    rankings.frombytes(data)
+    if sys.byteorder == "big":
+        rankings.byteswap()
+    return rankings
+
+
+@dataclass
+class IrvRound:
+    # Ballots held by each continuing candidate at the start of the round.
+    tallies: Dict[int, int]
+    # Ballots with no continuing candidate left, cumulative.
+    exhausted: int
+    # Candidate knocked out at the end of the round, and where its ballots went.
+    eliminated: Optional[int] = None
+    transfers: Dict[int, int] = field(default_factory=dict)
+    exhausted_by_transfer: int = 0
+
+
+@dataclass
+class IrvOutcome:
+    rounds: List[IrvRound]
+    winner: Optional[int]
+    # Every candidate that held a ballot, best first: the winner, the other finalists, then the eliminated
+    # ones in reverse order of elimination.
+    finish_order: List[int]
+
+
+def instant_runoff(ballots: Iterable[Sequence[int]], candidates: Sequence[int]) -> IrvOutcome:
+    """
+    Instant-runoff count. Ballots are packed into one flat array of candidate indexes (unknown ids and
+    repeats dropped) with a start offset per ballot, and every ballot sits in the pile of its current
+    choice. Eliminating a candidate only walks that candidate's pile, moving each ballot's cursor on to
+    its next continuing choice, so the whole count touches each preference at most once instead of
+    rescanning every ballot per round.
+
+    Candidates no ballot reaches are left out from the start. Each round, a candidate holding more than half
+    of the non-exhausted ballots wins; otherwise the weakest one is eliminated, with ties broken by fewer
+    first preferences and then by the later position in `candidates`.
+    """
+    index = {candidate: i for i, candidate in enumerate(candidates)}
+    prefs = array("i")
+    starts = array("i")
+    for ballot in ballots:
+        starts.append(len(prefs))
+        seen = set()
+        for candidate in ballot:
+            i = index.get(candidate)
+            if i is not None and i not in seen:
+                seen.add(i)
+                prefs.append(i)
+    starts.append(len(prefs))
+
+    count = len(candidates)
+    cursor = array("i", starts[:-1])
+    piles = [array("i") for _ in range(count)]
+    exhausted = 0
+    for ballot in range(len(starts) - 1):
+        if cursor[ballot] < starts[ballot + 1]:
+            piles[prefs[cursor[ballot]]].append(ballot)
+        else:
+            exhausted += 1
+    first_preferences = [len(pile) for pile in piles]
+
+    def strength(i: int):
+        return (len(piles[i]), first_preferences[i], -i)
+
+    continuing = [i for i in range(count) if piles[i]]
+    alive = bytearray(count)
+    for i in continuing:
+        alive[i] = 1
+    rounds: List[IrvRound] = []
+    eliminated_order: List[int] = []
+    winner: Optional[int] = None
+    while continuing:
+        tallies = {i: len(piles[i]) for i in continuing}
+        current = IrvRound(tallies={candidates[i]: votes for i, votes in tallies.items()}, exhausted=exhausted)
+        rounds.append(current)
+        active = sum(tallies.values())
+        leader = max(continuing, key=strength)
+        if tallies[leader] * 2 > active or len(continuing) == 1:
+            winner = leader
+            break
+
+        loser = min(continuing, key=strength)
+        alive[loser] = 0
+        continuing.remove(loser)
+        eliminated_order.append(loser)
+        for ballot in piles[loser]:
+            position, end = cursor[ballot] + 1, starts[ballot + 1]
+            while position < end and not alive[prefs[position]]:
+                position += 1
+            cursor[ballot] = position
+            if position < end:
+                target = candidates[prefs[position]]
+                piles[prefs[position]].append(ballot)
+                current.transfers[target] = current.transfers.get(target, 0) + 1
+            else:
+                exhausted += 1
+                current.exhausted_by_transfer += 1
+        piles[loser] = array("i")
+        current.eliminated = candidates[loser]
+
+    finalists = sorted(continuing, key=strength, reverse=True)
+    finish_order = [candidates[i] for i in finalists + eliminated_order[::-1]]
+    return IrvOutcome(rounds=rounds, winner=None if winner is None else candidates[winner], finish_order=finish_order)
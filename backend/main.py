@@ -1,33 +1,134 @@
-from fastapi import Depends, FastAPI, Header, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Literal, TypeVar
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 try:  # pragma: no cover
-    from . import crud, models, schemas
+    from . import ballot_export, ballot_import, crud, events, idempotency, metrics, migrations, models, schemas
+    from .purger import purger
+    from .tally import tally_store
+    from .vote_writer import vote_writer
+    from .cache import ClubSnapshot, club_cache, config_cache, idempotency_cache, results_cache
+    from .events import results_feeds
+    from .pagination import Page, PageRequest, page_request
+    from .querycount import query_budget
     from .config import get_settings
-    from .database import Base, engine, get_db
+    from .database import get_async_db, get_async_engine, get_engine
+    from .database import get_async_replica_engine, get_replica_engine
+    from .database import get_db as get_sync_db
+    from .replica import STICKY_HEADER, StickyPrimaryMiddleware, get_read_db
 except ImportError:  # pragma: no cover
+    import ballot_export  # type: ignore
+    import ballot_import  # type: ignore
     import crud  # type: ignore
+    import events  # type: ignore
+    import idempotency  # type: ignore
+    import metrics  # type: ignore
+    import migrations  # type: ignore
     import models  # type: ignore
     import schemas  # type: ignore
+    from cache import ClubSnapshot, club_cache, config_cache, idempotency_cache, results_cache  # type: ignore
+    from events import results_feeds  # type: ignore
+    from pagination import Page, PageRequest, page_request  # type: ignore
+    from querycount import query_budget  # type: ignore
     from config import get_settings  # type: ignore
-    from database import Base, engine, get_db  # type: ignore
+    from purger import purger  # type: ignore
+    from tally import tally_store  # type: ignore
+    from vote_writer import vote_writer  # type: ignore
+    from database import get_async_db, get_async_engine, get_engine  # type: ignore
+    from database import get_async_replica_engine, get_replica_engine  # type: ignore
+    from database import get_db as get_sync_db  # type: ignore
+    from replica import STICKY_HEADER, StickyPrimaryMiddleware, get_read_db  # type: ignore
 
 settings = get_settings()
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Book Club Awards API")
+
+def prepare_database() -> None:
+    """Per-worker startup: instrument the engines and check (or bring up to date) the schema version."""
+    engine = get_engine()
+    async_engine = get_async_engine()
+    if settings.metrics_enabled:
+        metrics.instrument_engine(engine, "sync")
+        if async_engine is not None:
+            metrics.instrument_engine(async_engine.sync_engine, "async")
+        if get_replica_engine() is not None:
+            metrics.instrument_engine(get_replica_engine(), "sync-replica")
+        if get_async_replica_engine() is not None:
+            metrics.instrument_engine(get_async_replica_engine().sync_engine, "async-replica")
+    migrations.ensure_schema(engine, migrate=settings.migrate_on_startup)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(prepare_database)
+    await run_in_threadpool(purger.resume)
+    if settings.tally_snapshot_path:
+        await run_in_threadpool(tally_store.load, settings.tally_snapshot_path)
+    yield
+    await run_in_threadpool(vote_writer.stop)
+    await run_in_threadpool(purger.stop)
+    if settings.tally_snapshot_path:
+        await run_in_threadpool(tally_store.save, settings.tally_snapshot_path)
+
+
+app = FastAPI(title="Book Club Awards API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[origin.strip() for origin in settings.allow_origins],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", STICKY_HEADER],
 )
-
-
-def verify_admin_secret(
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+if settings.replica_database_url:
+    app.add_middleware(StickyPrimaryMiddleware)
+
+# Handlers are async in both modes; only the session type (and how crud code reaches it) differs.
+get_db = get_async_db if settings.async_db else get_sync_db
+DbSession = Session | AsyncSession
+T = TypeVar("T")
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a sync crud function against the request's session. With an AsyncSession it goes through
+    `run_sync`, which drives the same ORM code on the event loop via the async driver; with a sync
+    Session it runs in the threadpool as plain `def` handlers would.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def page_response(page: Page, request: PageRequest, schema: type[BaseModel]) -> JSONResponse:
+    """A list page as JSON; the cursor of the next page, if there is one, goes in `X-Next-Cursor`."""
+    if request.fields:
+        items = jsonable_encoder(page.items)
+    else:
+        items = [schema.model_validate(item).model_dump(mode="json") for item in page.items]
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return JSONResponse(content=items, headers=headers)
+
+
+async def close_db(db: DbSession) -> None:
+    """Hand the request's connection back to the pool before a long-lived response starts streaming."""
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+
+async def verify_admin_secret(
     admin_secret_header: str | None = Header(default=None, alias="X-Admin-Secret"),
     admin_secret_query: str | None = Query(default=None, alias="admin_secret"),
 ):
@@ -38,13 +139,36 @@ def verify_admin_secret(
 
 # Admin endpoints
 @app.post("/api/admin/clubs", response_model=schemas.ClubRead, dependencies=[Depends(verify_admin_secret)])
-def create_club(club_in: schemas.ClubCreate, db: Session = Depends(get_db)):
-    return crud.create_club(db, club_in)
+@query_budget(3)
+async def create_club(club_in: schemas.ClubCreate, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.create_club, club_in)
+    return schemas.ClubRead.model_validate(club)
 
 
 @app.get("/api/admin/clubs", response_model=list[schemas.ClubRead], dependencies=[Depends(verify_admin_secret)])
-def list_clubs(db: Session = Depends(get_db)):
-    return crud.list_clubs(db)
+@query_budget(1)
+async def list_clubs(
+    page: PageRequest = Depends(page_request(schemas.ClubRead)), db: DbSession = Depends(get_read_db)
+):
+    return page_response(await run_db(db, crud.page_clubs, page), page, schemas.ClubRead)
+
+
+@app.get(
+    "/api/admin/dashboard",
+    response_model=schemas.AdminDashboardResponse,
+    dependencies=[Depends(verify_admin_secret)],
+)
+@query_budget(6)
+async def admin_dashboard(
+    sort: Literal["created_at", "name", "voters", "votes", "completion"] = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=200),
+    db: DbSession = Depends(get_read_db),
+):
+    return await run_db(
+        db, crud.get_admin_dashboard, sort=sort, descending=order == "desc", page=page, page_size=page_size
+    )
 
 
 @app.get(
@@ -52,18 +176,10 @@ def list_clubs(db: Session = Depends(get_db)):
     response_model=schemas.ClubConfigResponse,
     dependencies=[Depends(verify_admin_secret)],
 )
-def get_club_detail(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    books = crud.list_books(db, club)
-    categories = crud.list_categories(db, club)
-    nominees = crud.list_best_member_nominees(db, club)
-    return schemas.ClubConfigResponse(
-        club=schemas.ClubRead.model_validate(club),
-        books=[schemas.BookRead.model_validate(book) for book in books],
-        categories=[schemas.CategoryRead.model_validate(cat) for cat in categories],
-        best_member_nominees=[nom.name for nom in nominees],
-        best_member_nominees_detail=[schemas.BestMemberNominee.model_validate(n) for n in nominees],
-    )
+@query_budget(4)
+async def get_club_detail(club_slug: str, db: DbSession = Depends(get_read_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return await run_db(db, crud.get_club_detail, club)
 
 
 @app.post(
@@ -71,9 +187,10 @@ def get_club_detail(club_slug: str, db: Session = Depends(get_db)):
     response_model=schemas.BookRead,
     dependencies=[Depends(verify_admin_secret)],
 )
-def create_book(club_slug: str, book_in: schemas.BookCreate, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    book = crud.create_book(db, club, book_in)
+@query_budget(4)
+async def create_book(club_slug: str, book_in: schemas.BookCreate, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    book = await run_db(db, crud.create_book, club, book_in)
     return schemas.BookRead.model_validate(book)
 
 
@@ -82,20 +199,26 @@ def create_book(club_slug: str, book_in: schemas.BookCreate, db: Session = Depen
     response_model=schemas.BookRead,
     dependencies=[Depends(verify_admin_secret)],
 )
-def update_book(club_slug: str, book_id: int, book_in: schemas.BookUpdate, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    book = crud.update_book(db, club, book_id, book_in)
+@query_budget(11)
+async def update_book(club_slug: str, book_id: int, book_in: schemas.BookUpdate, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    book = await run_db(db, crud.update_book, club, book_id, book_in)
     return schemas.BookRead.model_validate(book)
 
 
 @app.delete(
     "/api/admin/clubs/{club_slug}/books/{book_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=schemas.PurgeJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[Depends(verify_admin_secret)],
 )
-def delete_book(club_slug: str, book_id: int, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    crud.delete_book(db, club, book_id)
+@query_budget(12)
+async def delete_book(club_slug: str, book_id: int, db: DbSession = Depends(get_db)):
+    """Hide the book now; its votes are purged in the background (progress at `/purge-jobs/{id}`)."""
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    job = schemas.PurgeJobRead.model_validate(await run_db(db, crud.delete_book, club, book_id))
+    purger.submit(job)
+    return job
 
 
 @app.get(
@@ -103,10 +226,25 @@ def delete_book(club_slug: str, book_id: int, db: Session = Depends(get_db)):
     response_model=list[schemas.BookRead],
     dependencies=[Depends(verify_admin_secret)],
 )
-def list_books(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    books = crud.list_books(db, club)
-    return [schemas.BookRead.model_validate(book) for book in books]
+@query_budget(2)
+async def list_books(
+    club_slug: str, page: PageRequest = Depends(page_request(schemas.BookRead)), db: DbSession = Depends(get_read_db)
+):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return page_response(await run_db(db, crud.page_books, club, page), page, schemas.BookRead)
+
+
+@app.get(
+    "/api/admin/clubs/{club_slug}/voters",
+    response_model=list[schemas.VoterRead],
+    dependencies=[Depends(verify_admin_secret)],
+)
+@query_budget(2)
+async def list_voters(
+    club_slug: str, page: PageRequest = Depends(page_request(schemas.VoterRead)), db: DbSession = Depends(get_read_db)
+):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return page_response(await run_db(db, crud.page_voters, club, page), page, schemas.VoterRead)
 
 
 @app.post(
@@ -114,9 +252,10 @@ def list_books(club_slug: str, db: Session = Depends(get_db)):
     response_model=schemas.CategoryRead,
     dependencies=[Depends(verify_admin_secret)],
 )
-def create_category(club_slug: str, category_in: schemas.CategoryCreate, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    category = crud.create_category(db, club, category_in)
+@query_budget(10)
+async def create_category(club_slug: str, category_in: schemas.CategoryCreate, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    category = await run_db(db, crud.create_category, club, category_in)
     return schemas.CategoryRead.model_validate(category)
 
 
@@ -125,22 +264,52 @@ def create_category(club_slug: str, category_in: schemas.CategoryCreate, db: Ses
     response_model=schemas.CategoryRead,
     dependencies=[Depends(verify_admin_secret)],
 )
-def update_category(
-    club_slug: str, category_id: int, category_in: schemas.CategoryUpdate, db: Session = Depends(get_db)
+@query_budget(12)
+async def update_category(
+    club_slug: str, category_id: int, category_in: schemas.CategoryUpdate, db: DbSession = Depends(get_db)
 ):
-    club = crud.get_club_by_slug(db, club_slug)
-    category = crud.update_category(db, club, category_id, category_in)
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    category = await run_db(db, crud.update_category, club, category_id, category_in)
     return schemas.CategoryRead.model_validate(category)
 
 
 @app.delete(
     "/api/admin/clubs/{club_slug}/categories/{category_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=schemas.PurgeJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[Depends(verify_admin_secret)],
 )
-def delete_category(club_slug: str, category_id: int, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    crud.delete_category(db, club, category_id)
+@query_budget(13)
+async def delete_category(club_slug: str, category_id: int, db: DbSession = Depends(get_db)):
+    """Hide the category now; its votes are purged in the background (progress at `/purge-jobs/{id}`)."""
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    job = schemas.PurgeJobRead.model_validate(await run_db(db, crud.delete_category, club, category_id))
+    purger.submit(job)
+    return job
+
+
+@app.get(
+    "/api/admin/clubs/{club_slug}/purge-jobs",
+    response_model=list[schemas.PurgeJobRead],
+    dependencies=[Depends(verify_admin_secret)],
+)
+@query_budget(2)
+async def list_purge_jobs(
+    club_slug: str, page: PageRequest = Depends(page_request(schemas.PurgeJobRead)), db: DbSession = Depends(get_read_db)
+):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return page_response(await run_db(db, crud.page_purge_jobs, club, page), page, schemas.PurgeJobRead)
+
+
+@app.get(
+    "/api/admin/clubs/{club_slug}/purge-jobs/{job_id}",
+    response_model=schemas.PurgeJobRead,
+    dependencies=[Depends(verify_admin_secret)],
+)
+@query_budget(2)
+async def get_purge_job(club_slug: str, job_id: int, db: DbSession = Depends(get_read_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return schemas.PurgeJobRead.model_validate(await run_db(db, crud.get_purge_job, club, job_id))
 
 
 @app.get(
@@ -148,10 +317,15 @@ def delete_category(club_slug: str, category_id: int, db: Session = Depends(get_
     response_model=list[schemas.BestMemberNominee],
     dependencies=[Depends(verify_admin_secret)],
 )
-def list_best_member_nominees(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    nominees = crud.list_best_member_nominees(db, club)
-    return [schemas.BestMemberNominee.model_validate(n) for n in nominees]
+@query_budget(2)
+async def list_best_member_nominees(
+    club_slug: str,
+    page: PageRequest = Depends(page_request(schemas.BestMemberNominee)),
+    db: DbSession = Depends(get_read_db),
+):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    nominees = await run_db(db, crud.page_best_member_nominees, club, page)
+    return page_response(nominees, page, schemas.BestMemberNominee)
 
 
 @app.post(
@@ -159,9 +333,10 @@ def list_best_member_nominees(club_slug: str, db: Session = Depends(get_db)):
     response_model=schemas.BestMemberNominee,
     dependencies=[Depends(verify_admin_secret)],
 )
-def create_best_member_nominee(club_slug: str, payload: schemas.BestMemberNomineeCreate, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    nominee = crud.create_best_member_nominee(db, club, payload.name)
+@query_budget(4)
+async def create_best_member_nominee(club_slug: str, payload: schemas.BestMemberNomineeCreate, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    nominee = await run_db(db, crud.create_best_member_nominee, club, payload.name)
     return schemas.BestMemberNominee.model_validate(nominee)
 
 
@@ -170,9 +345,10 @@ def create_best_member_nominee(club_slug: str, payload: schemas.BestMemberNomine
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(verify_admin_secret)],
 )
-def delete_best_member_nominee(club_slug: str, nominee_id: int, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    crud.delete_best_member_nominee(db, club, nominee_id)
+@query_budget(4)
+async def delete_best_member_nominee(club_slug: str, nominee_id: int, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    await run_db(db, crud.delete_best_member_nominee, club, nominee_id)
 
 
 @app.get(
@@ -180,10 +356,12 @@ def delete_best_member_nominee(club_slug: str, nominee_id: int, db: Session = De
     response_model=list[schemas.CategoryRead],
     dependencies=[Depends(verify_admin_secret)],
 )
-def list_categories(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    categories = crud.list_categories(db, club)
-    return [schemas.CategoryRead.model_validate(cat) for cat in categories]
+@query_budget(2)
+async def list_categories(
+    club_slug: str, page: PageRequest = Depends(page_request(schemas.CategoryRead)), db: DbSession = Depends(get_read_db)
+):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return page_response(await run_db(db, crud.page_categories, club, page), page, schemas.CategoryRead)
 
 
 @app.post(
@@ -191,9 +369,10 @@ def list_categories(club_slug: str, db: Session = Depends(get_db)):
     response_model=schemas.ClubRead,
     dependencies=[Depends(verify_admin_secret)],
 )
-def open_voting(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    updated = crud.set_voting_state(db, club, open_state=True)
+@query_budget(5)
+async def open_voting(club_slug: str, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    updated = await run_db(db, crud.set_voting_state, club, open_state=True)
     return schemas.ClubRead.model_validate(updated)
 
 
@@ -202,9 +381,10 @@ def open_voting(club_slug: str, db: Session = Depends(get_db)):
     response_model=schemas.ClubRead,
     dependencies=[Depends(verify_admin_secret)],
 )
-def close_voting(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    updated = crud.set_voting_state(db, club, open_state=False)
+@query_budget(10)
+async def close_voting(club_slug: str, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    updated = await run_db(db, crud.set_voting_state, club, open_state=False)
     return schemas.ClubRead.model_validate(updated)
 
 
@@ -213,54 +393,206 @@ def close_voting(club_slug: str, db: Session = Depends(get_db)):
     response_model=schemas.ResultsResponse,
     dependencies=[Depends(verify_admin_secret)],
 )
-def admin_results(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    return crud.get_results(db, club)
+@query_budget(3)
+async def admin_results(club_slug: str, db: DbSession = Depends(get_read_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return await run_db(db, crud.get_results, club)
+
+
+@app.get("/api/admin/clubs/{club_slug}/results/stream", dependencies=[Depends(verify_admin_secret)])
+@query_budget(1)
+async def admin_results_stream(club_slug: str, db: DbSession = Depends(get_db)):
+    """Live tally as server-sent events: a `snapshot` on connect, then per-category `delta` events."""
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    await close_db(db)
+    return _results_stream(club, public=False)
+
+
+@app.get(
+    "/api/admin/clubs/{club_slug}/vote-counts/verify",
+    response_model=schemas.VoteCountCheckResponse,
+    dependencies=[Depends(verify_admin_secret)],
+)
+@query_budget(3)
+async def verify_vote_counts(club_slug: str, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return await run_db(db, crud.check_vote_counts, club)
+
+
+@app.post(
+    "/api/admin/clubs/{club_slug}/vote-counts/rebuild",
+    response_model=schemas.VoteCountCheckResponse,
+    dependencies=[Depends(verify_admin_secret)],
+)
+@query_budget(12)
+async def rebuild_vote_counts(club_slug: str, db: DbSession = Depends(get_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    return await run_db(db, crud.check_vote_counts, club, repair=True)
+
+
+@app.post(
+    "/api/admin/clubs/{club_slug}/ballots/import",
+    response_model=schemas.BallotImportReport,
+    dependencies=[Depends(verify_admin_secret)],
+)
+async def import_ballots(
+    club_slug: str,
+    request: Request,
+    body_format: Literal["jsonl", "csv"] | None = Query(default=None, alias="format"),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Bulk-load ballots from a streamed JSONL or CSV body (`voter_name`, `category_id`, `book_id` per row).
+    Rows are validated and written in chunks; invalid rows are reported without aborting the import.
+    """
+    body_format = body_format or ("csv" if "csv" in request.headers.get("content-type", "") else "jsonl")
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    importer = await run_db(db, ballot_import.BallotImport, club)
+    parse = ballot_import.CsvParser() if body_format == "csv" else ballot_import.parse_jsonl
+
+    pending: list[ballot_import.BallotRow] = []
+    async for line_no, text in ballot_import.iter_lines(request.stream()):
+        if not text.strip():
+            continue
+        try:
+            pending.extend(parse(line_no, text))
+        except ballot_import.RowError as exc:
+            importer.reject(line_no, str(exc))
+            continue
+        if len(pending) >= ballot_import.CHUNK_ROWS:
+            await run_db(db, importer.write, pending)
+            pending = []
+    await run_db(db, importer.write, pending)
+    return importer.report()
+
+
+@app.get("/api/admin/clubs/{club_slug}/ballots/export", dependencies=[Depends(verify_admin_secret)])
+@query_budget(1)
+async def export_ballots(
+    club_slug: str,
+    body_format: Literal["csv", "jsonl"] = Query(default="csv", alias="format"),
+    compress: bool = Query(default=False, alias="gzip"),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Every ballot row (voter, category, book, timestamp) as a streamed CSV or JSONL download, gzipped with
+    `?gzip=true`. The CSV and flat JSONL rows can be fed back into the import endpoint.
+    """
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    await close_db(db)
+    return ballot_export.export_response(club, body_format, compress=compress)
+
+
+@app.get(
+    "/api/admin/cache/stats", response_model=schemas.CacheStatsResponse, dependencies=[Depends(verify_admin_secret)]
+)
+@query_budget(0)
+async def cache_stats():
+    return schemas.CacheStatsResponse(
+        results=results_cache.stats(),
+        config=config_cache.stats(),
+        clubs=club_cache.stats(),
+        tallies=tally_store.stats(),
+        idempotency=idempotency_cache.stats(),
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of this worker's request, SQL and pool metrics."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(content=metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 # Public endpoints
-@app.get("/api/clubs/{club_slug}/config", response_model=schemas.ClubConfigResponse)
-def public_config(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    books = crud.list_books(db, club)
-    categories = crud.list_categories(db, club, include_inactive=False)
-    nominees = crud.list_best_member_nominees(db, club)
-    return schemas.ClubConfigResponse(
-        club=schemas.ClubRead.model_validate(club),
-        books=[schemas.BookRead.model_validate(book) for book in books],
-        categories=[schemas.CategoryRead.model_validate(cat) for cat in categories],
-        best_member_nominees=[nom.name for nom in nominees],
-        best_member_nominees_detail=[],
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _results_stream(club: ClubSnapshot, *, public: bool) -> StreamingResponse:
+    async def messages():
+        async with results_feeds.subscribe(club, public=public) as subscriber:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.get(), settings.stream_keepalive)
+                except asyncio.TimeoutError:
+                    yield events.KEEPALIVE
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@app.get("/api/clubs/{club_slug}/config", response_model=schemas.ClubConfigResponse)
+@query_budget(4)
+async def public_config(
+    club_slug: str,
+    if_none_match: str | None = Header(default=None),
+    db: DbSession = Depends(get_read_db),
+):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    etag = f'"{club.id}-{club.config_version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = await run_db(db, crud.get_public_config, club)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.post("/api/clubs/{club_slug}/vote", response_model=schemas.VoteSubmissionResponse)
-def submit_vote(club_slug: str, payload: schemas.VoteSubmission, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    voter, votes = crud.submit_votes(db, club, payload)
-    return schemas.VoteSubmissionResponse(
+@query_budget(9)
+async def submit_vote(
+    club_slug: str,
+    payload: schemas.VoteSubmission,
+    idempotency_key: str | None = Header(default=None, alias=idempotency.HEADER),
+    db: DbSession = Depends(get_db),
+):
+    replayed = idempotency.replay("vote", club_slug, idempotency_key, payload)
+    if replayed is not None:
+        return replayed
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    if settings.vote_writer:
+        voter, votes = await asyncio.wrap_future(vote_writer.submit(club, payload))
+    else:
+        voter, votes = await run_db(db, crud.submit_votes, club, payload)
+    response = schemas.VoteSubmissionResponse(
         voter=schemas.VoterRead.model_validate(voter),
         updated_votes=[schemas.VoteRead.model_validate(vote) for vote in votes],
     )
+    return idempotency.remember("vote", club_slug, idempotency_key, payload, response)
 
 
 @app.get("/api/clubs/{club_slug}/results/summary", response_model=schemas.ResultsResponse)
-def public_results(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
+@query_budget(4)
+async def public_results(club_slug: str, db: DbSession = Depends(get_read_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
     if club.voting_open:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Voting still open")
-    return crud.get_results(db, club)
+    frozen = await run_db(db, crud.get_frozen_results, club)
+    if frozen is not None:
+        return Response(content=frozen.results, media_type="application/json")
+    return await run_db(db, crud.get_results, club)
 
 
 @app.get("/api/clubs/{club_slug}/results/reveal", response_model=schemas.RevealResultsResponse)
-def reveal_results(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
+@query_budget(4)
+async def reveal_results(club_slug: str, db: DbSession = Depends(get_read_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
     if club.voting_open:
         return JSONResponse(
             status_code=status.HTTP_403_FORBIDDEN,
             content={"status": "voting_open", "message": "Voting is still in progress."},
         )
-    results = crud.get_results(db, club)
+    frozen = await run_db(db, crud.get_frozen_results, club)
+    if frozen is not None:
+        return Response(content=frozen.reveal, media_type="application/json")
+    results = await run_db(db, crud.get_results, club)
     payload = schemas.RevealResultsResponse(
         status="ok",
         club=results.club,
@@ -269,15 +601,41 @@ def reveal_results(club_slug: str, db: Session = Depends(get_db)):
     return payload
 
 
+@app.get("/api/clubs/{club_slug}/results/stream")
+@query_budget(1)
+async def results_stream(club_slug: str, db: DbSession = Depends(get_db)):
+    """
+    Public live results stream. While voting is open it only reports the voting state; once voting
+    closes it carries the same results as the reveal endpoint.
+    """
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    await close_db(db)
+    return _results_stream(club, public=True)
+
+
 # Best member voting (separate from book/category awards)
 @app.post("/api/clubs/{club_slug}/best-member/vote", response_model=schemas.BestMemberResult)
-def submit_best_member_vote(club_slug: str, payload: schemas.BestMemberVoteSubmission, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    vote = crud.submit_best_member_vote(db, club, payload)
-    return schemas.BestMemberResult(nominee_name=vote.nominee_name, votes_count=1, is_winner=False)
+@query_budget(15)
+async def submit_best_member_vote(
+    club_slug: str,
+    payload: schemas.BestMemberVoteSubmission,
+    idempotency_key: str | None = Header(default=None, alias=idempotency.HEADER),
+    db: DbSession = Depends(get_db),
+):
+    replayed = idempotency.replay("best_member_vote", club_slug, idempotency_key, payload)
+    if replayed is not None:
+        return replayed
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    vote = await run_db(db, crud.submit_best_member_vote, club, payload)
+    response = schemas.BestMemberResult(nominee_name=vote.nominee_name, votes_count=1, is_winner=False)
+    return idempotency.remember("best_member_vote", club_slug, idempotency_key, payload, response)
 
 
 @app.get("/api/clubs/{club_slug}/best-member/results", response_model=schemas.BestMemberResultsResponse)
-def best_member_results(club_slug: str, db: Session = Depends(get_db)):
-    club = crud.get_club_by_slug(db, club_slug)
-    return crud.get_best_member_results(db, club)
+@query_budget(3)
+async def best_member_results(club_slug: str, db: DbSession = Depends(get_read_db)):
+    club = await run_db(db, crud.get_club_by_slug, club_slug)
+    frozen = await run_db(db, crud.get_frozen_results, club)
+    if frozen is not None:
+        return Response(content=frozen.best_member, media_type="application/json")
+    return await run_db(db, crud.get_best_member_results, club)
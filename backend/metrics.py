@@ -0,0 +1,286 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Gauge set directly, or read from `callback` (returning {label values: value}) at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def render(self) -> List[str]:
+        if self.callback is not None:
+            with self._lock:
+                self._values = dict(self.callback())
+        return super().render()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), *, buckets: Sequence[float]):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = self.header()
+        names = self.labels + ("le",)
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(
+    Counter("http_requests_total", "HTTP requests by route template, method and status.", ("route", "method", "status"))
+)
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from request start until the response body is sent (whole stream for event streams).",
+        ("route", "method"),
+        buckets=LATENCY_BUCKETS,
+    )
+)
+IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "Requests currently being served.", ("route", "method")))
+REQUEST_STATEMENTS = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "SQL statements executed while serving one request.",
+        ("route", "method"),
+        buckets=STATEMENT_BUCKETS,
+    )
+)
+REQUEST_SQL_TIME = registry.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Time spent executing SQL while serving one request.",
+        ("route", "method"),
+        buckets=LATENCY_BUCKETS,
+    )
+)
+STATEMENTS = registry.register(
+    Counter("db_statements_total", "SQL statements executed, including work outside requests.", ("engine",))
+)
+STATEMENT_TIME = registry.register(
+    Counter("db_statement_seconds_total", "Time spent executing SQL statements.", ("engine",))
+)
+POOL_WAIT = registry.register(
+    Histogram(
+        "db_pool_checkout_seconds",
+        "Time to obtain a connection from the engine pool (waiting for a free one or opening a new one).",
+        ("engine",),
+        buckets=POOL_WAIT_BUCKETS,
+    )
+)
+
+_pools: Dict[str, object] = {}
+
+
+def _pool_checked_out() -> Dict[LabelValues, float]:
+    return {(name,): pool.checkedout() for name, pool in _pools.items() if hasattr(pool, "checkedout")}
+
+
+POOL_CHECKED_OUT = registry.register(
+    Gauge("db_pool_checked_out", "Connections currently checked out of the pool.", ("engine",), _pool_checked_out)
+)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# Set by the middleware for the duration of a request. Threadpool calls and AsyncSession greenlets run in a
+# copy of the request's context, so statements they execute are attributed to the request that caused them.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Count and time the engine's statements and pool checkouts (pass `AsyncEngine.sync_engine` for async)."""
+    if _pools.get(name) is engine.pool:  # already instrumented (the app started again in this process)
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+        STATEMENTS.inc((name,))
+        STATEMENT_TIME.inc((name,), elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("statement_started"):
+            connection.info["statement_started"].pop()
+
+    # The pool has no "checkout started" event, so time the call the engine makes to get a connection.
+    pool = engine.pool
+    checkout = pool.connect
+
+    def timed_checkout():
+        started = time.perf_counter()
+        try:
+            return checkout()
+        finally:
+            POOL_WAIT.observe((name,), time.perf_counter() - started)
+
+    pool.connect = timed_checkout
+    _pools[name] = pool
+
+
+def _route_template(scope: Scope) -> str:
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return getattr(route, "path", "<unmatched>")
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route-template request metrics (labels never include raw paths)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = (_route_template(scope), scope["method"])
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        IN_FLIGHT.inc(labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.observe(labels, time.perf_counter() - started)
+            IN_FLIGHT.dec(labels)
+            REQUESTS.inc(labels + (str(status_code),))
+            REQUEST_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_SQL_TIME.observe(labels, stats.seconds)
+            _request_stats.reset(token)
@@ -0,0 +1,285 @@
+import argparse
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+try:  # pragma: no cover
+    from . import models
+    from .database import Base, get_engine
+except ImportError:  # pragma: no cover
+    import models  # type: ignore
+    from database import Base, get_engine  # type: ignore
+
+Migration = Tuple[int, str, Callable[[Connection], None]]
+
+# Any constant works; it only has to be the same for every process migrating the same Postgres database.
+POSTGRES_LOCK_KEY = 720_514_001
+
+
+def _legacy_sqlite_columns(conn: Connection) -> None:
+    """
+    In-place upgrades for SQLite files created before these migrations existed (e.g. missing
+    votes.book_id / votes.created_at / legacy entity columns).
+    """
+    try:
+        vote_columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(votes);")}
+    except OperationalError:
+        return
+
+    if not vote_columns:
+        return
+
+    if "book_id" not in vote_columns:
+        conn.exec_driver_sql("ALTER TABLE votes ADD COLUMN book_id INTEGER;")
+        if "entity_id" in vote_columns:
+            conn.exec_driver_sql("UPDATE votes SET book_id = entity_id;")
+
+    if "created_at" not in vote_columns:
+        conn.exec_driver_sql("ALTER TABLE votes ADD COLUMN created_at DATETIME DEFAULT CURRENT_TIMESTAMP;")
+
+    # Legacy schema had entity_type/entity_id columns with NOT NULL constraint; rebuild if present.
+    if "entity_type" in vote_columns or "entity_id" in vote_columns:
+        conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS votes_mig (
+                id INTEGER PRIMARY KEY,
+                voter_id INTEGER NOT NULL,
+                club_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                book_id INTEGER NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+                FOREIGN KEY(voter_id) REFERENCES voters(id) ON DELETE CASCADE,
+                FOREIGN KEY(club_id) REFERENCES clubs(id) ON DELETE CASCADE,
+                FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE,
+                FOREIGN KEY(book_id) REFERENCES books(id) ON DELETE CASCADE
+            );
+            """
+        )
+        conn.exec_driver_sql(
+            """
+            INSERT INTO votes_mig (id, voter_id, club_id, category_id, book_id, created_at)
+            SELECT id,
+                   voter_id,
+                   club_id,
+                   category_id,
+                   COALESCE(book_id, entity_id) as book_id,
+                   COALESCE(created_at, CURRENT_TIMESTAMP)
+            FROM votes;
+            """
+        )
+        conn.exec_driver_sql("DROP TABLE votes;")
+        conn.exec_driver_sql("ALTER TABLE votes_mig RENAME TO votes;")
+
+    index_names = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(votes);")}
+    if "uix_vote_voter_category" not in index_names:
+        conn.exec_driver_sql("CREATE UNIQUE INDEX IF NOT EXISTS uix_vote_voter_category ON votes (voter_id, category_id)")
+
+
+def _club_version_columns(conn: Connection) -> None:
+    """Add clubs.results_version / clubs.config_version to a clubs table created before they existed."""
+    if not inspect(conn).has_table("clubs"):
+        return
+    columns = {column["name"] for column in inspect(conn).get_columns("clubs")}
+    for column in ("results_version", "config_version"):
+        if column not in columns:
+            conn.exec_driver_sql(f"ALTER TABLE clubs ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+
+def _initial_schema(conn: Connection) -> None:
+    """Bring a database that predates versioning up to the first tracked schema, creating missing tables."""
+    if conn.dialect.name == "sqlite":
+        _legacy_sqlite_columns(conn)
+    _club_version_columns(conn)
+    Base.metadata.create_all(conn)
+
+
+def _backfill_vote_counts(conn: Connection) -> None:
+    """Seed `vote_counts` from `votes` for databases that had votes before the counters existed."""
+    if conn.exec_driver_sql("SELECT 1 FROM vote_counts LIMIT 1").first() is not None:
+        return
+    conn.exec_driver_sql(
+        """
+        INSERT INTO vote_counts (club_id, category_id, book_id, votes_count)
+        SELECT club_id, category_id, book_id, COUNT(id)
+        FROM votes
+        GROUP BY club_id, category_id, book_id;
+        """
+    )
+
+
+def _covering_tally_indexes(conn: Connection) -> None:
+    """
+    Replace the single-column club/voter indexes on the vote tables with composite ones that cover the
+    recount, existing-ballot and best-member tally queries (each single-column index is a prefix of its
+    replacement, so nothing that used it loses out).
+    """
+    for name in ("ix_votes_club_id", "ix_votes_voter_id", "ix_best_member_votes_club_id"):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_votes_club_category_book ON votes (club_id, category_id, book_id)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_votes_voter_category_book ON votes (voter_id, category_id, book_id)")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_best_member_votes_club_nominee ON best_member_votes (club_id, nominee_name)"
+    )
+
+
+def _results_snapshots(conn: Connection) -> None:
+    """Table for the frozen results of closed clubs; clubs closed before it existed are served live."""
+    models.ResultsSnapshot.__table__.create(conn, checkfirst=True)
+
+
+def _best_member_nominee_ids(conn: Connection) -> None:
+    """
+    Point best-member votes at their nominee row: add `nominee_id`, fill it in from the names (votes for
+    names that are not a configured nominee stay free text) and index the tally on it.
+    """
+    columns = {column["name"] for column in inspect(conn).get_columns("best_member_votes")}
+    if "nominee_id" not in columns:
+        conn.exec_driver_sql(
+            "ALTER TABLE best_member_votes ADD COLUMN nominee_id INTEGER "
+            "REFERENCES best_member_nominees (id) ON DELETE SET NULL"
+        )
+    conn.exec_driver_sql(
+        """
+        UPDATE best_member_votes
+        SET nominee_id = (
+            SELECT best_member_nominees.id
+            FROM best_member_nominees
+            WHERE best_member_nominees.club_id = best_member_votes.club_id
+              AND best_member_nominees.name = best_member_votes.nominee_name
+        )
+        WHERE nominee_id IS NULL
+        """
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_best_member_votes_club_nominee")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_best_member_votes_club_nominee_id "
+        "ON best_member_votes (club_id, nominee_id, nominee_name)"
+    )
+
+
+def _keyset_pagination_indexes(conn: Connection) -> None:
+    """Indexes matching the keyset order of the paginated admin lists, so each page is one index range."""
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_clubs_created_at_id ON clubs (created_at, id)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_books_club_created_at_id ON books (club_id, created_at, id)")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_categories_club_sort_order_id ON categories (club_id, sort_order, id)"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_voters_club_created_at_id ON voters (club_id, created_at, id)")
+
+
+def _background_purges(conn: Connection) -> None:
+    """Soft-delete columns for books and categories, and the jobs that purge their votes afterwards."""
+    for table in ("books", "categories"):
+        if "deleted_at" not in {column["name"] for column in inspect(conn).get_columns(table)}:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN deleted_at TIMESTAMP")
+    models.PurgeJob.__table__.create(conn, checkfirst=True)
+
+
+def _ranked_categories(conn: Connection) -> None:
+    """Ranked-choice flag on categories and the table holding the rankings of their ballots."""
+    if "ranked" not in {column["name"] for column in inspect(conn).get_columns("categories")}:
+        conn.exec_driver_sql("ALTER TABLE categories ADD COLUMN ranked BOOLEAN NOT NULL DEFAULT FALSE")
+    models.RankedBallot.__table__.create(conn, checkfirst=True)
+
+
+# Ordered and append-only. Migrations that change existing tables spell out their DDL instead of reading the
+# current models, which may have moved on since. A fresh database gets `create_all` and is stamped with the latest version, so a
+# migration body only ever runs against a database created under an earlier version; it must still tolerate
+# tables that `_initial_schema` created from the current models (use checkfirst / IF [NOT] EXISTS).
+MIGRATIONS: List[Migration] = [
+    (1, "initial_schema", _initial_schema),
+    (2, "backfill_vote_counts", _backfill_vote_counts),
+    (3, "covering_tally_indexes", _covering_tally_indexes),
+    (4, "results_snapshots", _results_snapshots),
+    (5, "best_member_nominee_ids", _best_member_nominee_ids),
+    (6, "keyset_pagination_indexes", _keyset_pagination_indexes),
+    (7, "background_purges", _background_purges),
+    (8, "ranked_categories", _ranked_categories),
+    # Version 1 used to add these on SQLite only; repairs Postgres databases upgraded before that was fixed.
+    (9, "club_version_columns", _club_version_columns),
+]
+HEAD = MIGRATIONS[-1][0]
+
+
+def _lock(conn: Connection) -> None:
+    """Serialize concurrent upgrades (several workers starting at once) for the rest of the transaction."""
+    if conn.dialect.name == "sqlite":
+        # pysqlite runs DDL outside a transaction unless one was opened explicitly.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conn.dialect.name == "postgresql":
+        conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({POSTGRES_LOCK_KEY})")
+
+
+def current_version(conn: Connection) -> int:
+    """Schema version of the database: 0 when it predates versioning or is empty."""
+    if not inspect(conn).has_table(models.SchemaMigration.__tablename__):
+        return 0
+    return conn.scalar(select(models.SchemaMigration.version).order_by(models.SchemaMigration.version.desc())) or 0
+
+
+def _stamp(conn: Connection, migrations: List[Migration]) -> None:
+    if migrations:
+        conn.execute(
+            models.SchemaMigration.__table__.insert(),
+            [{"version": version, "name": name} for version, name, _ in migrations],
+        )
+
+
+def upgrade(bind: Engine) -> List[str]:
+    """
+    Apply pending migrations in order, in one transaction, and return the names of those applied.
+    A database without any tables is created from the models and stamped as up to date.
+    """
+    with bind.connect() as conn:
+        _lock(conn)
+        version = current_version(conn)
+        if version >= HEAD:
+            conn.commit()
+            return []
+
+        if version == 0 and not inspect(conn).get_table_names():
+            Base.metadata.create_all(conn)
+            _stamp(conn, MIGRATIONS)
+            conn.commit()
+            return ["create_all"]
+
+        models.SchemaMigration.__table__.create(conn, checkfirst=True)
+        pending = [migration for migration in MIGRATIONS if migration[0] > version]
+        for _, _, apply in pending:
+            apply(conn)
+        _stamp(conn, pending)
+        conn.commit()
+        return [name for _, name, _ in pending]
+
+
+def ensure_schema(bind: Engine, *, migrate: bool) -> List[str]:
+    """
+    Startup check: a single version lookup when the schema is current. Otherwise apply the pending migrations
+    (`migrate`) or refuse to start, so a worker never serves a schema it was not written for.
+    """
+    with bind.connect() as conn:
+        version = current_version(conn)
+    if version >= HEAD:
+        return []
+    if not migrate:
+        raise RuntimeError(f"Database schema is at version {version}, expected {HEAD}; run `python -m migrations`")
+    return upgrade(bind)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply or inspect the schema migrations of DATABASE_URL.")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "current"], default="upgrade")
+    args = parser.parse_args()
+    engine = get_engine()
+    if args.command == "current":
+        with engine.connect() as conn:
+            print(f"{current_version(conn)} (head {HEAD})")
+        return
+    applied = upgrade(engine)
+    print(f"applied: {', '.join(applied)}" if applied else f"already at version {HEAD}")
+
+
+if __name__ == "__main__":
+    main()
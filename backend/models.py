@@ -1,6 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 try:  # pragma: no cover
@@ -8,6 +19,19 @@ try:  # pragma: no cover
 except ImportError:  # pragma: no cover
     from database import Base
 
+# Composite indexes that let the tally and existing-ballot queries run from the index alone.
+COVERING_INDEXES = {"ix_votes_club_category_book", "ix_votes_voter_category_book", "ix_best_member_votes_club_nominee_id"}
+
+
+class SchemaMigration(Base):
+    """One row per applied migration (see `migrations.MIGRATIONS`)."""
+
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(255), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
 
 class Club(Base):
     __tablename__ = "clubs"
@@ -17,11 +41,18 @@ class Club(Base):
     slug = Column(String(255), nullable=False, unique=True, index=True)
     voting_open = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped by every write that can change this club's results; part of the results cache key.
+    results_version = Column(Integer, default=0, nullable=False)
+    # Bumped by book, category, nominee and voting-state changes; drives the public config ETag.
+    config_version = Column(Integer, default=0, nullable=False)
 
     books = relationship("Book", back_populates="club", cascade="all, delete-orphan")
     categories = relationship("Category", back_populates="club", cascade="all, delete-orphan")
     voters = relationship("Voter", back_populates="club", cascade="all, delete-orphan")
 
+    # The keyset order of the paginated club list; books, categories and voters have one per club.
+    __table_args__ = (Index("ix_clubs_created_at_id", "created_at", "id"),)
+
 
 class Book(Base):
     __tablename__ = "books"
@@ -32,10 +63,14 @@ class Book(Base):
     author = Column(String(255))
     readers_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Set when the book is deleted: it is hidden at once, and removed once a `PurgeJob` has cleared its votes.
+    deleted_at = Column(DateTime)
 
     club = relationship("Club", back_populates="books")
     votes = relationship("Vote", back_populates="book")
 
+    __table_args__ = (Index("ix_books_club_created_at_id", "club_id", "created_at", "id"),)
+
 
 class Category(Base):
     __tablename__ = "categories"
@@ -46,10 +81,16 @@ class Category(Base):
     description = Column(Text)
     sort_order = Column(Integer, default=0, nullable=False)
     active = Column(Boolean, default=True, nullable=False)
+    # Ranked categories take an ordered list of books per ballot and are decided by instant runoff.
+    ranked = Column(Boolean, default=False, nullable=False)
+    # Set when the category is deleted; see `Book.deleted_at`.
+    deleted_at = Column(DateTime)
 
     club = relationship("Club", back_populates="categories")
     votes = relationship("Vote", back_populates="category")
 
+    __table_args__ = (Index("ix_categories_club_sort_order_id", "club_id", "sort_order", "id"),)
+
 
 class Voter(Base):
     __tablename__ = "voters"
@@ -62,15 +103,18 @@ class Voter(Base):
     club = relationship("Club", back_populates="voters")
     votes = relationship("Vote", back_populates="voter")
 
-    __table_args__ = (UniqueConstraint("club_id", "name", name="uix_voter_club_name"),)
+    __table_args__ = (
+        UniqueConstraint("club_id", "name", name="uix_voter_club_name"),
+        Index("ix_voters_club_created_at_id", "club_id", "created_at", "id"),
+    )
 
 
 class Vote(Base):
     __tablename__ = "votes"
 
     id = Column(Integer, primary_key=True, index=True)
-    voter_id = Column(Integer, ForeignKey("voters.id", ondelete="CASCADE"), nullable=False, index=True)
-    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False, index=True)
+    voter_id = Column(Integer, ForeignKey("voters.id", ondelete="CASCADE"), nullable=False)
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
     book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -82,22 +126,87 @@ class Vote(Base):
 
     __table_args__ = (
         UniqueConstraint("voter_id", "category_id", name="uix_vote_voter_category"),
+        Index("ix_votes_club_category_book", "club_id", "category_id", "book_id"),
+        Index("ix_votes_voter_category_book", "voter_id", "category_id", "book_id"),
     )
 
 
+class VoteCount(Base):
+    """Materialized per-book tally, kept in step with `votes` by every write that touches them."""
+
+    __tablename__ = "vote_counts"
+
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    votes_count = Column(Integer, nullable=False, default=0)
+
+
+class RankedBallot(Base):
+    """
+    A voter's full ranking in a ranked category, as packed book ids (`irv.pack_rankings`). The first choice is
+    also stored as the voter's plain `Vote`, so `vote_counts` holds first preferences.
+    """
+
+    __tablename__ = "ranked_ballots"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    voter_id = Column(Integer, ForeignKey("voters.id", ondelete="CASCADE"), primary_key=True)
+    rankings = Column(LargeBinary, nullable=False)
+
+
+class PurgeJob(Base):
+    """Background removal of the votes of a deleted book or category, followed by the row itself."""
+
+    __tablename__ = "purge_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False, index=True)
+    entity = Column(String(20), nullable=False)  # "book" or "category"
+    entity_id = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, done or failed
+    votes_total = Column(Integer, nullable=False, default=0)
+    votes_deleted = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime)
+
+
+class ResultsSnapshot(Base):
+    """
+    Public results of a closed club, serialized when voting closes and rebuilt by any later write that
+    changes them. Only valid while `results_version` matches the club's.
+    """
+
+    __tablename__ = "results_snapshots"
+
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    results_version = Column(Integer, nullable=False)
+    results_json = Column(Text, nullable=False)
+    reveal_json = Column(Text, nullable=False)
+    best_member_json = Column(Text, nullable=False)
+    frozen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class BestMemberVote(Base):
     __tablename__ = "best_member_votes"
 
     id = Column(Integer, primary_key=True, index=True)
     voter_id = Column(Integer, ForeignKey("voters.id", ondelete="CASCADE"), nullable=False, index=True)
-    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False, index=True)
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False)
+    # Set for votes for a configured nominee; NULL for free-text votes (clubs without nominees) and for votes
+    # whose nominee was deleted. `nominee_name` is always filled in, so such votes keep counting by name.
+    nominee_id = Column(Integer, ForeignKey("best_member_nominees.id", ondelete="SET NULL"))
     nominee_name = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     voter = relationship("Voter")
     club = relationship("Club")
 
-    __table_args__ = (UniqueConstraint("club_id", "voter_id", name="uix_best_member_vote_club_voter"),)
+    __table_args__ = (
+        UniqueConstraint("club_id", "voter_id", name="uix_best_member_vote_club_voter"),
+        Index("ix_best_member_votes_club_nominee_id", "club_id", "nominee_id", "nominee_name"),
+    )
 
 
 class BestMemberNominee(Base):
@@ -0,0 +1,98 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+    # Response fields to select; None returns whole rows.
+    fields: Optional[Tuple[str, ...]] = None
+
+
+@dataclass
+class Page:
+    # ORM objects, or dicts holding just the requested fields.
+    items: List[Any]
+    # Opaque position after the last item; None on the last page.
+    next_cursor: Optional[str]
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, order_by: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """The keyset values stored in `cursor`, typed like the `order_by` columns they were read from."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(order_by, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise _bad_request("Invalid cursor") from None
+
+
+def page_request(schema: Type[BaseModel]) -> Callable[..., PageRequest]:
+    """Query-parameter dependency for a list endpoint whose items are `schema`; `fields` must name its fields."""
+
+    def dependency(
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(default=None),
+        fields: Optional[str] = Query(default=None, description="Comma-separated fields to return"),
+    ) -> PageRequest:
+        selected = None
+        if fields:
+            selected = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+            unknown = [name for name in selected if name not in schema.model_fields]
+            if unknown:
+                raise _bad_request(f"Unknown fields: {', '.join(unknown)}")
+        return PageRequest(limit=limit, cursor=cursor, fields=selected or None)
+
+    return dependency
+
+
+def fetch_page(
+    db: Session, stmt: Select, entity: Any, order_by: Sequence[InstrumentedAttribute], request: PageRequest
+) -> Page:
+    """
+    Run `stmt` (a filtered `select(entity)`) for one page in `order_by` order, resuming strictly after the
+    cursor's row. `order_by` must end with a unique column so each row has a distinct position, and an index
+    starting with the statement's equality filters followed by `order_by` keeps every page an index range scan.
+    With `request.fields` only those columns (plus the keyset ones) are read, and items are plain dicts.
+    """
+    if request.fields:
+        keys = dict.fromkeys([*request.fields, *(column.key for column in order_by)])
+        stmt = stmt.with_only_columns(*(getattr(entity, key) for key in keys))
+    if request.cursor:
+        stmt = stmt.where(tuple_(*order_by) > tuple_(*decode_cursor(request.cursor, order_by)))
+    stmt = stmt.order_by(*order_by).limit(request.limit + 1)
+
+    rows = list(db.execute(stmt).all() if request.fields else db.scalars(stmt))
+    next_cursor = None
+    if len(rows) > request.limit:
+        rows = rows[: request.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in order_by])
+    if request.fields:
+        rows = [{name: getattr(row, name) for name in request.fields} for row in rows]
+    return Page(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,86 @@
+import logging
+import queue
+import threading
+from typing import Optional
+
+try:  # pragma: no cover
+    from . import crud, schemas
+    from .config import get_settings
+    from .database import SessionLocal
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    import schemas  # type: ignore
+    from config import get_settings  # type: ignore
+    from database import SessionLocal  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class Purger:
+    """
+    Background thread that works through the purge jobs of deleted books and categories one at a time.
+    Each batch of `batch_size` votes is its own transaction (`crud.purge_votes`), and the thread sleeps
+    `pause` seconds between batches, so the write lock is only ever held briefly and ballots get in between.
+    Jobs left pending by a stopped or crashed worker are picked up again by `resume` on the next start.
+    """
+
+    def __init__(self, session_factory=SessionLocal, *, batch_size: int, pause: float):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+        self._queue: "queue.Queue[Optional[schemas.PurgeJobRead]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def submit(self, job: schemas.PurgeJobRead) -> None:
+        self._ensure_started()
+        self._queue.put(job)
+
+    def resume(self) -> int:
+        """Queue every pending job (e.g. after a restart) and return how many there were."""
+        with self.session_factory() as db:
+            jobs = crud.pending_purge_jobs(db)
+        for job in jobs:
+            self.submit(job)
+        return len(jobs)
+
+    def stop(self) -> None:
+        """Stop after the current batch; an unfinished job stays pending for `resume`."""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._stopping.set()
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._stopping.clear()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="purger", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None or self._stopping.is_set():
+                return
+            self._purge(job)
+
+    def _purge(self, job: schemas.PurgeJobRead) -> None:
+        try:
+            while not self._stopping.is_set():
+                with self.session_factory() as db:
+                    if crud.purge_votes(db, job, self.batch_size):
+                        return
+                self._stopping.wait(self.pause)
+        except Exception as exc:  # recorded on the job for the admin to see
+            logger.exception("Purge job %s failed", job.id)
+            with self.session_factory() as db:
+                crud.fail_purge_job(db, job.id, str(exc))
+
+
+settings = get_settings()
+purger = Purger(batch_size=settings.purge_batch_size, pause=settings.purge_pause_ms / 1000)
@@ -0,0 +1,111 @@
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:  # pragma: no cover
+    from .config import get_settings
+except ImportError:  # pragma: no cover
+    from config import get_settings  # type: ignore
+
+F = TypeVar("F", bound=Callable)
+
+
+class QueryCounter:
+    """Statements seen while a `count_queries` block was active (including in threadpool calls it made)."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, label: str, budget: int, statements: List[str]):
+        self.label = label
+        self.budget = budget
+        self.statements = statements
+        listing = "\n".join(f"  {n}. {' '.join(statement.split())}" for n, statement in enumerate(statements, 1))
+        super().__init__(f"{label} ran {len(statements)} SQL statements, budget is {budget}:\n{listing}")
+
+
+# Counters of every enclosing `count_queries` block. A tuple, so entering a block never changes what an
+# outer context (or a thread that copied it) sees.
+_active: ContextVar[Tuple[QueryCounter, ...]] = ContextVar("active_query_counters", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active.get():
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the SQL statements executed inside the block, on any engine."""
+    counter = QueryCounter()
+    token = _active.set(_active.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int, label: str = "block") -> Iterator[QueryCounter]:
+    """Like `count_queries`, but raise `QueryBudgetExceeded` listing the statements if the block ran too many."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > budget:
+        raise QueryBudgetExceeded(label, budget, counter.statements)
+
+
+# Most statements each budgeted function has run so far (only recorded with ENFORCE_QUERY_BUDGETS).
+observed: Dict[str, int] = {}
+
+
+@contextmanager
+def _checked(budget: int, label: str) -> Iterator[None]:
+    with count_queries() as counter:
+        yield
+    observed[label] = max(observed.get(label, 0), counter.count)
+    if counter.count > budget:
+        raise QueryBudgetExceeded(label, budget, counter.statements)
+
+
+def query_budget(budget: int, label: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Declare the most SQL statements a crud function or endpoint may run, however large the club is
+    (cold caches included). The budget is stored as `fn.query_budget` for `bench.query_budgets`; with
+    ENFORCE_QUERY_BUDGETS set, calls are also checked and fail with the offending statements.
+    """
+
+    def decorate(fn: F) -> F:
+        fn.query_budget = budget  # type: ignore[attr-defined]
+        if not get_settings().enforce_query_budgets:
+            return fn
+        name = label or f"{fn.__module__}.{fn.__qualname__}"
+
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def checked_async(*args, **kwargs):
+                with _checked(budget, name):
+                    return await fn(*args, **kwargs)
+
+            return checked_async  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def checked(*args, **kwargs):
+            with _checked(budget, name):
+                return fn(*args, **kwargs)
+
+        return checked  # type: ignore[return-value]
+
+    return decorate
@@ -0,0 +1,65 @@
+import time
+from typing import Optional
+
+from fastapi import Header
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover
+    from .config import get_settings
+    from .database import read_session_factory
+except ImportError:  # pragma: no cover
+    from config import get_settings  # type: ignore
+    from database import read_session_factory  # type: ignore
+
+settings = get_settings()
+
+# Read-your-writes: a successful write answers with this header (a Unix timestamp), and a client that sends it
+# back keeps reading from the primary until then, by which time the replica has caught up.
+STICKY_HEADER = "X-Read-Primary-Until"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class StickyPrimaryMiddleware:
+    """ASGI middleware adding `STICKY_HEADER` to every successful write response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers[STICKY_HEADER] = f"{time.time() + settings.replica_sticky_seconds:.3f}"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _sticky(read_primary_until: Optional[str]) -> bool:
+    try:
+        return read_primary_until is not None and float(read_primary_until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(read_primary_until: Optional[str] = Header(default=None, alias=STICKY_HEADER)):
+    """
+    Session for read-only endpoints (config, results and admin lists): on the read replica when one is
+    configured, unless the client wrote recently and sends back the `STICKY_HEADER` it was given.
+    """
+    factory = read_session_factory(primary=_sticky(read_primary_until))
+    if settings.async_db:
+        async with factory() as db:
+            yield db
+        return
+    db = factory()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
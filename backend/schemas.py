@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 # Shared models
@@ -53,6 +53,7 @@ class CategoryBase(BaseModel):
     description: Optional[str] = None
     sort_order: int = 0
     active: bool = True
+    ranked: bool = False
 
 
 class CategoryCreate(CategoryBase):
@@ -72,6 +73,7 @@ class CategoryUpdate(BaseModel):
     description: Optional[str] = None
     sort_order: Optional[int] = None
     active: Optional[bool] = None
+    ranked: Optional[bool] = None
 
 
 class VoterRead(BaseModel):
@@ -86,7 +88,24 @@ class VoterRead(BaseModel):
 
 class VoteEntry(BaseModel):
     category_id: int
-    book_id: int
+    # The chosen book; in a ranked category, the first choice of `rankings` when only that is given.
+    book_id: Optional[int] = None
+    # Books in order of preference, for ranked categories.
+    rankings: Optional[List[int]] = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def _first_choice(self) -> "VoteEntry":
+        if self.rankings is None:
+            if self.book_id is None:
+                raise ValueError("book_id or rankings is required")
+            return self
+        if len(set(self.rankings)) != len(self.rankings):
+            raise ValueError("rankings must not repeat a book")
+        if self.book_id is None:
+            self.book_id = self.rankings[0]
+        elif self.book_id != self.rankings[0]:
+            raise ValueError("book_id must be the first of rankings")
+        return self
 
 
 class VoteSubmission(BaseModel):
@@ -117,6 +136,19 @@ class VoteSubmissionResponse(BaseModel):
     updated_votes: List[VoteRead]
 
 
+class BallotImportError(BaseModel):
+    line: int
+    error: str
+
+
+class BallotImportReport(BaseModel):
+    rows_processed: int
+    rows_rejected: int
+    voters_created: int
+    votes_written: int
+    errors: List[BallotImportError]
+
+
 class BookResult(BaseModel):
     book_id: int
     title: str
@@ -127,10 +159,31 @@ class BookResult(BaseModel):
     is_winner: bool
 
 
+class IrvTally(BaseModel):
+    book_id: int
+    votes: int
+
+
+class IrvRound(BaseModel):
+    round: int
+    # Ballots held by each continuing book, most first.
+    tallies: List[IrvTally]
+    exhausted: int
+    # Book eliminated after this round, and the ballots its elimination moved to each remaining book.
+    eliminated: Optional[int] = None
+    transfers: List[IrvTally] = []
+    exhausted_by_transfer: int = 0
+    winner: Optional[int] = None
+
+
 class CategoryResult(BaseModel):
     category_id: int
     category_name: str
+    # Ranked categories list books in finishing order, with `votes_count` as first preferences and
+    # `weighted_score` as the book's share of the ballots in the last round it took part in.
     results: List[BookResult]
+    ranked: bool = False
+    rounds: Optional[List[IrvRound]] = None
 
 
 class ResultsResponse(BaseModel):
@@ -138,6 +191,75 @@ class ResultsResponse(BaseModel):
     categories: List[CategoryResult]
 
 
+class CategoryLeader(BaseModel):
+    category_id: int
+    category_name: str
+    leader: Optional[BookResult] = None
+
+
+class ClubDashboardEntry(BaseModel):
+    club: ClubRead
+    voters_count: int
+    votes_count: int
+    # Share of possible ballots cast: votes in active categories / (voters x active categories).
+    completion_rate: float
+    leaders: List[CategoryLeader]
+
+
+class AdminDashboardResponse(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    clubs: List[ClubDashboardEntry]
+
+
+class VoteCountDrift(BaseModel):
+    category_id: int
+    book_id: int
+    expected: int
+    stored: int
+
+
+class VoteCountCheckResponse(BaseModel):
+    club: ClubRead
+    consistent: bool
+    repaired: bool
+    drift: List[VoteCountDrift]
+
+
+class PurgeJobRead(BaseModel):
+    id: int
+    club_id: int
+    entity: Literal["book", "category"]
+    entity_id: int
+    status: Literal["pending", "done", "failed"]
+    # Votes counted when the job started; a purge that overlaps another (a book inside a deleted category) can
+    # finish with fewer deleted.
+    votes_total: int
+    votes_deleted: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+
+
+class CacheStatsResponse(BaseModel):
+    results: CacheStats
+    config: CacheStats
+    clubs: CacheStats
+    tallies: CacheStats
+    idempotency: CacheStats
+
+
 class RevealResultsResponse(BaseModel):
     status: Literal["ok"]
     club: ClubRead
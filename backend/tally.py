@@ -0,0 +1,259 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:  # pragma: no cover
+    from . import schemas
+    from .cache import LRUCache
+    from .config import get_settings
+except ImportError:  # pragma: no cover
+    import schemas  # type: ignore
+    from cache import LRUCache  # type: ignore
+    from config import get_settings  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Snapshot file: header, then per club a fixed header, its JSON metadata, padding and the counts as native
+# int32s starting on a 4-byte boundary of the file, so the mapped cells are aligned (the byte-order flag makes
+# a file from another architecture be ignored rather than misread).
+SNAPSHOT_MAGIC = b"BCTALLY2"
+SNAPSHOT_HEADER = struct.Struct("<8sB3xI")  # magic, little-endian flag, padding, club count: 16 bytes
+SNAPSHOT_CLUB = struct.Struct("<qqIII")  # club id, results_version, categories, books, metadata bytes
+
+
+class TallyCategory(NamedTuple):
+    id: int
+    name: str
+    ranked: bool
+
+
+class TallyBook(NamedTuple):
+    id: int
+    title: str
+    author: Optional[str]
+    readers_count: int
+
+
+@dataclass
+class TallyChange:
+    """What one transaction did to a club's tallies, applied to the in-memory matrix once it has committed."""
+
+    deltas: Dict[Tuple[int, int], int] = field(default_factory=lambda: defaultdict(int))
+    books: Dict[int, TallyBook] = field(default_factory=dict)
+    # results_version after each bump, in order.
+    versions: List[int] = field(default_factory=list)
+    # Cleared when the transaction changed results in a way `deltas` and `books` do not describe.
+    incremental: bool = True
+
+
+class TallyMatrix:
+    """
+    Per-book vote counts of one club as a categories x books int32 matrix (one flat row-major array, or a
+    copy-on-write view of the snapshot file) with id -> index maps, plus the category and book fields the
+    results need. Books are in id order. `results_version` is the club version the counts belong to.
+    """
+
+    def __init__(
+        self,
+        club_id: int,
+        results_version: int,
+        categories: Sequence[TallyCategory],
+        books: Sequence[TallyBook],
+        counts: Optional[Union[array, memoryview]] = None,
+    ):
+        self.club_id = club_id
+        self.results_version = results_version
+        self.categories = list(categories)
+        self.books = list(books)
+        self.category_index = {category.id: i for i, category in enumerate(self.categories)}
+        self.book_index = {book.id: j for j, book in enumerate(self.books)}
+        self.counts = array("i", bytes(4 * len(self.categories) * len(self.books))) if counts is None else counts
+
+    def add(self, category_id: int, book_id: int, delta: int) -> bool:
+        i, j = self.category_index.get(category_id), self.book_index.get(book_id)
+        if i is None or j is None:
+            return False
+        self.counts[i * len(self.books) + j] += delta
+        return True
+
+    def apply(self, change: TallyChange) -> bool:
+        """Apply a committed change; False when it names a category or book the matrix does not have."""
+        for (category_id, book_id), delta in change.deltas.items():
+            if delta and not self.add(category_id, book_id, delta):
+                return False
+        for book in change.books.values():
+            j = self.book_index.get(book.id)
+            if j is None:
+                return False
+            self.books[j] = book
+        return True
+
+    def category_results(self) -> List[schemas.CategoryResult]:
+        """
+        Every category's results in one pass over the matrix: weighted score = votes / readers (0 without
+        readers), the winner is the first book (by id) with the best (weighted, votes), and books are ordered
+        by rounded weighted score. Ranked categories get the same plain tally; their runoff replaces it.
+        The pass is a plain Python loop over each row's cells; it is not vectorized (numpy is not a dependency).
+        """
+        width = len(self.books)
+        readers = [max(book.readers_count, 0) for book in self.books]
+        results = []
+        for i, category in enumerate(self.categories):
+            entries: List[schemas.BookResult] = []
+            winner, best = -1, (-1.0, -1)
+            for j, votes in enumerate(self.counts[i * width : (i + 1) * width]):
+                if votes <= 0:
+                    continue
+                weighted = votes / readers[j] if readers[j] > 0 else 0.0
+                if (weighted, votes) > best:
+                    winner, best = len(entries), (weighted, votes)
+                book = self.books[j]
+                entries.append(
+                    schemas.BookResult(
+                        book_id=book.id,
+                        title=book.title,
+                        author=book.author,
+                        readers_count=readers[j],
+                        votes_count=votes,
+                        weighted_score=round(weighted, 4),
+                        is_winner=False,
+                    )
+                )
+            if winner >= 0:
+                entries[winner].is_winner = True
+            entries.sort(key=lambda entry: entry.weighted_score, reverse=True)
+            results.append(schemas.CategoryResult(category_id=category.id, category_name=category.name, results=entries))
+        return results
+
+
+class TallyStore(LRUCache):
+    """
+    This worker's tally matrices, keyed by ("tally", club_id). A read serves the matrix only when its
+    `results_version` is the club's; a committed write moves it forward by applying the transaction's
+    `TallyChange` when the versions it bumped directly follow the matrix's, and drops it otherwise (a write
+    from another worker came in between, or the change was not incremental), so the next read reloads it.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        # Guards matrix contents: commits apply their changes while requests read results.
+        self.matrix_lock = Lock()
+
+    def results(
+        self, club_id: int, results_version: int
+    ) -> Optional[Tuple[List[TallyCategory], List[TallyBook], List[schemas.CategoryResult]]]:
+        """The club's categories, books and plain results, or None unless the matrix is at `results_version`."""
+        matrix = self.get(("tally", club_id))
+        if matrix is not None:
+            with self.matrix_lock:
+                if matrix.results_version == results_version:
+                    return list(matrix.categories), list(matrix.books), matrix.category_results()
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+        return None
+
+    def put(self, matrix: TallyMatrix) -> None:
+        """Store `matrix` unless the one already held is newer (e.g. `matrix` was read from a lagging replica)."""
+        with self._lock:
+            current = self._data.get(("tally", matrix.club_id))
+        if current is not None and current.results_version > matrix.results_version:
+            return
+        self.set(("tally", matrix.club_id), matrix)
+
+    def advance(self, club_id: int, change: TallyChange) -> None:
+        if not change.versions:
+            return
+        with self._lock:
+            matrix = self._data.get(("tally", club_id))
+        if matrix is None:
+            return
+        with self.matrix_lock:
+            expected = list(range(matrix.results_version + 1, matrix.results_version + 1 + len(change.versions)))
+            if change.incremental and change.versions == expected and matrix.apply(change):
+                matrix.results_version = change.versions[-1]
+                return
+        self.pop(("tally", club_id))
+
+    def save(self, path: str) -> int:
+        """Write every matrix to `path` (atomically replaced) and return how many were written."""
+        with self._lock:
+            matrices = list(self._data.values())
+        parts = [b""]
+        offset = SNAPSHOT_HEADER.size
+        with self.matrix_lock:
+            for matrix in matrices:
+                metadata = json.dumps(
+                    {"categories": matrix.categories, "books": matrix.books}, separators=(",", ":")
+                ).encode()
+                metadata += b" " * (-(offset + SNAPSHOT_CLUB.size + len(metadata)) % 4)
+                offset += SNAPSHOT_CLUB.size + len(metadata) + 4 * len(matrix.counts)
+                parts.append(
+                    SNAPSHOT_CLUB.pack(
+                        matrix.club_id, matrix.results_version, len(matrix.categories), len(matrix.books), len(metadata)
+                    )
+                )
+                parts.append(metadata)
+                parts.append(bytes(matrix.counts))
+        parts[0] = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, sys.byteorder == "little", len(matrices))
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as out:
+            out.writelines(parts)
+        os.replace(temporary, path)
+        return len(matrices)
+
+    def load(self, path: str) -> int:
+        """
+        Map the snapshot at `path` and serve its matrices straight from the mapped pages (copy-on-write, so
+        vote deltas never reach the file). Entries are only used while their results_version is current.
+        Returns how many were loaded; a missing or unreadable file loads none.
+        """
+        try:
+            with open(path, "rb") as snapshot:
+                mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (FileNotFoundError, ValueError):  # ValueError: empty file
+            return 0
+        try:
+            matrices = list(_read_snapshot(memoryview(mapped)))
+        except (ValueError, TypeError, KeyError, struct.error):
+            logger.warning("Ignoring unreadable tally snapshot %s", path, exc_info=True)
+            return 0
+        for matrix in matrices:
+            self.put(matrix)
+        return len(matrices)
+
+
+def _read_snapshot(view: memoryview) -> Iterable[TallyMatrix]:
+    magic, little_endian, clubs = SNAPSHOT_HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC or bool(little_endian) != (sys.byteorder == "little"):
+        raise ValueError("not a tally snapshot for this architecture")
+    offset = SNAPSHOT_HEADER.size
+    for _ in range(clubs):
+        club_id, results_version, categories, books, metadata_size = SNAPSHOT_CLUB.unpack_from(view, offset)
+        offset += SNAPSHOT_CLUB.size
+        metadata = json.loads(bytes(view[offset : offset + metadata_size]))
+        offset += metadata_size
+        size = 4 * categories * books
+        if offset + size > len(view):
+            raise ValueError("truncated tally snapshot")
+        if offset % 4:
+            raise ValueError("misaligned tally snapshot")
+        yield TallyMatrix(
+            club_id,
+            results_version,
+            [TallyCategory(*category) for category in metadata["categories"]],
+            [TallyBook(*book) for book in metadata["books"]],
+            view[offset : offset + size].cast("i"),
+        )
+        offset += size
+
+
+tally_store = TallyStore(maxsize=get_settings().tally_cache_size)
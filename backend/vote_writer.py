@@ -0,0 +1,126 @@
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+try:  # pragma: no cover
+    from . import crud, schemas
+    from .cache import ClubSnapshot
+    from .config import get_settings
+    from .database import SessionLocal
+except ImportError:  # pragma: no cover
+    import crud  # type: ignore
+    import schemas  # type: ignore
+    from cache import ClubSnapshot  # type: ignore
+    from config import get_settings  # type: ignore
+    from database import SessionLocal  # type: ignore
+
+BallotJob = Tuple[ClubSnapshot, schemas.VoteSubmission, Future, contextvars.Context]
+
+
+class VoteWriter:
+    """
+    Single-writer queue for ballots. A background thread takes the first waiting ballot, gathers more
+    for up to `window` seconds or `max_batch` ballots, writes each one under its own SAVEPOINT and
+    commits the group in one transaction, so concurrent voters share one write lock acquisition and one
+    fsync. A ballot that fails validation only rolls back its savepoint; its caller gets the error while
+    the rest of the group still commits.
+    """
+
+    def __init__(self, session_factory=SessionLocal, *, window: float, max_batch: int):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[BallotJob]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, club: ClubSnapshot, payload: schemas.VoteSubmission) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((club, payload, future, contextvars.copy_context()))
+        return future
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vote-writer", daemon=True)
+                self._thread.start()
+
+    def _collect(self, first: BallotJob) -> Tuple[List[BallotJob], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            self._write(batch)
+
+    def _write(self, batch: List[BallotJob]) -> None:
+        outcomes = []
+        try:
+            with self.session_factory() as db:
+                _begin_immediate(db)
+                for club, payload, future, context in batch:
+                    try:
+                        with db.begin_nested():
+                            # Run in the submitting request's context so per-request metrics see its statements.
+                            outcomes.append((future, context.run(crud.record_ballot, db, club, payload), None))
+                    except Exception as exc:  # reported to that ballot's caller only
+                        crud.abandon_tally_change(db, club.id)
+                        outcomes.append((future, None, exc))
+                db.commit()
+        except Exception as exc:  # the group commit itself failed: every caller sees it
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+def _begin_immediate(db: Session) -> None:
+    """
+    On SQLite, take the write lock up front: pysqlite otherwise defers BEGIN until the first INSERT,
+    which would let each SAVEPOINT start (and RELEASE commit) its own transaction.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+settings = get_settings()
+vote_writer = VoteWriter(
+    window=settings.vote_writer_window_ms / 1000, max_batch=settings.vote_writer_max_batch
+)
@@ -1,17 +1,33 @@
-import axios from 'axios';
+import axios, { AxiosResponse } from 'axios';
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 });
 
+// With a read replica, writes answer with this header (a Unix timestamp). Sending it back until then keeps this
+// browser's reads on the primary, so it sees its own changes.
+const STICKY_HEADER = 'X-Read-Primary-Until';
+
 api.interceptors.request.use((config) => {
   const adminSecret = localStorage.getItem('adminSecret');
   if (adminSecret && config.url?.startsWith('/api/admin')) {
     config.headers['X-Admin-Secret'] = adminSecret;
   }
+  const readPrimaryUntil = sessionStorage.getItem('readPrimaryUntil');
+  if (readPrimaryUntil && Number(readPrimaryUntil) > Date.now() / 1000) {
+    config.headers[STICKY_HEADER] = readPrimaryUntil;
+  }
   return config;
 });
 
+api.interceptors.response.use((response) => {
+  const readPrimaryUntil = response.headers[STICKY_HEADER.toLowerCase()];
+  if (readPrimaryUntil) {
+    sessionStorage.setItem('readPrimaryUntil', String(readPrimaryUntil));
+  }
+  return response;
+});
+
 export function setAdminSecret(secret: string) {
   localStorage.setItem('adminSecret', secret);
 }
@@ -20,4 +36,34 @@ export function getAdminSecret(): string | null {
   return localStorage.getItem('adminSecret');
 }
 
+// Vote submissions carry an `Idempotency-Key`, one per submit. Only network retries of that submit (no response
+// arrived) reuse it, so the server replays its first answer instead of recording the ballot again; once any
+// response arrives the key is dropped, and the next submit, even of the same ballot, is a new request.
+const NETWORK_RETRIES = 2;
+
+export async function postIdempotent<T>(url: string, body: unknown): Promise<AxiosResponse<T>> {
+  // randomUUID is only available in secure contexts; phones on the meeting-room LAN may be on plain http.
+  const key = crypto.randomUUID?.() ?? `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+  for (let attempt = 0; ; attempt += 1) {
+    try {
+      return await api.post<T>(url, body, { headers: { 'Idempotency-Key': key } });
+    } catch (err) {
+      if (attempt >= NETWORK_RETRIES || !axios.isAxiosError(err) || err.response) {
+        throw err;
+      }
+    }
+  }
+}
+
+// EventSource and plain links (downloads) cannot send headers, so admin URLs carry the secret as `?admin_secret=`.
+export function apiUrl(path: string, params: Record<string, string> = {}): string {
+  const url = new URL(path, api.defaults.baseURL);
+  Object.entries(params).forEach(([key, value]) => url.searchParams.set(key, value));
+  const adminSecret = getAdminSecret();
+  if (adminSecret && path.startsWith('/api/admin')) {
+    url.searchParams.set('admin_secret', adminSecret);
+  }
+  return url.toString();
+}
+
 export default api;
@@ -0,0 +1,74 @@
+import { apiUrl } from './client';
+import { Book, BookResult, ResultsDelta, ResultsResponse, ResultsSnapshot } from './types';
+
+interface StreamHandlers {
+  onSnapshot: (snapshot: ResultsSnapshot) => void;
+  onDelta?: (delta: ResultsDelta) => void;
+}
+
+// Subscribes to a results stream; returns a function that closes it. EventSource reconnects on its own
+// and the server starts every connection with a fresh snapshot, so nothing needs replaying.
+export function openResultsStream(path: string, handlers: StreamHandlers): () => void {
+  const source = new EventSource(apiUrl(path));
+  source.addEventListener('snapshot', (event) => {
+    handlers.onSnapshot(JSON.parse((event as MessageEvent).data));
+  });
+  source.addEventListener('delta', (event) => {
+    handlers.onDelta?.(JSON.parse((event as MessageEvent).data));
+  });
+  return () => source.close();
+}
+
+// Mirrors the backend tally: weighted = votes / readers, winner = first book (by id) with the best
+// (weighted, votes), rows ordered by rounded weighted score.
+function rankBooks(entries: BookResult[]): BookResult[] {
+  const byId = [...entries].sort((a, b) => a.book_id - b.book_id);
+  let winnerId: number | null = null;
+  let bestScore = -1;
+  let bestVotes = -1;
+  const scored = byId.map((entry) => {
+    const weighted = entry.readers_count > 0 ? entry.votes_count / entry.readers_count : 0;
+    if (weighted > bestScore || (weighted === bestScore && entry.votes_count > bestVotes)) {
+      bestScore = weighted;
+      bestVotes = entry.votes_count;
+      winnerId = entry.book_id;
+    }
+    return { ...entry, weighted_score: Math.round(weighted * 10000) / 10000 };
+  });
+  return scored
+    .map((entry) => ({ ...entry, is_winner: entry.book_id === winnerId }))
+    .sort((a, b) => b.weighted_score - a.weighted_score);
+}
+
+export function applyResultsDelta(results: ResultsResponse, delta: ResultsDelta, books: Book[]): ResultsResponse {
+  const bookInfo = new Map(books.map((book) => [book.id, book]));
+  return {
+    ...results,
+    categories: results.categories.map((category) => {
+      const change = delta.categories.find((entry) => entry.category_id === category.category_id);
+      // A runoff cannot be replayed from counts; the server sends a new snapshot when one changes.
+      if (!change || category.ranked) return category;
+      const entries = new Map(category.results.map((entry) => [entry.book_id, entry]));
+      change.books.forEach(({ book_id, votes_count }) => {
+        const existing = entries.get(book_id);
+        const book = bookInfo.get(book_id);
+        if (votes_count <= 0) {
+          entries.delete(book_id);
+        } else if (existing) {
+          entries.set(book_id, { ...existing, votes_count });
+        } else if (book) {
+          entries.set(book_id, {
+            book_id,
+            title: book.title,
+            author: book.author,
+            readers_count: Math.max(book.readers_count, 0),
+            votes_count,
+            weighted_score: 0,
+            is_winner: false
+          });
+        }
+      });
+      return { ...category, results: rankBooks(Array.from(entries.values())) };
+    })
+  };
+}
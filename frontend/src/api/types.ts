@@ -22,6 +22,8 @@ export interface Category {
   description?: string | null;
   sort_order: number;
   active: boolean;
+  // Ranked categories take books in order of preference and are decided by instant runoff.
+  ranked: boolean;
 }
 
 export interface ClubConfigResponse {
@@ -34,7 +36,8 @@ export interface ClubConfigResponse {
 
 export interface VoteEntry {
   category_id: number;
-  book_id: number;
+  book_id?: number;
+  rankings?: number[];
 }
 
 export interface VoteSubmission {
@@ -71,10 +74,29 @@ export interface BookResult {
   is_winner: boolean;
 }
 
+export interface IrvTally {
+  book_id: number;
+  votes: number;
+}
+
+export interface IrvRound {
+  round: number;
+  tallies: IrvTally[];
+  exhausted: number;
+  eliminated?: number | null;
+  transfers: IrvTally[];
+  exhausted_by_transfer: number;
+  winner?: number | null;
+}
+
 export interface CategoryResult {
   category_id: number;
   category_name: string;
+  // Ranked categories list books in finishing order: votes_count is first preferences and weighted_score
+  // the share of ballots held in the last round the book took part in.
   results: BookResult[];
+  ranked?: boolean;
+  rounds?: IrvRound[] | null;
 }
 
 export interface ResultsResponse {
@@ -82,6 +104,46 @@ export interface ResultsResponse {
   categories: CategoryResult[];
 }
 
+export interface CategoryLeader {
+  category_id: number;
+  category_name: string;
+  leader?: BookResult | null;
+}
+
+export interface ClubDashboardEntry {
+  club: Club;
+  voters_count: number;
+  votes_count: number;
+  completion_rate: number;
+  leaders: CategoryLeader[];
+}
+
+export interface AdminDashboardResponse {
+  total: number;
+  page: number;
+  page_size: number;
+  clubs: ClubDashboardEntry[];
+}
+
+export type DashboardSort = 'created_at' | 'name' | 'voters' | 'votes' | 'completion';
+
+// Live results stream (`/results/stream`) events. Public snapshots carry no results while voting is open.
+export interface ResultsSnapshot {
+  seq: number;
+  ts: number;
+  voting_open: boolean;
+  results: ResultsResponse | null;
+}
+
+export interface ResultsDelta {
+  seq: number;
+  ts: number;
+  categories: {
+    category_id: number;
+    books: { book_id: number; votes_count: number; delta: number }[];
+  }[];
+}
+
 export interface RevealResultsResponse {
   status: 'ok';
   club: Club;
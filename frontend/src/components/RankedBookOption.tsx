@@ -0,0 +1,22 @@
+import { Book } from '../api/types';
+
+interface RankedBookOptionProps {
+  book: Book;
+  // Position in the voter's ranking (1 = first choice), or null while unranked.
+  rank: number | null;
+  onToggle: (bookId: number) => void;
+  disabled?: boolean;
+}
+
+export default function RankedBookOption({ book, rank, onToggle, disabled }: RankedBookOptionProps) {
+  return (
+    <label className={`book-option ${rank !== null ? 'selected' : ''}`}>
+      <input type="checkbox" checked={rank !== null} onChange={() => onToggle(book.id)} disabled={disabled} />
+      <div>
+        <strong>{book.title}</strong>
+        {book.author && <span className="muted"> by {book.author}</span>}
+      </div>
+      {rank !== null && <span className="rank-badge">#{rank}</span>}
+    </label>
+  );
+}
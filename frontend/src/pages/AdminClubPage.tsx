@@ -1,6 +1,7 @@
-import { FormEvent, useEffect, useState } from 'react';
+import { FormEvent, useEffect, useRef, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
-import api from '../api/client';
+import api, { apiUrl } from '../api/client';
+import { applyResultsDelta, openResultsStream } from '../api/resultsStream';
 import {
   Book,
   Category,
@@ -16,7 +17,7 @@ export default function AdminClubPage() {
   const [books, setBooks] = useState<Book[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [newBook, setNewBook] = useState({ title: '', author: '', readers_count: 0 });
-  const [newCategory, setNewCategory] = useState({ name: '', description: '', sort_order: 0 });
+  const [newCategory, setNewCategory] = useState({ name: '', description: '', sort_order: 0, ranked: false });
   const [results, setResults] = useState<ResultsResponse | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [isImporting, setIsImporting] = useState(false);
@@ -26,7 +27,8 @@ export default function AdminClubPage() {
   const [editingCategoryDraft, setEditingCategoryDraft] = useState({
     name: '',
     description: '',
-    sort_order: 0
+    sort_order: 0,
+    ranked: false
   });
   const [bestMemberNominees, setBestMemberNominees] = useState<BestMemberNominee[]>([]);
   const [newNominee, setNewNominee] = useState('');
@@ -45,25 +47,30 @@ export default function AdminClubPage() {
       .catch((err) => setError(err.response?.data?.detail ?? 'Unable to load club'));
   };
 
-  const loadResults = () => {
-    if (!slug) return;
-    api
-      .get<ResultsResponse>(`/api/admin/clubs/${slug}/results`)
-      .then((response) => setResults(response.data))
-      .catch((err) => setError(err.response?.data?.detail ?? 'Unable to load results'));
-  };
-
   useEffect(() => {
     load();
   }, [slug]);
 
+  // Deltas can name books that have no votes in a category yet; read them from the latest book list.
+  const booksRef = useRef<Book[]>([]);
   useEffect(() => {
-    if (config && !config.club.voting_open) {
-      loadResults();
-    } else {
-      setResults(null);
-    }
-  }, [config]);
+    booksRef.current = books;
+  }, [books]);
+
+  // Live tally: a snapshot on connect (and after any config or voting-state change), then count deltas.
+  useEffect(() => {
+    if (!slug) return;
+    return openResultsStream(`/api/admin/clubs/${slug}/results/stream`, {
+      onSnapshot: (snapshot) => {
+        setResults(snapshot.results);
+        setConfig((prev) =>
+          prev ? { ...prev, club: { ...prev.club, voting_open: snapshot.voting_open } } : prev
+        );
+      },
+      onDelta: (delta) =>
+        setResults((prev) => (prev ? applyResultsDelta(prev, delta, booksRef.current) : prev))
+    });
+  }, [slug]);
 
   const handleVotingState = (openState: boolean) => {
     if (!slug) return;
@@ -74,11 +81,6 @@ export default function AdminClubPage() {
           prev ? { ...prev, club: { ...prev.club, voting_open: data.voting_open } } : prev
         );
       })
-      .then(() => {
-        if (!openState) {
-          loadResults();
-        }
-      })
       .catch((err) => setError(err.response?.data?.detail ?? 'Unable to update voting state'));
   };
 
@@ -104,7 +106,7 @@ export default function AdminClubPage() {
       })
       .then(({ data }) => {
         setCategories((prev) => [...prev, data]);
-        setNewCategory({ name: '', description: '', sort_order: 0 });
+        setNewCategory({ name: '', description: '', sort_order: 0, ranked: false });
       })
       .catch((err) => setError(err.response?.data?.detail ?? 'Unable to add category'));
   };
@@ -213,7 +215,8 @@ export default function AdminClubPage() {
     setEditingCategoryDraft({
       name: category.name,
       description: category.description ?? '',
-      sort_order: category.sort_order
+      sort_order: category.sort_order,
+      ranked: category.ranked
     });
   };
 
@@ -253,9 +256,6 @@ export default function AdminClubPage() {
       if (editingBookId === book.id) {
         setEditingBookId(null);
       }
-      if (config && !config.club.voting_open) {
-        loadResults();
-      }
     } catch (err: any) {
       setError(err.response?.data?.detail ?? 'Unable to delete book');
     }
@@ -273,9 +273,6 @@ export default function AdminClubPage() {
       if (editingCategoryId === category.id) {
         setEditingCategoryId(null);
       }
-      if (config && !config.club.voting_open) {
-        loadResults();
-      }
     } catch (err: any) {
       setError(err.response?.data?.detail ?? 'Unable to delete category');
     }
@@ -507,6 +504,14 @@ export default function AdminClubPage() {
                       }
                     />
                   </label>
+                  <label>
+                    <input
+                      type="checkbox"
+                      checked={editingCategoryDraft.ranked}
+                      onChange={(e) => setEditingCategoryDraft({ ...editingCategoryDraft, ranked: e.target.checked })}
+                    />{' '}
+                    Ranked choice (instant runoff)
+                  </label>
                   <div className="actions">
                     <button className="button" type="submit">
                       Save changes
@@ -521,7 +526,10 @@ export default function AdminClubPage() {
                   <div>
                     <strong>{category.name}</strong>
                     {category.description && <div className="muted">{category.description}</div>}
-                    <div className="muted">Order: {category.sort_order}</div>
+                    <div className="muted">
+                      Order: {category.sort_order}
+                      {category.ranked && ' · Ranked choice'}
+                    </div>
                   </div>
                   <div style={{ display: 'flex', gap: '0.5rem' }}>
                     <button className="button secondary" type="button" onClick={() => startEditCategory(category)}>
@@ -559,6 +567,14 @@ export default function AdminClubPage() {
                 onChange={(e) => setNewCategory({ ...newCategory, sort_order: Number(e.target.value) })}
               />
             </label>
+            <label>
+              <input
+                type="checkbox"
+                checked={newCategory.ranked}
+                onChange={(e) => setNewCategory({ ...newCategory, ranked: e.target.checked })}
+              />{' '}
+              Ranked choice (instant runoff)
+            </label>
             <button className="button" type="submit">
               Add category
             </button>
@@ -608,17 +624,30 @@ export default function AdminClubPage() {
 
       {results && (
         <div className="card">
-          <h2>Results</h2>
+          <h2>{config?.club.voting_open ? 'Live results' : 'Results'}</h2>
+          <p className="muted">
+            Export all ballots:{' '}
+            <a href={apiUrl(`/api/admin/clubs/${slug}/ballots/export`)}>CSV</a>
+            {' · '}
+            <a href={apiUrl(`/api/admin/clubs/${slug}/ballots/export`, { format: 'jsonl', gzip: 'true' })}>
+              JSONL (gzip)
+            </a>
+          </p>
           {results.categories.map((category) => (
             <div key={category.category_id} className="results">
-              <h3>{category.category_name}</h3>
+              <h3>
+                {category.category_name}
+                {category.ranked && (
+                  <span className="muted"> · instant runoff, {category.rounds?.length ?? 0} rounds</span>
+                )}
+              </h3>
               <table>
                 <thead>
                   <tr>
                     <th>Title</th>
                     <th>Readers</th>
-                    <th>Votes</th>
-                    <th>Weighted</th>
+                    <th>{category.ranked ? 'First choices' : 'Votes'}</th>
+                    <th>{category.ranked ? 'Final share' : 'Weighted'}</th>
                   </tr>
                 </thead>
                 <tbody>
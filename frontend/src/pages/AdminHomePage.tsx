@@ -1,19 +1,24 @@
 import { FormEvent, useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import api, { getAdminSecret, setAdminSecret } from '../api/client';
-import { Club } from '../api/types';
+import { AdminDashboardResponse, DashboardSort } from '../api/types';
+
+const PAGE_SIZE = 50;
 
 export default function AdminHomePage() {
   const [secret, updateSecret] = useState(getAdminSecret() ?? '');
-  const [clubs, setClubs] = useState<Club[]>([]);
+  const [dashboard, setDashboard] = useState<AdminDashboardResponse | null>(null);
+  const [sort, setSort] = useState<DashboardSort>('created_at');
+  const [order, setOrder] = useState<'asc' | 'desc'>('asc');
+  const [page, setPage] = useState(1);
   const [newClub, setNewClub] = useState({ name: '', slug: '' });
   const [error, setError] = useState<string | null>(null);
 
   const load = () => {
     api
-      .get<Club[]>('/api/admin/clubs')
+      .get<AdminDashboardResponse>('/api/admin/dashboard', { params: { sort, order, page, page_size: PAGE_SIZE } })
       .then((response) => {
-        setClubs(response.data);
+        setDashboard(response.data);
         setError(null);
       })
       .catch((err) => setError(err.response?.data?.detail ?? 'Unable to load clubs'));
@@ -23,7 +28,7 @@ export default function AdminHomePage() {
     if (secret) {
       load();
     }
-  }, [secret]);
+  }, [secret, sort, order, page]);
 
   const handleSecretSave = () => {
     setAdminSecret(secret);
@@ -75,16 +80,65 @@ export default function AdminHomePage() {
 
       <div className="card">
         <h2>Existing Clubs</h2>
-        {clubs.map((club) => (
+        <div className="list-item">
+          <label>
+            Sort by
+            <select
+              value={sort}
+              onChange={(e) => {
+                setSort(e.target.value as DashboardSort);
+                setPage(1);
+              }}
+            >
+              <option value="created_at">Created</option>
+              <option value="name">Name</option>
+              <option value="voters">Voters</option>
+              <option value="votes">Votes</option>
+              <option value="completion">Completion</option>
+            </select>
+          </label>
+          <button className="button secondary" onClick={() => setOrder(order === 'asc' ? 'desc' : 'asc')}>
+            {order === 'asc' ? 'Ascending' : 'Descending'}
+          </button>
+        </div>
+        {dashboard?.clubs.map(({ club, voters_count, votes_count, completion_rate, leaders }) => (
           <div key={club.id} className="list-item">
-            <span>
-              {club.name} ({club.slug})
-            </span>
+            <div>
+              <strong>
+                {club.name} ({club.slug})
+              </strong>
+              <p className="muted">
+                {voters_count} voters · {votes_count} votes · {Math.round(completion_rate * 100)}% complete
+                {club.voting_open ? '' : ' · voting closed'}
+              </p>
+              {leaders.map((category) => (
+                <p key={category.category_id} className="muted">
+                  {category.category_name}: {category.leader ? category.leader.title : 'no votes yet'}
+                </p>
+              ))}
+            </div>
             <Link className="button secondary" to={`/admin/${club.slug}`}>
               Manage
             </Link>
           </div>
         ))}
+        {dashboard && dashboard.total > dashboard.page_size && (
+          <div className="list-item">
+            <button className="button secondary" disabled={page <= 1} onClick={() => setPage(page - 1)}>
+              Previous
+            </button>
+            <span>
+              Page {page} of {Math.ceil(dashboard.total / dashboard.page_size)}
+            </span>
+            <button
+              className="button secondary"
+              disabled={page * dashboard.page_size >= dashboard.total}
+              onClick={() => setPage(page + 1)}
+            >
+              Next
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,19 +1,21 @@
 import { useEffect, useMemo, useRef, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import api from '../api/client';
+import { openResultsStream } from '../api/resultsStream';
 import {
   BestMemberResult,
   BookResult,
   CategoryResult,
   Club,
   ClubConfigResponse,
+  IrvRound,
   RevealResultsResponse
 } from '../api/types';
 import nominatedTrack from '../sounds/nominated.mp3';
 import winnerTrack from '../sounds/winner.mp3';
 
 type Phase = 'loading' | 'open' | 'ready' | 'error';
-type RevealStage = 'nominees' | 'countdown' | 'tie' | 'winner';
+type RevealStage = 'nominees' | 'runoff' | 'countdown' | 'tie' | 'winner';
 
 export default function RevealPage() {
   const { slug } = useParams();
@@ -25,6 +27,8 @@ export default function RevealPage() {
   const [error, setError] = useState<string | null>(null);
   const [revealStage, setRevealStage] = useState<RevealStage>('nominees');
   const [countdown, setCountdown] = useState(5);
+  // Index of the instant-runoff round on screen while a ranked category plays out its eliminations.
+  const [runoffRound, setRunoffRound] = useState(0);
   const [fireworksActive, setFireworksActive] = useState(false);
   const [revealedTopCount, setRevealedTopCount] = useState(0);
   const [revealingTop, setRevealingTop] = useState(false);
@@ -84,6 +88,20 @@ export default function RevealPage() {
     loadClubState();
   }, [slug]);
 
+  // While voting is open, wait on the public stream: it sends the full results as soon as voting closes.
+  useEffect(() => {
+    if (!slug || phase !== 'open') return;
+    return openResultsStream(`/api/clubs/${slug}/results/stream`, {
+      onSnapshot: (snapshot) => {
+        if (snapshot.voting_open || !snapshot.results) return;
+        setClub(snapshot.results.club);
+        setResults(snapshot.results.categories);
+        setCurrentIndex(0);
+        setPhase('ready');
+      }
+    });
+  }, [slug, phase]);
+
   useEffect(() => {
     if (!results.length) {
       setCurrentIndex(0);
@@ -98,6 +116,7 @@ export default function RevealPage() {
     if (phase !== 'ready') return;
     setRevealStage('nominees');
     setCountdown(5);
+    setRunoffRound(0);
     setFireworksActive(false);
     setRevealedTopCount(0);
     setRevealingTop(false);
@@ -128,7 +147,10 @@ export default function RevealPage() {
       setDisplayContenders([]);
       return;
     }
-    const sorted = [...currentCategory.results].sort((a, b) => b.weighted_score - a.weighted_score);
+    // Ranked results already come in finishing order.
+    const sorted = currentCategory.ranked
+      ? [...currentCategory.results]
+      : [...currentCategory.results].sort((a, b) => b.weighted_score - a.weighted_score);
     const display: BookResult[] = [];
     sorted.forEach((item) => {
       if (display.length < 3 && !display.find((b) => b.book_id === item.book_id)) {
@@ -174,6 +196,21 @@ export default function RevealPage() {
     };
   }, []);
 
+  // Step through every elimination round; the final round (which names the winner) waits for the envelope.
+  useEffect(() => {
+    if (revealStage !== 'runoff') return;
+    const lastElimination = (currentCategory?.rounds?.length ?? 0) - 2;
+    const timer = window.setTimeout(() => {
+      if (runoffRound >= lastElimination) {
+        setRevealStage('countdown');
+        playWinnerTrack();
+      } else {
+        setRunoffRound(runoffRound + 1);
+      }
+    }, 3500);
+    return () => window.clearTimeout(timer);
+  }, [revealStage, runoffRound]);
+
   useEffect(() => {
     if (revealStage !== 'countdown') return;
     setCountdown(5);
@@ -306,7 +343,8 @@ export default function RevealPage() {
   };
 
   const handleCountdownComplete = () => {
-    const ties = getTopTies();
+    // The runoff's tie-break has already decided a ranked category.
+    const ties = currentCategory?.ranked ? [] : getTopTies();
     if (ties.length > 1) {
       setRevealStage('tie');
       openTieModal(ties);
@@ -397,6 +435,12 @@ export default function RevealPage() {
   const startCountdown = () => {
     if (revealStage !== 'nominees') return;
     if (revealedTopCount < 3 && !revealingTop) return;
+    if ((currentCategory?.rounds?.length ?? 0) > 1) {
+      setRunoffRound(0);
+      setRevealStage('runoff');
+      playChime();
+      return;
+    }
     setRevealStage('countdown');
     playWinnerTrack();
   };
@@ -462,6 +506,42 @@ export default function RevealPage() {
     }
   };
 
+  const renderRunoffRound = (round: IrvRound, total: number) => {
+    const titleOf = (bookId: number) =>
+      currentCategory?.results.find((entry) => entry.book_id === bookId)?.title ?? `Book ${bookId}`;
+    const most = Math.max(1, ...round.tallies.map((tally) => tally.votes));
+    return (
+      <div className="runoff fade-in-up" key={round.round}>
+        <p className="muted">
+          Round {round.round} of {total}
+          {round.exhausted > 0 && ` · ${round.exhausted} ballots out of choices`}
+        </p>
+        {round.tallies.map((tally) => (
+          <div
+            key={tally.book_id}
+            className={`runoff-row ${round.eliminated === tally.book_id ? 'runoff-eliminated' : ''} ${
+              round.winner === tally.book_id ? 'runoff-winner' : ''
+            }`}
+          >
+            <span className="runoff-title">{titleOf(tally.book_id)}</span>
+            <div className="runoff-bar">
+              <div style={{ width: `${(tally.votes / most) * 100}%` }} />
+            </div>
+            <span className="runoff-votes">{tally.votes}</span>
+          </div>
+        ))}
+        {round.eliminated != null && (
+          <p className="runoff-note">
+            {titleOf(round.eliminated)} is out
+            {round.transfers.length > 0 &&
+              `: ${round.transfers.map((t) => `${t.votes} to ${titleOf(t.book_id)}`).join(', ')}`}
+            {round.exhausted_by_transfer > 0 && ` (${round.exhausted_by_transfer} with no further choice)`}
+          </p>
+        )}
+      </div>
+    );
+  };
+
   const renderContent = () => {
     const currentYear = new Date().getFullYear();
     const nextYear = currentYear + 1;
@@ -669,6 +749,13 @@ export default function RevealPage() {
             </div>
           )}
 
+          {revealStage === 'runoff' && currentCategory.rounds?.[runoffRound] && (
+            <div className="reveal-actions">
+              <p className="drum-roll">Counting the ranked ballots...</p>
+              {renderRunoffRound(currentCategory.rounds[runoffRound], currentCategory.rounds.length)}
+            </div>
+          )}
+
           {revealStage === 'countdown' && (
             <div className="countdown-card">
               <p className="drum-roll">Opening the envelope...</p>
@@ -684,10 +771,25 @@ export default function RevealPage() {
                 <h3 className="winner-title">{winner.title}</h3>
                 {winner.author && <p className="winner-author">by {winner.author}</p>}
                 <div className="winner-meta">
-                  <span>{winner.votes_count} votes</span>
-                  <span>{winner.readers_count} readers</span>
-                  <span>Score {winner.weighted_score.toFixed(3)}</span>
+                  {currentCategory.ranked ? (
+                    <>
+                      <span>{winner.votes_count} first choices</span>
+                      <span>{Math.round(winner.weighted_score * 100)}% in the final round</span>
+                    </>
+                  ) : (
+                    <>
+                      <span>{winner.votes_count} votes</span>
+                      <span>{winner.readers_count} readers</span>
+                      <span>Score {winner.weighted_score.toFixed(3)}</span>
+                    </>
+                  )}
                 </div>
+                {currentCategory.rounds &&
+                  currentCategory.rounds.length > 1 &&
+                  renderRunoffRound(
+                    currentCategory.rounds[currentCategory.rounds.length - 1],
+                    currentCategory.rounds.length
+                  )}
               </div>
             ) : (
               <p className="drum-roll">No winner data.</p>
@@ -1,9 +1,10 @@
 import { useEffect, useMemo, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
-import api from '../api/client';
-import { Book, Category, ClubConfigResponse, VoteSubmissionResponse } from '../api/types';
+import api, { postIdempotent } from '../api/client';
+import { Book, Category, ClubConfigResponse, VoteEntry, VoteSubmissionResponse } from '../api/types';
 import CategoryStepper from '../components/CategoryStepper';
 import BookOption from '../components/BookOption';
+import RankedBookOption from '../components/RankedBookOption';
 
 export default function VotingPage() {
   const { slug } = useParams();
@@ -16,6 +17,8 @@ export default function VotingPage() {
   const [voterName, setVoterName] = useState('');
   const [currentIndex, setCurrentIndex] = useState(0);
   const [selected, setSelected] = useState<Record<number, number>>({});
+  // Ranked categories: books in the order the voter picked them; `selected` holds the first choice.
+  const [rankings, setRankings] = useState<Record<number, number[]>>({});
   const [message, setMessage] = useState<string | null>(null);
   const [submittedName, setSubmittedName] = useState<string | null>(null);
   const [voteCompleted, setVoteCompleted] = useState(false);
@@ -38,6 +41,7 @@ export default function VotingPage() {
         setCategories(response.data.categories);
         setBestMemberNominees(response.data.best_member_nominees ?? []);
         setSelected({});
+        setRankings({});
         setCurrentIndex(0);
         setError(null);
         setMessage(null);
@@ -72,6 +76,17 @@ export default function VotingPage() {
     setSelected((prev) => ({ ...prev, [categoryId]: bookId }));
   };
 
+  const handleRank = (categoryId: number, bookId: number) => {
+    const current = rankings[categoryId] ?? [];
+    const next = current.includes(bookId) ? current.filter((id) => id !== bookId) : [...current, bookId];
+    setRankings((prev) => ({ ...prev, [categoryId]: next }));
+    setSelected((prev) => {
+      const rest = { ...prev };
+      delete rest[categoryId];
+      return next.length ? { ...rest, [categoryId]: next[0] } : rest;
+    });
+  };
+
   const handleSubmit = async () => {
     if (!voterName.trim()) {
       setMessage('Please enter your name.');
@@ -84,12 +99,14 @@ export default function VotingPage() {
     try {
       const payload = {
         voter_name: voterName,
-        votes: Object.entries(selected).map(([categoryId, bookId]) => ({
-          category_id: Number(categoryId),
-          book_id: bookId
-        }))
+        votes: Object.entries(selected).map(([categoryId, bookId]): VoteEntry => {
+          const ranked = rankings[Number(categoryId)];
+          return ranked?.length
+            ? { category_id: Number(categoryId), rankings: ranked }
+            : { category_id: Number(categoryId), book_id: bookId };
+        })
       };
-      const response = await api.post<VoteSubmissionResponse>(`/api/clubs/${slug}/vote`, payload);
+      const response = await postIdempotent<VoteSubmissionResponse>(`/api/clubs/${slug}/vote`, payload);
       setSubmittedName(response.data.voter.name);
       setMessage(null);
       setVoteCompleted(true);
@@ -113,7 +130,7 @@ export default function VotingPage() {
     setMemberSubmitting(true);
     setMemberMessage(null);
     try {
-      await api.post(`/api/clubs/${slug}/best-member/vote`, {
+      await postIdempotent(`/api/clubs/${slug}/best-member/vote`, {
         voter_name: nameToUse,
         nominee_name: memberNominee.trim()
       });
@@ -238,16 +255,33 @@ export default function VotingPage() {
         <div className="card">
           <h2>{currentCategory.name}</h2>
           {currentCategory.description && <p>{currentCategory.description}</p>}
-          {books.map((book) => (
-            <BookOption
-              key={`${currentCategory.id}-${book.id}`}
-              groupName={`category-${currentCategory.id}`}
-              book={book}
-              selected={selected[currentCategory.id] === book.id}
-              disabled={formDisabled}
-              onSelect={(bookId) => handleSelect(currentCategory.id, bookId)}
-            />
-          ))}
+          {currentCategory.ranked && (
+            <p className="muted">Pick books in order of preference: your first pick is your first choice.</p>
+          )}
+          {books.map((book) =>
+            currentCategory.ranked ? (
+              <RankedBookOption
+                key={`${currentCategory.id}-${book.id}`}
+                book={book}
+                rank={
+                  rankings[currentCategory.id]?.includes(book.id)
+                    ? rankings[currentCategory.id].indexOf(book.id) + 1
+                    : null
+                }
+                disabled={formDisabled}
+                onToggle={(bookId) => handleRank(currentCategory.id, bookId)}
+              />
+            ) : (
+              <BookOption
+                key={`${currentCategory.id}-${book.id}`}
+                groupName={`category-${currentCategory.id}`}
+                book={book}
+                selected={selected[currentCategory.id] === book.id}
+                disabled={formDisabled}
+                onSelect={(bookId) => handleSelect(currentCategory.id, bookId)}
+              />
+            )
+          )}
           <div className="actions">
             <button className="button secondary" onClick={handlePrev} disabled={currentIndex === 0 || formDisabled}>
               Previous